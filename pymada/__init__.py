@@ -1,4 +1,4 @@
-import sys, logging, pathlib
+import sys, logging, pathlib, functools
 from . import settings
 
 log_level = "DEBUG" if settings.debug_mode else "INFO"
@@ -30,8 +30,11 @@ logger.addHandler(logging_handler)
 
 def log(message, *args, **kwargs):  # create logging decorator
     def decorator(function):
+        @functools.wraps(function)
         def inner(*args, **kwargs):
-            logger.info(message)
+            # instances with headless set e.g. simulated games skip logging
+            if not (args and getattr(args[0], "headless", False)):
+                logger.info(message)
             return function(*args, **kwargs)
 
         return inner
@@ -0,0 +1,361 @@
+"""Monte Carlo tree search over ship activations
+"""
+
+import collections, math, time
+import numpy as np
+
+import pymada
+import pymada.errors
+
+
+class MCTS:
+    """Class describing Monte Carlo tree search for a player of a game
+
+    notes:
+        one tree move is a whole activation - ship, attack (or None) and maneuver - made and
+        unmade on the game's own board with Board.make/unmake so the game is never copied
+        attacks are chance nodes - the attacking pool is rolled with the search generator and
+        each outcome leads to whichever state its damage produces
+        statistics are stored in a transposition table keyed by Game.state_hash rather than by
+        path, so positions reached by activating ships in a different order share statistics
+        table holds at most table_size states, least recently used states are evicted first
+        entries hold each ready ship's attacks and move space rather than every activation,
+        with activations numbered through them and statistics only stored once tried, so an
+        entry grows with its visits rather than with the number of activations
+    """
+
+    EXPLORATION = 1.4
+    NODE_BUDGET = 200
+    TIME_BUDGET = None
+    TABLE_SIZE = 100000
+    ROLLOUT_ACTIVATIONS = 4
+
+    def __init__(
+        self,
+        node_budget=NODE_BUDGET,
+        time_budget=TIME_BUDGET,
+        table_size=TABLE_SIZE,
+        exploration=EXPLORATION,
+    ):
+        """Constructor for search
+
+        args:
+            node_budget - simulations per decision, unlimited if None [int]
+            time_budget - time per decision, unlimited if None [float, s]
+            table_size - most states kept in transposition table [int]
+            exploration - UCT exploration constant [float]
+        notes:
+            search is anytime - it stops at whichever budget runs out first
+        """
+
+        if node_budget is None and time_budget is None:
+            raise pymada.errors.PymadaException(
+                "MCTS needs a node_budget or a time_budget"
+            )
+
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.table_size = table_size
+        self.exploration = exploration
+        self.table = collections.OrderedDict()
+
+        self._game = None
+        self._rng = None
+
+    def __len__(self):
+        return len(self.table)
+
+    def search(self, game, player_name, rng):
+        """Best activation for player from current state of game
+
+        args:
+            game - game part way through a ship phase [Game]
+            player_name - player to activate a ship [str]
+            rng - generator for dice and rollouts [numpy.random.Generator]
+        returns:
+            ship name, attack as (target, attacking hull zone, defending hull zone) or None, and
+            clicks of most visited activation [tuple]
+        notes:
+            the board is returned to exactly its state before the search
+        """
+
+        self._game = game
+        self._rng = rng
+        player = list(game.players).index(player_name)
+
+        deadline = (
+            None if self.time_budget is None else time.perf_counter() + self.time_budget
+        )
+        nodes = 0
+        while (self.node_budget is None or nodes < self.node_budget) and (
+            deadline is None or time.perf_counter() < deadline
+        ):
+            self._simulate(game.turn, player)
+            nodes += 1
+
+        entry = self.table.get(self._key(game.turn, player))
+        if entry is None or not entry["children"]:  # no time for a single simulation
+            activation = self._random_activation(player_name)
+        else:
+            activation = self._activation(
+                entry,
+                max(entry["children"], key=lambda index: entry["children"][index][0]),
+            )
+
+        ship_name, attack, clicks = activation
+        if attack is not None:
+            attack = attack[:3]
+
+        return ship_name, attack, clicks
+
+    def _simulate(self, turn, player):
+        """Select and expand one new state, roll out from it and back up its value
+
+        args:
+            turn - [int]
+            player - index of player to act [int]
+        """
+
+        board = self._game.board
+        player_names = list(self._game.players)
+        records, path = [], []  # (unmake, undo record) in the order made
+        expanding, depth = True, 0
+
+        while not self._is_terminal(turn) and depth < self.ROLLOUT_ACTIVATIONS:
+
+            to_move = self._to_move(player)
+
+            # every player has activated all their ships - status phase
+            if to_move is None:
+                records.append((board.unmake, self._status_phase()))
+                turn += 1
+                continue
+            player = to_move
+            player_name = player_names[player]
+
+            if expanding:
+                key = self._key(turn, player)
+                entry = self.table.get(key)
+                if entry is None:
+                    entry = self._expand(key, player_name)
+                    expanding = False
+                else:
+                    self.table.move_to_end(key)
+                choice = self._select(entry)
+                path.append((entry, choice, player_name))
+                activation = self._activation(entry, choice)
+            else:
+                activation = self._random_activation(player_name)
+                depth += 1
+
+            records.extend(
+                (self._game.unmake, record)
+                for record in self._game.apply_activation(*activation, rng=self._rng)
+            )
+            player = (player + 1) % len(player_names)
+
+        values = self._evaluate()
+
+        for entry, choice, player_name in path:
+            entry["visits"] += 1
+            child = entry["children"].setdefault(choice, [0, 0.0])
+            child[0] += 1
+            child[1] += values[player_name]
+
+        for unmake, record in reversed(records):
+            unmake(record)
+
+    def _key(self, turn, player):
+        """Transposition table key of current state
+
+        args:
+            turn - [int]
+            player - index of player to act [int]
+        notes:
+            see Game.hash_state - O(1) since the board keeps its hash up to date as actions
+            are made and unmade
+        """
+
+        return self._game.hash_state(turn, player)
+
+    def _expand(self, key, player_name):
+        """Add state to table, evicting least recently used state if full
+
+        args:
+            key - [int]
+            player_name - player to act [str]
+        """
+
+        if len(self.table) >= self.table_size:
+            self.table.popitem(last=False)
+
+        board = self._game.board
+        ship_names = sorted(board.ship_names(player_name=player_name, state="ready"))
+        attacks = [
+            [None] + board.attacks(ship_name, self._game.LONGEST_RANGE)
+            for ship_name in ship_names
+        ]
+        move_options = [board.ships[ship_name].move_options for ship_name in ship_names]
+        entry = {
+            "visits": 0,
+            "ship_names": ship_names,
+            "attacks": attacks,
+            "move_options": move_options,
+            # first activation number of each ship - numbered by ship, attack then maneuver
+            "offsets": np.cumsum(
+                [0] + [len(a) * len(m) for a, m in zip(attacks, move_options)]
+            ),
+            "children": {},  # activation number: [visits, total value] once tried
+        }
+        self.table[key] = entry
+
+        return entry
+
+    @staticmethod
+    def _activation(entry, index):
+        """Ship name, attack and clicks of activation numbered index in entry
+
+        args:
+            entry - table entry of state [dict]
+            index - [int]
+        """
+
+        ship = int(np.searchsorted(entry["offsets"], index, side="right")) - 1
+        attack, move = divmod(
+            index - int(entry["offsets"][ship]), len(entry["move_options"][ship])
+        )
+
+        return (
+            entry["ship_names"][ship],
+            entry["attacks"][ship][attack],
+            entry["move_options"][ship][move],
+        )
+
+    def _select(self, entry):
+        """Number of untried activation if any, otherwise activation with best UCT score
+
+        args:
+            entry - table entry of state [dict]
+        notes:
+            untried activations are drawn by rejection while most are untried, so the full
+            range of numbers is only listed once an entry is more than half explored
+        """
+
+        children = entry["children"]
+        n_activations = int(entry["offsets"][-1])
+
+        if len(children) < n_activations:
+            if 2 * len(children) < n_activations:
+                while True:
+                    index = int(self._rng.integers(n_activations))
+                    if index not in children:
+                        return index
+            untried = np.setdiff1d(np.arange(n_activations), list(children))
+            return int(untried[self._rng.integers(untried.size)])
+
+        indices = list(children)
+        visits, values = np.array(list(children.values())).T
+        scores = values / visits + self.exploration * np.sqrt(
+            math.log(entry["visits"]) / visits
+        )
+
+        return indices[int(np.argmax(scores))]
+
+    def _random_activation(self, player_name):
+        """One activation open to player, drawn without listing every activation
+
+        args:
+            player_name - [str]
+        """
+
+        ships = sorted(
+            self._game.board.ship_names(player_name=player_name, state="ready")
+        )
+        ship_name = ships[self._rng.integers(len(ships))]
+        attacks = [None] + self._game.board.attacks(ship_name, self._game.LONGEST_RANGE)
+
+        return (
+            ship_name,
+            attacks[self._rng.integers(len(attacks))],
+            self._game.board.ships[ship_name].move_options.sample(self._rng),
+        )
+
+    def _status_phase(self):
+        """Ready every ship for the next turn
+
+        returns:
+            undo record [tuple]
+        """
+
+        board = self._game.board
+        record = tuple(
+            (ship_name, ship.save_state()) for ship_name, ship in board.ships.items()
+        )
+        for ship in board.ships.values():
+            ship.deactivate()
+
+        return record
+
+    def _to_move(self, player):
+        """Index of first player from player onwards with a ship to activate, None if none
+
+        args:
+            player - [int]
+        """
+
+        player_names = list(self._game.players)
+        for offset in range(len(player_names)):
+            to_move = (player + offset) % len(player_names)
+            if self._game.board.ship_names(
+                player_name=player_names[to_move], state="ready"
+            ):
+                return to_move
+
+        return None
+
+    def _is_terminal(self, turn):
+        """Whether the turn limit is reached or at most one player has live ships
+        """
+
+        return turn >= self._game.MAX_TURNS or self._game.board.n_live("player") <= 1
+
+    def _evaluate(self):
+        """Value of current state to each player between 0 (loss) and 1 (win)
+
+        returns:
+            [dict]
+        notes:
+            a lone surviving player wins, otherwise value grows with the fraction of enemy
+            hull lost and falls with the fraction of own hull lost
+        """
+
+        board = self._game.board
+        player_names = list(self._game.players)
+
+        lost = dict.fromkeys(player_names, 0.0)
+        hull = dict.fromkeys(player_names, 0.0)
+        for ship in board.ships.values():
+            hull[ship.player_name] += ship.hull
+            lost[ship.player_name] += (
+                ship.hull if ship.is_destroyed else min(ship.damage, ship.hull)
+            )
+        fraction = {
+            player_name: lost[player_name] / hull[player_name]
+            if hull[player_name]
+            else 1.0
+            for player_name in player_names
+        }
+
+        values = {}
+        for player_name in player_names:
+            if board.n_live("player") == 1:
+                values[player_name] = float(
+                    bool(board.ship_names(player_name=player_name, state="live"))
+                )
+            else:
+                enemy = np.mean(
+                    [fraction[other] for other in player_names if other != player_name]
+                )
+                values[player_name] = 0.5 + 0.5 * (enemy - fraction[player_name])
+
+        return values
@@ -0,0 +1,368 @@
+"""Many games stepped together for training an agent
+"""
+
+import numpy as np
+
+import pymada
+import pymada.errors
+from pymada.classes.game import Game, build_game
+
+
+class VecEnv:
+    """Class describing N games in which an agent plays the first player against built-in players
+
+    attrs:
+        ship_names - order of ships along ship axis of observations [list(str)]
+        agent_ships - order of agent's ships in action indexing [list(str)]
+        enemy_ships - order of enemy ships in action indexing [list(str)]
+        hull_zone_names - order of hull zones of each ship [list(list(str))]
+        observations - FEATURES then shields per hull zone of each ship [array(N,S,F), float32]
+        masks - whether each action is legal [array(N,A), bool]
+        rewards - [array(N), float32]
+        dones - whether game finished on last step [array(N), bool]
+    notes:
+        one action is a whole activation of one of the agent's ships, indexed as
+            action = (ship * n_attacks + attack) * n_moves + move
+        attack 0 is no attack, otherwise attack - 1 = (target * H + attacking) * H + defending
+        over enemy_ships and hull zones, and move indexes the ship's move_options
+        buffers are allocated once and overwritten in place by reset() and step() - copy any
+        you need to keep
+        finished games are reset with a fresh seed in the same step, so every game is always
+        waiting for an action and observations of finished games are of the new game
+    """
+
+    FEATURES = (
+        "x",
+        "y",
+        "cos_theta",
+        "sin_theta",
+        "speed",
+        "hull",
+        "has_activated",
+        "is_destroyed",
+        "is_agent",
+        "turn",
+    )
+
+    def __init__(self, fleets, species, n_envs, seed=None):
+        """Constructor for vectorised environment
+
+        args:
+            fleets - faction and models of each fleet, agent's first [list(tuple(str, tuple(str)))]
+            species - species of each player after the agent [list(str)]
+            n_envs - number of games [int]
+            seed - entropy for all games, fresh entropy if None [int]
+        """
+
+        fleets, species = tuple(fleets), tuple(species)
+        if len(species) != len(fleets) - 1:
+            raise pymada.errors.PymadaException(
+                f"need one species per fleet after the agent's - got {len(fleets)} fleets and {len(species)} species"
+            )
+
+        self.games = [build_game(fleets, ("ai",) + species) for _ in range(n_envs)]
+        self._seeds = Game.spawn_seeds(seed, n_envs)
+        self.agent_name = next(iter(self.games[0].players))
+        for env in range(n_envs):
+            self._reset_game(env)
+
+        # fixed layout of ships, hull zones and maneuvers taken from first deployed game
+        board = self.games[0].board
+        agent_faction = self.games[0].players[self.agent_name].faction
+        self.ship_names = list(board.ships)
+        self.agent_ships = [
+            name
+            for name in self.ship_names
+            if board.ships[name].player_name == self.agent_name
+        ]
+        self.enemy_ships = [
+            name
+            for name in self.ship_names
+            if board.ships[name].faction != agent_faction
+        ]
+        self.hull_zone_names = [
+            list(board.ships[name].hull_zones) for name in self.ship_names
+        ]
+        n_hull_zones = max(map(len, self.hull_zone_names))
+        self._hull_zone_index = {
+            name: {zone: counter for counter, zone in enumerate(zones)}
+            for name, zones in zip(self.ship_names, self.hull_zone_names)
+        }
+        self._enemy_index = {
+            name: counter for counter, name in enumerate(self.enemy_ships)
+        }
+
+        self._max_shields = np.ones(
+            (len(self.ship_names), n_hull_zones), dtype=np.float32
+        )
+        for counter, name in enumerate(self.ship_names):
+            for zone_counter, zone in enumerate(self.hull_zone_names[counter]):
+                self._max_shields[counter, zone_counter] = max(
+                    board.ships[name]._data["shields"][zone], 1
+                )
+
+        self.n_attacks = 1 + len(self.enemy_ships) * n_hull_zones ** 2
+        self.n_moves = max(
+            len(board.ships[name].maneuvers.move_space(speed))
+            for name in self.agent_ships
+            for speed in board.ships[name]._data["move"]
+        )
+        self._action_shape = (len(self.agent_ships), self.n_attacks, self.n_moves)
+        self._attack_shape = (len(self.enemy_ships), n_hull_zones, n_hull_zones)
+
+        # buffers written in place
+        self.observations = np.zeros(
+            (n_envs, len(self.ship_names), len(self.FEATURES) + n_hull_zones),
+            dtype=np.float32,
+        )
+        self.masks = np.zeros((n_envs, int(np.prod(self._action_shape))), dtype=bool)
+        self.rewards = np.zeros(n_envs, dtype=np.float32)
+        self.dones = np.zeros(n_envs, dtype=bool)
+        self._scores = np.zeros(n_envs)
+        self._attacks = np.zeros(self.n_attacks, dtype=bool)
+        self._moves = np.arange(self.n_moves)
+        self._targeting = [
+            {} for _ in range(n_envs)
+        ]  # legal attacks of agent's ships with their range bands, by decoded attack
+
+        for env in range(n_envs):
+            self._write(env)
+
+    def __len__(self):
+        return len(self.games)
+
+    @property
+    def n_actions(self):
+        """Size of fixed action indexing [int]
+        """
+
+        return self.masks.shape[1]
+
+    def decode(self, action):
+        """Activation an action index stands for
+
+        args:
+            action - [int]
+        returns:
+            ship name, attack as (target, attacking hull zone, defending hull zone) or None,
+            and index into ship.move_options [tuple]
+        """
+
+        ship, attack, move = np.unravel_index(action, self._action_shape)
+        ship_name = self.agent_ships[ship]
+
+        if attack == 0:
+            return ship_name, None, int(move)
+
+        target, attacking, defending = np.unravel_index(attack - 1, self._attack_shape)
+        target_name = self.enemy_ships[target]
+
+        return (
+            ship_name,
+            (
+                target_name,
+                self.hull_zone_names[self.ship_names.index(ship_name)][attacking],
+                self.hull_zone_names[self.ship_names.index(target_name)][defending],
+            ),
+            int(move),
+        )
+
+    def reset(self):
+        """Start a new game in every environment
+
+        returns:
+            observations and action masks [tuple(array)]
+        """
+
+        for env in range(len(self.games)):
+            self._reset_game(env)
+            self._write(env)
+        self.rewards[:] = 0.0
+        self.dones[:] = False
+
+        return self.observations, self.masks
+
+    def step(self, actions):
+        """Play one activation of the agent in every game, then the other players until the
+        agent is next to act
+
+        args:
+            actions - one legal action index per game [array(N), int]
+        returns:
+            observations, rewards, dones and action masks [tuple(array)]
+        notes:
+            reward is change in enemy hull lost less own hull lost, as fractions of total hull,
+            plus 1 for winning or -1 for losing when the game ends
+        """
+
+        for env, action in enumerate(actions):
+            if not self.masks[env, action]:
+                raise pymada.errors.PymadaException(
+                    f"action {action} {self.decode(action)} is not legal in game {env}"
+                )
+
+            game = self.games[env]
+            self._play(env, int(action))
+            self._advance(game)
+
+            score = self._score(game)
+            self.rewards[env] = score - self._scores[env]
+            self.dones[env] = game.is_over
+            if game.is_over:
+                if game.winner is not None:
+                    self.rewards[env] += (
+                        1.0 if game.winner.name == self.agent_name else -1.0
+                    )
+                self._reset_game(env)
+
+            self._write(env)
+
+        return self.observations, self.rewards, self.dones, self.masks
+
+    def _reset_game(self, env):
+        """Start a new game in one environment and play until the agent is to act
+
+        args:
+            env - [int]
+        """
+
+        game = self.games[env]
+        game.reset(self._seeds[env].spawn(1)[0])
+        game.deploy()
+        self._advance(game)
+
+    def _play(self, env, action):
+        """Make agent's activation in one game
+
+        args:
+            env - [int]
+            action - [int]
+        notes:
+            attack is rolled at the range band measured when its mask was written
+        """
+
+        game = self.games[env]
+        ship_name, attack, move = self.decode(action)
+
+        game.apply_activation(
+            ship_name,
+            self._targeting[env][ship_name].get(attack),
+            game.board.ships[ship_name].move_options[move],
+        )
+
+        game.player_turn = (game.player_turn + 1) % len(game.players)
+
+    def _advance(self, game):
+        """Play other players and status phases until agent is to act or game is over
+
+        args:
+            game - [Game]
+        notes:
+            follows the order of Game.play_ship_phase
+        """
+
+        players = list(game.players.values())
+
+        while not game.is_over:
+
+            # every player finished ship phase
+            if not any(
+                game.board.ship_names(player_name=player_name, state="ready")
+                for player_name in game.players
+            ):
+                game.play_squadron_phase()
+                game.play_status_phase()
+                game.turn += 1
+                continue
+
+            current_player = players[game.player_turn]
+            ready_ships = game.board.ship_names(
+                player_name=current_player.name, state="ready"
+            )
+
+            if ready_ships and current_player.name == self.agent_name:
+                return
+
+            if ready_ships:
+                game.play_activation(current_player, ready_ships)
+            game.player_turn = (game.player_turn + 1) % len(players)
+
+    def _score(self, game):
+        """Fraction of enemy hull lost less fraction of agent's hull lost [float]
+        """
+
+        lost = np.zeros(2)
+        hull = np.zeros(2)
+        for ship in game.board.ships.values():
+            side = ship.player_name != self.agent_name
+            hull[side] += ship.hull
+            lost[side] += (
+                ship.hull if ship.is_destroyed else min(ship.damage, ship.hull)
+            )
+
+        return lost[1] / hull[1] - lost[0] / hull[0]
+
+    def _write(self, env):
+        """Write observations and action masks of one game into buffers
+
+        args:
+            env - [int]
+        """
+
+        game = self.games[env]
+        board = game.board
+        observations = self.observations[env]
+        n_features = len(self.FEATURES)
+
+        for counter, name in enumerate(self.ship_names):
+            ship = board.ships[name]
+            cos_theta, sin_theta = ship.position.rotation
+            observations[counter, :n_features] = (
+                2.0 * ship.position.x / board.width,
+                2.0 * ship.position.y / board.height,
+                cos_theta,
+                sin_theta,
+                ship.speed,
+                1.0 - min(ship.damage, ship.hull) / ship.hull,
+                ship.has_activated,
+                ship.is_destroyed,
+                ship.player_name == self.agent_name,
+                game.turn / game.MAX_TURNS,
+            )
+            for zone_counter, hull_zone in enumerate(ship.hull_zones.values()):
+                observations[counter, n_features + zone_counter] = hull_zone.shields
+        observations[:, n_features:] /= self._max_shields
+
+        self._scores[env] = self._score(game)
+
+        masks = self.masks[env].reshape(self._action_shape)
+        masks[:] = False
+        self._targeting[env].clear()
+        if game.is_over:
+            return
+
+        ready_ships = board.ship_names(player_name=self.agent_name, state="ready")
+        attacks = self._attacks.reshape(1, -1)
+        for ship, ship_name in enumerate(self.agent_ships):
+            if ship_name not in ready_ships:
+                continue
+
+            legal = self._targeting[env][ship_name] = {
+                attack[:3]: attack
+                for attack in board.attacks(ship_name, game.LONGEST_RANGE)
+            }
+            self._attacks[:] = False
+            self._attacks[0] = True
+            target_attacks = self._attacks[1:].reshape(self._attack_shape)
+            for target_name, attacking_hull_zone, defending_hull_zone in legal:
+                target_attacks[
+                    self._enemy_index[target_name],
+                    self._hull_zone_index[ship_name][attacking_hull_zone],
+                    self._hull_zone_index[target_name][defending_hull_zone],
+                ] = True
+
+            np.logical_and(
+                attacks.T,
+                self._moves < len(board.ships[ship_name].move_options),
+                out=masks[ship],
+            )
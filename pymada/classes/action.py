@@ -0,0 +1,124 @@
+"""Undoable changes to pieces on a board
+"""
+
+import pymada
+import pymada.errors
+
+
+def Action(name, *args, **kwargs):
+    """
+    """
+
+    ACTIONS = {}
+    ACTIONS["activate"] = ActivateAction
+    ACTIONS["fire"] = FireAction
+    ACTIONS["move"] = MoveAction
+
+    return ACTIONS[name](*args, **kwargs)
+
+
+class BaseAction:
+    """Class describing a change to pieces on a board which can be undone
+
+    attrs:
+        piece_names - names of every piece the action can change [tuple(str)]
+    notes:
+        apply with Board.make() and undo with Board.unmake() - only the state of
+        piece_names is saved so undo records stay small
+        actions are not checked for legality - see Ship.can_fire and Ship.check_clicks
+    """
+
+    def __init__(self, piece_name, *args, **kwargs):
+        """
+        args:
+            piece_name - piece taking action [str]
+        """
+
+        self.piece_name = piece_name
+        self.piece_names = (piece_name,)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.piece_name!r})"
+
+    def apply(self, board):
+        """
+        args:
+            board - board holding pieces [Board]
+        """
+
+        raise NotImplementedError
+
+
+class ActivateAction(BaseAction):
+    """
+    """
+
+    def apply(self, board):
+        """
+        """
+
+        board.ships[self.piece_name].activate()
+
+
+class FireAction(BaseAction):
+    """Attack with an already rolled attack pool e.g. one outcome of a chance node
+    """
+
+    def __init__(
+        self, piece_name, defender, attacking_hull_zone, defending_hull_zone, roll
+    ):
+        """
+        args:
+            piece_name - attacker [str]
+            defender - [str]
+            attacking_hull_zone - [str]
+            defending_hull_zone - [str]
+            roll - rolled attack pool [Roll]
+        """
+
+        super().__init__(piece_name)
+        self.defender = defender
+        self.attacking_hull_zone = attacking_hull_zone
+        self.defending_hull_zone = defending_hull_zone
+        self.roll = roll
+        self.piece_names = (defender,)
+
+    def __repr__(self):
+        return (
+            f"FireAction({self.piece_name!r}, {self.defender!r}, "
+            f"{self.attacking_hull_zone!r}, {self.defending_hull_zone!r}, {self.roll!r})"
+        )
+
+    def apply(self, board):
+        """
+        """
+
+        board.ships[self.defender].suffer(
+            self.roll, defending_hull_zone=self.defending_hull_zone
+        )
+
+
+class MoveAction(BaseAction):
+    """
+    """
+
+    def __init__(self, piece_name, clicks):
+        """
+        args:
+            piece_name - [str]
+            clicks - yaw clicks per notch [list(int)]
+        """
+
+        super().__init__(piece_name)
+        self.clicks = tuple(clicks)
+
+    def __repr__(self):
+        return f"MoveAction({self.piece_name!r}, {self.clicks!r})"
+
+    def apply(self, board):
+        """
+        notes:
+            speed is reduced and ships leaving the play area destroyed as in Board.move_ship
+        """
+
+        board.move_ship(self.piece_name, self.clicks)
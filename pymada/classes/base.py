@@ -6,32 +6,68 @@ from pymada.classes.position import Position
 
 # TODO add dimensions from ship_data
 # TODO add generic functions here e.g. for detecting collision i.e. if myShip.Base.overlaps(enemysquadron.Base()):
-# TODO add translate and rotate as helpers for inherited Move method
 # TODO add type of base e.g. squadronBase, ShipBase for specifics such as .move which first Base.rotates and then Base.translates for each notch for ship, or just Base.translates for squadrons
 # TODO should take model and type as args and search for model in ships, squadron_data and scenery_data etc. (then it could look up base size from model name)
 
 
 class Base:
     """Class describing Base of a model on the board
+
+    attrs:
+        centre - world pose of the base, shared with the owning piece [Position]
+        outline_local - outline points relative to centre and heading [array(N,2), cm]
+    notes:
+        world outline only recomputed when centre has changed since it was last requested
+        bases do not move themselves - move the owning piece so its board is updated
     """
 
-    def __init__(self, outline_points_x=None, outline_points_y=None):
+    def __init__(self, outline_points_x=None, outline_points_y=None, position=None):
         """Constructor for Base
-        """
 
-        self.centre = Position(x=0.0, y=0.0, theta=0.0)
-        self.outline = []
+        args:
+            outline_points_x - local x coordinates of outline points [list(float), cm]
+            outline_points_y - local y coordinates of outline points [list(float), cm]
+            position - world pose to attach base to, new pose at origin if None [Position]
+        """
 
+        self.outline_local = np.zeros((0, 2))
         if outline_points_x and outline_points_y:
-            for x, y in zip(outline_points_x, outline_points_y):
-                self.outline.append(Position(x=x, y=y))
-            # add outline points as observers to centre position
-            for position, _ in enumerate(self.outline):
-                self.centre.add_observer(self.outline[position].move)
-
-    def move(self, *args, **kwargs):
-        """Move base centre with outline using rotation matrix
+            self.outline_local = np.array(
+                [outline_points_x, outline_points_y], dtype=float
+            ).T
+
+        self.attach(
+            position if position is not None else Position(x=0.0, y=0.0, theta=0.0)
+        )
+
+    def attach(self, position):
+        """Attach base to a new world pose
+
+        args:
+            position - world pose of owning piece [Position]
+        """
+
+        self.centre = position
+        self._outline_points = None
+        self._outline_version = -1
+
+    @property
+    def outline_points(self):
+        """World coordinates of outline points [array(N,2), cm]
+        """
+
+        if self._outline_version != self.centre.version:
+            x, y = self.centre.to_world(
+                self.outline_local[:, 0], self.outline_local[:, 1]
+            )
+            self._outline_points = np.stack((x, y), axis=-1)
+            self._outline_version = self.centre.version
+
+        return self._outline_points
+
+    @property
+    def outline(self):
+        """World outline points as positions [list(Position)]
         """
 
-        # apply move to Base centre and watchers
-        self.centre.move(*args, **kwargs)
+        return [Position(x=x, y=y) for x, y in self.outline_points]
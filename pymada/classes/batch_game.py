@@ -0,0 +1,567 @@
+"""Many games advanced together as arrays
+"""
+
+import numpy as np
+
+import pymada
+import pymada.errors
+import pymada.classes.utils
+import pymada.classes.geometry
+from pymada.classes.dice import Dice
+from pymada.classes.roll import Roll
+from pymada.classes.game import Game
+
+
+class BatchGame:
+    """Class describing K independent games of the same fleets stored as arrays
+
+    attrs:
+        ship_names - order of ships along ship axes [list(str)]
+        hull_zone_names - order of hull zones of each ship along hull zone axes [list(list(str))]
+        player_names - order of players indexed by player [list(str)]
+        player - player index of each ship [array(S), int]
+        poses - x, y and theta of each ship [array(K,S,3), cm/deg]
+        speed - [array(K,S), int]
+        shields - shields remaining per hull zone, 0 for padding [array(K,S,H), int]
+        damage - number of damage cards [array(K,S), int]
+        removed - ships destroyed regardless of damage e.g. by leaving the board [array(K,S), bool]
+        activated - [array(K,S), bool]
+        turn - [array(K), int]
+        dice_rngs - dice stream of each game, spawned as Game spawns its dice_rng
+            [list(numpy.random.Generator)]
+    notes:
+        rules follow Game.play_ship_phase, Board.move_ship, PlayerPiece.can_fire and Ship.suffer
+        each activation takes one action per game - ship, attack and maneuver - and applies
+        them to every game at once
+        actions for games which are over are ignored
+        each game rolls only from its own dice stream and only when it attacks, so seeded
+        games roll exactly as the scalar Game with the same seed does whatever K is
+    """
+
+    MAX_TURNS = Game.MAX_TURNS
+
+    # dice colours rollable at each range band, in RANGE_BANDS order then out of range
+    RANGE_DICE = np.array(
+        [
+            [colour in Dice.RANGE_COLOURS[band] for colour in Dice.COLOURS]
+            for band in pymada.classes.geometry.RANGE_BANDS
+        ]
+        + [[False] * len(Dice.COLOURS)]
+    )
+
+    def __init__(self, board, n_games, seeds=None):
+        """Constructor for batch of games all starting from the state of a board
+
+        args:
+            board - deployed board to copy pieces and state from [Board]
+            n_games - number of games K [int]
+            seeds - entropy of each game as given to Game, fresh entropy if None
+                [list(int or numpy.random.SeedSequence)]
+        """
+
+        self.board = board
+        self.n_games = n_games
+        self.ship_names = list(board.ships)
+        ships = [board.ships[name] for name in self.ship_names]
+
+        self.hull_zone_names = [list(ship.hull_zones) for ship in ships]
+        self.player_names = list(dict.fromkeys(ship.player_name for ship in ships))
+        self.player = np.array(
+            [self.player_names.index(ship.player_name) for ship in ships]
+        )
+        self.hull = np.array([ship.hull for ship in ships])
+        self.faction = np.array([ship.faction for ship in ships])
+
+        n_ships = len(ships)
+        n_hull_zones = max(len(ship.hull_zones) for ship in ships)
+
+        # geometry local to each ship, NaN where a ship has fewer hull zones
+        self.outline_local = pymada.classes.geometry.pad_polylines(
+            [ship.base.outline_local for ship in ships]
+        )
+        n_points = max(ship.hull_zone_edges_local.shape[1] for ship in ships)
+        self.edges_local = np.full((n_ships, n_hull_zones, n_points, 2), np.nan)
+        self.LoS_dots_local = np.full((n_ships, n_hull_zones, 2), np.nan)
+        self.boundaries_local = np.full((n_ships, 2 * n_hull_zones, 2, 2), np.nan)
+        self.arc_origins_local = np.full((n_ships, n_hull_zones, 2), np.nan)
+        self.arc_normals_local = np.full((n_ships, n_hull_zones, 2, 2), np.nan)
+        self.arc_is_wide = np.zeros((n_ships, n_hull_zones), dtype=bool)
+        self.armament = np.zeros((n_ships, n_hull_zones, len(Dice.COLOURS)), dtype=int)
+        self.max_shields = np.zeros((n_ships, n_hull_zones), dtype=int)
+        for counter, ship in enumerate(ships):
+            zones = slice(len(ship.hull_zones))
+            self.edges_local[counter, zones] = pymada.classes.geometry.pad_polylines(
+                list(ship.hull_zone_edges_local), n_points
+            )
+            self.LoS_dots_local[counter, zones] = [
+                hull_zone.LoS_dot_local for hull_zone in ship.hull_zones.values()
+            ]
+            self.boundaries_local[
+                counter, : len(ship.hull_zone_boundaries_local)
+            ] = ship.hull_zone_boundaries_local
+            self.arc_origins_local[counter, zones] = ship.arc_origins_local
+            self.arc_normals_local[counter, zones] = ship.arc_normals_local
+            self.arc_is_wide[counter, zones] = ship.arc_is_wide
+            self.armament[counter, zones] = [
+                hull_zone.armament.counts for hull_zone in ship.hull_zones.values()
+            ]
+            self.max_shields[counter, zones] = [
+                ship._data["shields"][zone] for zone in ship.hull_zones
+            ]
+
+        self.board_outline = np.array([[point.x, point.y] for point in board.outline])
+        self._build_maneuvers(ships)
+
+        self.reset(seeds=seeds)
+
+    def _build_maneuvers(self, ships):
+        """Stack every ship's maneuver table for lookup by speed and clicks
+
+        notes:
+            rows of each ManeuverTable follow itertools.product order, so the row of a
+            clicks tuple is its mixed-radix value with radix 2 * max_clicks + 1 per notch
+        """
+
+        self.max_speed = max(max(ship._data["move"]) for ship in ships)
+        n_speeds = self.max_speed + 1
+
+        self.max_clicks = np.zeros((len(ships), n_speeds, self.max_speed), dtype=int)
+        tables = []
+        for counter, ship in enumerate(ships):
+            for speed in ship._data["move"]:
+                self.max_clicks[counter, speed, :speed] = ship._data["move"][speed][
+                    :speed
+                ]
+                tables.append((counter, speed, ship.maneuvers.displacements(speed)))
+
+        # place value of each notch with the first notch most significant
+        radices = 2 * self.max_clicks + 1
+        self.place_values = np.flip(
+            np.cumprod(np.flip(radices, axis=-1), axis=-1), axis=-1
+        )
+        self.place_values = np.concatenate(
+            (self.place_values[..., 1:], np.ones_like(self.place_values[..., :1])),
+            axis=-1,
+        )
+
+        n_rows = max(len(displacements) for _, _, displacements in tables)
+        self.displacements = np.zeros((len(ships), n_speeds, n_rows, 3))
+        for counter, speed, displacements in tables:
+            self.displacements[counter, speed, : len(displacements)] = displacements
+
+    def reset(self, games=None, seeds=None):
+        """Return games to the state of the board they were created from
+
+        args:
+            games - games to reset, all if None [array(K), bool]
+            seeds - entropy of each game reset, in order, fresh entropy if None
+                [list(int or numpy.random.SeedSequence)]
+        """
+
+        games = np.ones(self.n_games, dtype=bool) if games is None else games
+        ships = [self.board.ships[name] for name in self.ship_names]
+
+        if not hasattr(self, "dice_rngs"):
+            self.dice_rngs = [None] * self.n_games
+        indices = np.flatnonzero(games)
+        seeds = [None] * len(indices) if seeds is None else seeds
+        for game, seed in zip(indices, seeds):
+            self.dice_rngs[game] = np.random.default_rng(
+                Game.stream_seeds(seed, len(self.player_names))[0]
+            )
+
+        if not hasattr(self, "poses"):
+            self.poses = np.zeros((self.n_games, len(ships), 3))
+            self.speed = np.zeros((self.n_games, len(ships)), dtype=int)
+            self.shields = np.zeros((self.n_games,) + self.max_shields.shape, dtype=int)
+            self.damage = np.zeros((self.n_games, len(ships)), dtype=int)
+            self.removed = np.zeros((self.n_games, len(ships)), dtype=bool)
+            self.activated = np.zeros((self.n_games, len(ships)), dtype=bool)
+            self.turn = np.zeros(self.n_games, dtype=int)
+
+        self.poses[games] = [
+            [ship.position.x, ship.position.y, ship.position.theta] for ship in ships
+        ]
+        self.speed[games] = [ship.speed for ship in ships]
+        self.shields[games] = 0
+        for counter, ship in enumerate(ships):
+            self.shields[games, counter, : len(ship.hull_zones)] = [
+                hull_zone.shields for hull_zone in ship.hull_zones.values()
+            ]
+        self.damage[games] = [ship.damage for ship in ships]
+        self.removed[games] = [ship._is_destroyed for ship in ships]
+        self.activated[games] = [ship.has_activated for ship in ships]
+        self.turn[games] = 0
+
+    @property
+    def destroyed(self):
+        """[array(K,S), bool]
+        """
+
+        return self.removed | (self.damage >= self.hull)
+
+    @property
+    def eliminated(self):
+        """Whether each player has no ships left in each game [array(K,P), bool]
+        """
+
+        return np.stack(
+            [
+                self.destroyed[:, self.player == player].all(axis=-1)
+                for player in range(len(self.player_names))
+            ],
+            axis=-1,
+        )
+
+    @property
+    def is_over(self):
+        """[array(K), bool]
+        """
+
+        return (self.turn >= self.MAX_TURNS) | ((~self.eliminated).sum(axis=-1) <= 1)
+
+    @property
+    def winner(self):
+        """Index of only remaining player, -1 if none [array(K), int]
+        """
+
+        remaining = ~self.eliminated
+
+        return np.where(remaining.sum(axis=-1) == 1, remaining.argmax(axis=-1), -1)
+
+    def _to_world(self, points, poses):
+        """Transform points local to ships into world frame of their poses
+
+        args:
+            points - [array(...,2), cm]
+            poses - x, y and theta broadcasting against leading axes of points [array(...,3), cm/deg]
+        returns:
+            [array(...,2), cm]
+        notes:
+            e.g. geometry of every ship [array(S,H,M,2)] with every game's poses [array(K,S,3)]
+            gives [array(K,S,H,M,2)]
+        """
+
+        extra_axes = (Ellipsis,) + (None,) * (points.ndim - 2)
+        x, y, theta = (poses[..., axis][extra_axes] for axis in range(3))
+        points_x, points_y = pymada.classes.utils.rotate_2D(
+            points[..., 0], points[..., 1], theta
+        )
+
+        return np.stack((points_x + x, points_y + y), axis=-1)
+
+    def targeting(self, attacker):
+        """Range band and legality of every attack open to one ship per game
+
+        args:
+            attacker - attacking ship index in each game [array(K), int]
+        returns:
+            band - index in RANGE_BANDS, len(RANGE_BANDS) if out of range or not an enemy in
+                arc [array(K,H,S,H), int]
+            can_fire - whether each (attacking hull zone, defender, defending hull zone) is
+                a live enemy passing arc, line of sight, range and dice checks
+                [array(K,H,S,H), bool]
+        notes:
+            see PlayerPiece.can_fire for the equivalent single test and Game.play_ship_phase
+            for choice of targets
+        """
+
+        games = np.arange(self.n_games)
+        poses = self.poses
+        attacker_poses = poses[games, attacker]
+
+        # attacking geometry [K,H,...] and defending geometry [K,S,H,...]
+        edges = self._to_world(self.edges_local, poses)
+        attacking_edges = edges[games, attacker]
+        origins = self._to_world(self.arc_origins_local[attacker], attacker_poses)
+        normals = self.arc_normals_local[attacker]
+        normals = np.stack(
+            pymada.classes.utils.rotate_2D(
+                normals[..., 0], normals[..., 1], attacker_poses[:, 2, None, None]
+            ),
+            axis=-1,
+        )
+        dots = self._to_world(self.LoS_dots_local, poses)
+        boundaries = self._to_world(self.boundaries_local, poses)
+        outline_edges = pymada.classes.geometry.outline_edges(
+            self._to_world(self.outline_local, poses)
+        )
+
+        # arc
+        destroyed = self.destroyed
+        enemies = (
+            self.faction[None, :] != self.faction[attacker][:, None]
+        ) & ~destroyed
+        can_fire = (
+            pymada.classes.geometry.polylines_in_arc(
+                edges[:, None],
+                origins[:, :, None, None],
+                normals[:, :, None, None],
+                self.arc_is_wide[attacker][:, :, None, None],
+            )
+            & enemies[:, None, :, None]
+        )
+
+        # range and dice available at range, only measured for enemies in arc
+        k, h, d, h2 = np.nonzero(can_fire)
+        distances = pymada.classes.geometry.polyline_distances(
+            attacking_edges[k, h], edges[k, d, h2]
+        )
+        band = np.full(can_fire.shape, len(pymada.classes.geometry.RANGE_BANDS))
+        band[k, h, d, h2] = np.searchsorted(
+            pymada.classes.geometry.RANGE_LIMITS, distances
+        )
+        dice = (self.armament[attacker[k], h] * self.RANGE_DICE[band[k, h, d, h2]]).sum(
+            axis=-1
+        )
+        can_fire[k, h, d, h2] = dice > 0
+
+        # line of sight only traced for attacks passing every other check
+        k, h, d, h2 = np.nonzero(can_fire)
+        starts, ends = dots[k, attacker[k], h], dots[k, d, h2]
+        crosses_defender = pymada.classes.geometry.crosses_any(
+            starts, ends, boundaries[k, d]
+        )
+
+        # line of sight must also avoid bases of every live ship but attacker and defender
+        crosses_bases = pymada.classes.geometry.segments_intersect(
+            starts[:, None, None],
+            ends[:, None, None],
+            outline_edges[k, ..., 0, :],
+            outline_edges[k, ..., 1, :],
+        ).any(axis=-1)
+        ships = np.arange(len(self.ship_names))
+        obstacles = (ships != attacker[k, None]) & (ships != d[:, None]) & ~destroyed[k]
+        crosses_bases = (crosses_bases & obstacles).any(axis=-1)
+
+        can_fire[k, h, d, h2] = ~crosses_defender & ~crosses_bases
+
+        return band, can_fire
+
+    def roll(self, attacker, attacking_hull_zone, band, games, rngs=None):
+        """Roll attacking hull zone armament at range band in some games
+
+        args:
+            attacker - [array(K), int]
+            attacking_hull_zone - [array(K), int]
+            band - range band index [array(K), int]
+            games - games to roll in [array(K), bool]
+            rngs - dice generator of each game, dice_rngs if None [list(numpy.random.Generator)]
+        returns:
+            number of dice showing each face type, 0 in games not rolled [array(K,F), int]
+        notes:
+            each game draws from its own generator exactly as Dice.roll does, so no game's
+            dice depend on K or on which other games roll
+        """
+
+        rngs = self.dice_rngs if rngs is None else rngs
+        dice = self.armament[attacker, attacking_hull_zone] * self.RANGE_DICE[band]
+
+        counts = np.zeros((self.n_games, len(Roll.FACE_SYMBOLS)), dtype=int)
+        for game in np.flatnonzero(games):
+            counts[game] = sum(
+                rngs[game].multinomial(count, probabilities)
+                for count, probabilities in zip(dice[game], Dice.FACE_PROBABILITIES)
+            )
+
+        return counts
+
+    def activate(self, ship, games=None):
+        """
+        args:
+            ship - ship index to activate in each game [array(K), int]
+            games - games to act in, all games which are not over if None [array(K), bool]
+        """
+
+        games = ~self.is_over if games is None else games
+        self.activated[np.flatnonzero(games), ship[games]] = True
+
+    def fire(
+        self,
+        attacker,
+        attacking_hull_zone,
+        defender,
+        defending_hull_zone,
+        rngs=None,
+        damage=None,
+        games=None,
+    ):
+        """Attack in every game where the attack is legal
+
+        args:
+            attacker, attacking_hull_zone, defender, defending_hull_zone - indices, defender -1
+                for no attack [array(K), int]
+            rngs - dice generator of each game, dice_rngs if None [list(numpy.random.Generator)]
+            damage - damage of each attack instead of rolling [array(K), int]
+            games - games to act in, all games which are not over if None [array(K), bool]
+        returns:
+            damage dealt, 0 where no attack was made [array(K), int]
+        notes:
+            damage is hits plus crits as in Ship.suffer - shields absorb damage first and
+            each point left over is a damage card
+        """
+
+        games = ~self.is_over if games is None else games
+        indices = np.arange(self.n_games)
+
+        band, can_fire = self.targeting(attacker)
+        legal = (
+            games
+            & (defender >= 0)
+            & can_fire[indices, attacking_hull_zone, defender, defending_hull_zone]
+        )
+
+        if damage is None:
+            symbols = (
+                self.roll(
+                    attacker,
+                    attacking_hull_zone,
+                    band[indices, attacking_hull_zone, defender, defending_hull_zone],
+                    legal,
+                    rngs,
+                )
+                @ Roll.FACE_SYMBOLS
+            )
+            damage = symbols[:, 0] + symbols[:, 1]
+        damage = np.where(legal, damage, 0)
+
+        games, defender, defending_hull_zone = (
+            indices[legal],
+            defender[legal],
+            defending_hull_zone[legal],
+        )
+        shields = self.shields[games, defender, defending_hull_zone]
+        self.damage[games, defender] += np.maximum(damage[legal] - shields, 0)
+        self.shields[games, defender, defending_hull_zone] = np.maximum(
+            shields - damage[legal], 0
+        )
+
+        return damage
+
+    def move(self, ship, clicks, games=None):
+        """Maneuver one ship per game, reducing speed until it does not overlap another base
+
+        args:
+            ship - [array(K), int]
+            clicks - yaw clicks per notch padded to max_speed notches [array(K,V), int]
+            games - games to act in, all games which are not over if None [array(K), bool]
+        returns:
+            speed each maneuver was executed at [array(K), int]
+        notes:
+            see Board.move_ship - ships leaving the play area are destroyed
+        """
+
+        games = ~self.is_over if games is None else games
+        indices = np.arange(self.n_games)
+        poses = self.poses[indices, ship]
+        clicks = np.asarray(clicks).reshape(self.n_games, -1)
+        clicks = np.pad(clicks, ((0, 0), (0, self.max_speed - clicks.shape[1])))
+
+        speed = np.zeros(self.n_games, dtype=int)
+        off_board = np.zeros(self.n_games, dtype=bool)
+        unresolved = games & (self.speed[indices, ship] > 0)
+        others = (
+            np.arange(len(self.ship_names))[None] != ship[:, None]
+        ) & ~self.destroyed
+        outlines = self._to_world(self.outline_local, self.poses)
+
+        for candidate_speed in range(self.max_speed, 0, -1):
+            trying = unresolved & (candidate_speed <= self.speed[indices, ship])
+            if not trying.any():
+                continue
+
+            displacements = self._displacements(ship, candidate_speed, clicks)
+            x, y, theta = pymada.classes.utils.compose_2D(*poses.T, *displacements.T)
+            candidates = self._to_world(
+                self.outline_local[ship], np.stack((x, y, theta), axis=-1)
+            )
+
+            overlaps = (
+                pymada.classes.geometry.polygons_overlap(candidates[:, None], outlines)
+                & others
+            ).any(axis=-1)
+            leaves = ~pymada.classes.geometry.points_in_polygon(
+                candidates, self.board_outline
+            ).all(axis=-1)
+
+            resolved = trying & ~overlaps
+            speed[resolved] = candidate_speed
+            off_board[resolved] = leaves[resolved]
+            unresolved &= ~resolved
+
+        displacements = self._displacements(ship, speed, clicks)
+        self.poses[indices, ship] = np.where(
+            games[:, None],
+            np.stack(pymada.classes.utils.compose_2D(*poses.T, *displacements.T), -1),
+            poses,
+        )
+        self.removed[indices, ship] |= games & off_board
+
+        return speed
+
+    def _displacements(self, ship, speed, clicks):
+        """Look up maneuver displacement with clicks clamped to maximum yaw at speed
+
+        args:
+            ship - [array(K), int]
+            speed - [int or array(K), int]
+            clicks - [array(K,V), int]
+        returns:
+            (dx, dy, dtheta) [array(K,3), cm/deg]
+        """
+
+        speed = np.broadcast_to(speed, ship.shape)
+        max_clicks = self.max_clicks[ship, speed]
+        clicks = np.clip(clicks, -max_clicks, max_clicks)
+        rows = ((clicks + max_clicks) * self.place_values[ship, speed]).sum(axis=-1)
+
+        return self.displacements[ship, speed, rows]
+
+    def play_activation(
+        self,
+        ship,
+        attacking_hull_zone,
+        defender,
+        defending_hull_zone,
+        clicks,
+        rngs=None,
+        games=None,
+    ):
+        """Activate, attack with and then maneuver one ship per game as in Game.play_ship_phase
+
+        args:
+            ship - [array(K), int]
+            attacking_hull_zone, defender, defending_hull_zone - attack, defender -1 for
+                no attack [array(K), int]
+            clicks - yaw clicks per notch [array(K,V), int]
+            rngs - dice generator of each game, dice_rngs if None [list(numpy.random.Generator)]
+            games - games to act in, all games which are not over if None [array(K), bool]
+        returns:
+            damage dealt and speed maneuvers were executed at [tuple(array(K), int)]
+        """
+
+        games = ~self.is_over if games is None else games
+
+        self.activate(ship, games)
+        damage = self.fire(
+            ship,
+            attacking_hull_zone,
+            defender,
+            defending_hull_zone,
+            rngs=rngs,
+            games=games,
+        )
+        speed = self.move(ship, clicks, games=games)
+
+        return damage, speed
+
+    def status_phase(self, games=None):
+        """Ready all ships and advance turn
+
+        args:
+            games - games to act in, all games which are not over if None [array(K), bool]
+        """
+
+        games = ~self.is_over if games is None else games
+        self.activated[games] = False
+        self.turn[games] += 1
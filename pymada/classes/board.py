@@ -1,13 +1,20 @@
 """Game board
 """
 import sys
-import os, sys
+import os, sys, zlib
+
+import numpy as np
 
 import pymada
 import pymada.errors
 import pymada.data.tools
+import pymada.classes.utils
+import pymada.classes.geometry
 from pymada.classes.position import Position
+from pymada.classes.dice import Dice
 from pymada.classes.ship import Ship
+from pymada.classes.spatial_index import SpatialIndex
+from pymada.classes.geometry_cache import GeometryCache
 
 
 class Board:
@@ -26,6 +33,7 @@ class Board:
     DEPLOYMENT_AREA_WIDTH = 4.0 * 30.48
     DEPLOYEMENT_ZONE_DEPTH = pymada.data.tools.rulers["distance"][3]
     DEPLOYMENT_AREA_HEIGHT = 3.0 * 30.48 - 2.0 * DEPLOYEMENT_ZONE_DEPTH
+    POSE_RESOLUTION = 0.01  # poses closer than this hash the same [cm, deg]
 
     def __init__(self, width=PLAY_AREA_WIDTH, height=PLAY_AREA_HEIGHT, play_area=True):
         """
@@ -62,6 +70,23 @@ class Board:
         self.piece_names = []
         self.obstacles = []
         self.ships = {}
+        self.spatial_index = SpatialIndex()
+        self.geometry_cache = GeometryCache()
+
+        # ship names grouped by player and by faction, each with subsets of live ships and
+        # of live ships yet to activate, plus number of players/factions with live ships
+        self._ship_index = {"player": {}, "faction": {}}
+        self._n_live = {"player": 0, "faction": 0}
+
+        # 64 bit hash of every ship's state - XOR of one hash per ship so changing one ship
+        # updates it in O(1)
+        self.state_hash = 0
+        self._ship_hashes = {}
+
+        # bumped whenever a ship moves or is destroyed or restored, so board-wide geometry
+        # e.g. line of sight can be cached against it - activation and damage leave it alone
+        self.layout_version = 0
+        self._ship_layouts = {}
 
     def add_ship(
         self,
@@ -74,10 +99,12 @@ class Board:
         x=0.0,
         y=0.0,
         theta=0.0,
+        rng=None,
     ):
         """
         args:
             ships - ship instances to add to board *[Ship]
+            rng - random generator for piece colour [numpy.random.Generator]
         """
 
         ship = Ship(
@@ -90,11 +117,116 @@ class Board:
             x=x,
             y=y,
             theta=theta,
+            rng=rng,
         )
 
+        ship.board = self
         self.ships[ship.name] = ship
         self.piece_names.append(name)
 
+        for group, key in (("player", player_name), ("faction", faction)):
+            self._ship_index[group].setdefault(
+                key, {"all": set(), "live": set(), "ready": set()}
+            )["all"].add(name)
+        self._refresh(ship)
+
+    def _refresh(self, ship):
+        """Update ship in indexes of live and unactivated ships, broadphase and state hash
+
+        args:
+            ship - ship whose pose, activation, destruction or damage may have changed [Ship]
+        notes:
+            called by pieces themselves - see Piece._update_board
+            O(1) so can be called on every change
+        """
+
+        layout = (ship.position.version, ship.is_destroyed)
+        if self._ship_layouts.get(ship.name) != layout:
+            self._ship_layouts[ship.name] = layout
+            self.layout_version += 1
+
+        ship_hash = self._hash_ship(ship)
+        self.state_hash ^= self._ship_hashes.get(ship.name, 0) ^ ship_hash
+        self._ship_hashes[ship.name] = ship_hash
+
+        live = not ship.is_destroyed
+        ready = live and not ship.has_activated
+
+        # destroyed ships leave the broadphase so nothing collides with or targets them,
+        # and return when restored by unmake or reset
+        if live:
+            self.spatial_index.update(ship)
+        elif ship.name in self.spatial_index:
+            self.spatial_index.remove(ship.name)
+
+        for group, key in (("player", ship.player_name), ("faction", ship.faction)):
+            entry = self._ship_index[group].get(key)
+            if entry is None or ship.name not in entry["all"]:
+                continue
+
+            had_live = bool(entry["live"])
+            if live:
+                entry["live"].add(ship.name)
+            else:
+                entry["live"].discard(ship.name)
+            if ready:
+                entry["ready"].add(ship.name)
+            else:
+                entry["ready"].discard(ship.name)
+            self._n_live[group] += bool(entry["live"]) - had_live
+
+    def _hash_ship(self, ship):
+        """64 bit hash of everything about a ship which changes during a game
+
+        args:
+            ship - [Ship]
+        notes:
+            poses are rounded to POSE_RESOLUTION so equal poses reached by different
+            maneuvers hash the same, and headings are wrapped so -180 and 180 agree
+        """
+
+        x, y, theta = (
+            int(round(float(value) / self.POSE_RESOLUTION))
+            for value in (ship.position.x, ship.position.y, ship.position.theta % 360.0)
+        )
+        pose = (x, y, theta % int(round(360.0 / self.POSE_RESOLUTION)))
+
+        return pymada.classes.utils.hash_values(
+            zlib.crc32(ship.name.encode()),
+            pose
+            + (ship.speed, ship.damage, ship.has_activated, ship.is_destroyed)
+            + tuple(hull_zone.shields for hull_zone in ship.hull_zones.values()),
+        )
+
+    def ship_names(self, player_name=None, faction=None, state="all"):
+        """Names of a player's or faction's ships from the index
+
+        args:
+            player_name - [str]
+            faction - used if player_name is None [str]
+            state - "all", "live" or "ready" for live ships yet to activate [str]
+        returns:
+            [set(str)]
+        notes:
+            returns the index itself without copying - copy before changing ships if
+            iterating over it
+        """
+
+        group, key = (
+            ("player", player_name) if player_name is not None else ("faction", faction)
+        )
+
+        return self._ship_index[group].get(key, {}).get(state, set())
+
+    def n_live(self, group="player"):
+        """Number of players or factions which have live ships
+
+        args:
+            group - "player" or "faction" [str]
+        """
+
+        return self._n_live[group]
+
     def add_obstacles(self, *obstacles):
         """
         args:
@@ -104,3 +236,508 @@ class Board:
         for obstacle in obstacles:
             self.piece_names.append(obstacle.name)
             self.obstacles.extend(obstacle)
+
+    def pieces_within(self, name, range_band, hull_zone=None):
+        """Broadphase for pieces that could be within a range band of a piece
+
+        args:
+            name - name of measuring piece [str]
+            range_band - range band colour e.g. "red" [str]
+            hull_zone - measure from this hull zone only, whole base if None [str]
+        returns:
+            names of other pieces whose bases may lie within range [set(str)]
+        notes:
+            conservative - use exact range measurements on the returned pieces
+        """
+
+        piece = self.ships[name]
+        if hull_zone is None:
+            x, y = piece.position.x, piece.position.y
+            radius = self.spatial_index.bounding_radius(piece)
+        else:
+            edge = piece.hull_zones[hull_zone].edge_points
+            x, y = edge.mean(axis=0)
+            radius = np.max(np.hypot(edge[:, 0] - x, edge[:, 1] - y))
+
+        return self.spatial_index.query(
+            x, y, radius + pymada.data.tools.rulers["range"][range_band]
+        ) - {name}
+
+    def _to_world(self, ships, points_local, translate=True):
+        """Transform local points of each ship into the world frame in one batch
+
+        args:
+            ships - [list(Ship)]
+            points_local - points of each ship relative to its position [array(S,...,2), cm]
+            translate - rotate only if False e.g. for directions such as arc normals [bool]
+        returns:
+            [array(S,...,2), cm]
+        """
+
+        x, y, theta = np.array(
+            [[ship.position.x, ship.position.y, ship.position.theta] for ship in ships]
+        ).T.reshape((3, len(ships)) + (1,) * (points_local.ndim - 3))
+        if not translate:
+            x, y = 0.0, 0.0
+
+        return pymada.classes.utils.transform_2D(points_local, x, y, theta)
+
+    def hull_zone_edges(self, ship_names=None):
+        """World hull zone edges of ships transformed in one batch
+
+        args:
+            ship_names - ships to include, all ships if None [list(str)]
+        returns:
+            world edges padded with NaN where a ship has fewer hull zones [array(S,H,M,2), cm]
+        """
+
+        ships = [
+            self.ships[name]
+            for name in (self.ships if ship_names is None else ship_names)
+        ]
+
+        n_hull_zones = max(len(ship.hull_zone_edges_local) for ship in ships)
+        n_points = max(ship.hull_zone_edges_local.shape[1] for ship in ships)
+        edges_local = np.full((len(ships), n_hull_zones, n_points, 2), np.nan)
+        for counter, ship in enumerate(ships):
+            edges = ship.hull_zone_edges_local
+            edges_local[counter, : len(edges)] = np.concatenate(
+                (edges, np.repeat(edges[:, -1:], n_points - edges.shape[1], axis=1)),
+                axis=1,
+            )
+
+        return self._to_world(ships, edges_local)
+
+    def range_matrix(self, ship_names=None):
+        """Exact range between every hull zone of every pair of ships
+
+        args:
+            ship_names - ships to measure between, all ships if None [list(str)]
+        returns:
+            ship_names - order of ships in distances [list(str)]
+            hull_zone_names - order of hull zones of each ship in distances [list(list(str))]
+            distances - closest distance from attacking (ship, hull zone) edge to defending
+                (ship, hull zone) edge, NaN for padding [array(S,H,S,H), cm]
+        notes:
+            map distances to range bands with pymada.classes.geometry.range_band
+        """
+
+        ship_names = list(self.ships if ship_names is None else ship_names)
+
+        return (
+            ship_names,
+            [list(self.ships[name].hull_zones) for name in ship_names],
+            pymada.classes.geometry.distance_matrix(self.hull_zone_edges(ship_names)),
+        )
+
+    def arc_matrix(self, ship_names=None):
+        """Whether every hull zone of every ship lies in every firing arc in one pass
+
+        args:
+            ship_names - ships to test between, all ships if None [list(str)]
+        returns:
+            ship_names - order of ships in in_arc [list(str)]
+            hull_zone_names - order of hull zones of each ship in in_arc [list(list(str))]
+            in_arc - whether any part of defending (ship, hull zone) edge lies within
+                attacking (ship, hull zone) firing arc [array(S,H,S,H), bool]
+        notes:
+            see Ship.arc_to for the equivalent single test
+        """
+
+        ship_names = list(self.ships if ship_names is None else ship_names)
+        ships = [self.ships[name] for name in ship_names]
+        n_hull_zones = max(len(ship.hull_zones) for ship in ships)
+
+        # arc half-planes padded with NaN, which are never inside
+        origins_local = np.full((len(ships), n_hull_zones, 2), np.nan)
+        normals_local = np.full((len(ships), n_hull_zones, 2, 2), np.nan)
+        is_wide = np.zeros((len(ships), n_hull_zones), dtype=bool)
+        for counter, ship in enumerate(ships):
+            origins_local[counter, : len(ship.hull_zones)] = ship.arc_origins_local
+            normals_local[counter, : len(ship.hull_zones)] = ship.arc_normals_local
+            is_wide[counter, : len(ship.hull_zones)] = ship.arc_is_wide
+
+        origins = self._to_world(ships, origins_local)
+        normals = self._to_world(ships, normals_local, translate=False)
+
+        return (
+            ship_names,
+            [list(ship.hull_zones) for ship in ships],
+            pymada.classes.geometry.polylines_in_arc(
+                self.hull_zone_edges(ship_names)[None, None],
+                origins[:, :, None, None],
+                normals[:, :, None, None],
+                is_wide[:, :, None, None],
+            ),
+        )
+
+    def LoS_matrix(self, ship_names=None):
+        """Line of sight between every hull zone of every pair of ships in one pass
+
+        args:
+            ship_names - ships to trace between, all ships if None [list(str)]
+        returns:
+            ship_names - order of ships in has_LoS [list(str)]
+            hull_zone_names - order of hull zones of each ship in has_LoS [list(list(str))]
+            has_LoS - whether line between attacking (ship, hull zone) LoS dot and defending
+                (ship, hull zone) LoS dot avoids the defender's other hull zones and the bases
+                of all other live ships on the board [array(S,H,S,H), bool]
+        notes:
+            see Ship.LoS_to for the equivalent single measurement
+        """
+
+        ship_names = list(self.ships if ship_names is None else ship_names)
+        ships = [self.ships[name] for name in ship_names]
+        obstacles = [
+            ship for name, ship in self.ships.items() if name not in ship_names
+        ]
+        n_hull_zones = max(len(ship.hull_zones) for ship in ships)
+
+        # gather local geometry padded with NaN, which never intersects
+        dots_local = np.full((len(ships), n_hull_zones, 2), np.nan)
+        boundaries_local = np.full((len(ships), 2 * n_hull_zones, 2, 2), np.nan)
+        for counter, ship in enumerate(ships):
+            dots_local[counter, : len(ship.hull_zones)] = [
+                hull_zone.LoS_dot_local for hull_zone in ship.hull_zones.values()
+            ]
+            boundaries_local[
+                counter, : len(ship.hull_zone_boundaries_local)
+            ] = ship.hull_zone_boundaries_local
+
+        # one batched transform into world coordinates
+        dots = self._to_world(ships, dots_local)
+        boundaries = self._to_world(ships, boundaries_local)
+        outlines = [ship.base.outline_points for ship in ships + obstacles]
+        edges = pymada.classes.geometry.outline_edges(
+            pymada.classes.geometry.pad_polylines(outlines)
+        )
+
+        # LoS segments from every attacking dot to every defending dot [S,H,S,H,2]
+        starts = np.broadcast_to(
+            dots[:, :, None, None], (len(ships), n_hull_zones) * 2 + (2,)
+        )
+        ends = np.broadcast_to(dots[None, None], starts.shape)
+
+        # test against defender's own hull zone boundaries
+        blocked = pymada.classes.geometry.crosses_any(
+            starts, ends, boundaries[None, None, :, None]
+        )
+
+        # test against every base, then ignore the attacker's and defender's own and
+        # those of destroyed ships
+        crosses_base = pymada.classes.geometry.crosses_any(
+            starts[..., None, :], ends[..., None, :], edges
+        )
+        own_base = np.zeros((len(ships),) * 3, dtype=bool)
+        own_base[np.arange(len(ships)), :, np.arange(len(ships))] = True
+        own_base[:, np.arange(len(ships)), np.arange(len(ships))] = True
+        own_base = np.concatenate(
+            (own_base, np.zeros((len(ships),) * 2 + (len(obstacles),), dtype=bool)),
+            axis=-1,
+        )
+        destroyed = np.array([ship.is_destroyed for ship in ships + obstacles])
+        blocked |= (crosses_base & ~own_base[:, None, :, None] & ~destroyed).any(
+            axis=-1
+        )
+
+        valid = ~np.isnan(dots[..., 0])
+        has_LoS = (
+            ~blocked
+            & valid[:, :, None, None]
+            & valid[None, None]
+            & ~np.eye(len(ships), dtype=bool)[:, None, :, None]
+        )
+
+        return ship_names, [list(ship.hull_zones) for ship in ships], has_LoS
+
+    def collisions(self, name, outlines):
+        """Check candidate base outlines of a piece against other bases and the board edge
+
+        args:
+            name - piece the outlines belong to [str]
+            outlines - candidate world base outlines e.g. from Ship.move_outcomes [array(N,P,2), cm]
+        returns:
+            overlaps - whether each outline overlaps another piece's base [array(N), bool]
+            off_board - whether each outline leaves the play area [array(N), bool]
+        """
+
+        # broadphase on circle bounding every candidate outline
+        centre = outlines.reshape(-1, 2).mean(axis=0)
+        radius = np.max(np.hypot(*(outlines.reshape(-1, 2) - centre).T))
+        others = sorted(self.spatial_index.query(*centre, radius) - {name})
+
+        overlaps = np.zeros(len(outlines), dtype=bool)
+        if others:
+            other_outlines = pymada.classes.geometry.pad_polylines(
+                [self.ships[other].base.outline_points for other in others]
+            )
+            overlaps = pymada.classes.geometry.polygons_overlap(
+                outlines[:, None], other_outlines[None]
+            ).any(axis=-1)
+
+        board_outline = np.array([[point.x, point.y] for point in self.outline])
+        off_board = ~pymada.classes.geometry.points_in_polygon(
+            outlines, board_outline
+        ).all(axis=-1)
+
+        return overlaps, off_board
+
+    def targeting(self, name, targets):
+        """Range band and legality of every attack one ship could make, measured once
+
+        args:
+            name - attacking ship name [str]
+            targets - names of ships which could be attacked e.g. nearby enemies [list(str)]
+        returns:
+            hull_zone_names - order of attacking hull zones [list(str)]
+            target_names - order of targets [list(str)]
+            defending_hull_zone_names - order of hull zones of each target [list(list(str))]
+            bands - range band colour or False for each (attacking hull zone, target,
+                defending hull zone) [array(H,T,H), object]
+            can_fire - whether each attack lies in arc, in line of sight and in range of
+                dice in attacking hull zone [array(H,T,H), bool]
+        notes:
+            see PlayerPiece.can_fire for the equivalent single test
+            arc, range and dice are checked for every attack in one pass and line of sight
+            only traced for attacks which pass them
+        """
+
+        attacker = self.ships[name]
+        target_names = list(targets)
+        hull_zone_names = list(attacker.hull_zones)
+        defending_hull_zone_names = [
+            list(self.ships[target].hull_zones) for target in target_names
+        ]
+        shape = (len(hull_zone_names), len(target_names)) + (
+            max(map(len, defending_hull_zone_names), default=0),
+        )
+        if not target_names:
+            return (
+                hull_zone_names,
+                target_names,
+                defending_hull_zone_names,
+                np.full(shape, False, dtype=object),
+                np.zeros(shape, dtype=bool),
+            )
+
+        # defending hull zone edges padded with NaN, which are never in arc or range
+        edges = self.hull_zone_edges([name] + target_names)
+        attacking_edges, defending_edges = edges[0, : len(hull_zone_names)], edges[1:]
+
+        # arc
+        origins = self._to_world([attacker], attacker.arc_origins_local[None])[0]
+        normals = self._to_world(
+            [attacker], attacker.arc_normals_local[None], translate=False
+        )[0]
+        can_fire = pymada.classes.geometry.polylines_in_arc(
+            defending_edges[None],
+            origins[:, None, None],
+            normals[:, None, None],
+            attacker.arc_is_wide[:, None, None],
+        )
+
+        # range and whether each hull zone has dice which reach each range band
+        distances = pymada.classes.geometry.polyline_distances(
+            attacking_edges[:, None, None], defending_edges[None]
+        )
+        band_indices = np.searchsorted(
+            pymada.classes.geometry.RANGE_LIMITS, np.nan_to_num(distances, nan=np.inf)
+        )
+        has_dice = np.array(
+            [
+                [
+                    bool(Dice.RANGE_COLOURS[band] & hull_zone.armament.colours)
+                    for band in pymada.classes.geometry.RANGE_BANDS
+                ]
+                + [False]
+                for hull_zone in attacker.hull_zones.values()
+            ]
+        )
+        can_fire &= np.take_along_axis(
+            has_dice, band_indices.reshape(len(hull_zone_names), -1), axis=-1
+        ).reshape(band_indices.shape)
+
+        # line of sight avoiding defender's other hull zones and bases of other live ships
+        h, t, d = np.nonzero(can_fire)
+        if len(h):
+            attacking_dots = np.array(
+                [
+                    [hull_zone.LoS_dot_position.x, hull_zone.LoS_dot_position.y]
+                    for hull_zone in attacker.hull_zones.values()
+                ]
+            )
+            defending_dots = np.full(shape[1:] + (2,), np.nan)
+            boundaries = np.full((len(target_names), 2 * shape[-1], 2, 2), np.nan)
+            for counter, target in enumerate(target_names):
+                hull_zones = self.ships[target].hull_zones.values()
+                defending_dots[counter, : len(hull_zones)] = [
+                    [hull_zone.LoS_dot_position.x, hull_zone.LoS_dot_position.y]
+                    for hull_zone in hull_zones
+                ]
+                target_boundaries = self.ships[target].hull_zone_boundaries
+                boundaries[counter, : len(target_boundaries)] = target_boundaries
+
+            starts, ends = attacking_dots[h], defending_dots[t, d]
+            blocked = pymada.classes.geometry.crosses_any(starts, ends, boundaries[t])
+
+            ship_names = list(self.ships)
+            base_edges = pymada.classes.geometry.outline_edges(
+                pymada.classes.geometry.pad_polylines(
+                    [ship.base.outline_points for ship in self.ships.values()]
+                )
+            )
+            obstacles = np.tile(
+                [not ship.is_destroyed for ship in self.ships.values()],
+                (len(target_names), 1),
+            )
+            obstacles[:, ship_names.index(name)] = False
+            obstacles[
+                np.arange(len(target_names)),
+                [ship_names.index(target) for target in target_names],
+            ] = False
+            blocked |= (
+                pymada.classes.geometry.crosses_any(
+                    starts[:, None], ends[:, None], base_edges[None]
+                )
+                & obstacles[t]
+            ).any(axis=-1)
+
+            can_fire[h, t, d] = ~blocked
+
+        bands = np.array(pymada.classes.geometry.RANGE_BANDS + [False], dtype=object)[
+            band_indices
+        ]
+
+        return hull_zone_names, target_names, defending_hull_zone_names, bands, can_fire
+
+    def attacks(self, name, range_band):
+        """Every legal attack of a ship on live enemy ships
+
+        args:
+            name - attacking ship name [str]
+            range_band - longest range band to look for targets within e.g. "red" [str]
+        returns:
+            (target, attacking hull zone, defending hull zone, range band) of each attack
+                in hull zone order, targets sorted by name [list(tuple(str, str, str, str))]
+        notes:
+            enemies are found by pieces_within then every attack measured once by targeting
+        """
+
+        faction = self.ships[name].faction
+        targets = sorted(
+            target
+            for target in self.pieces_within(name, range_band)
+            if self.ships[target].faction != faction
+            and not self.ships[target].is_destroyed
+        )
+
+        (
+            hull_zone_names,
+            target_names,
+            defending_hull_zone_names,
+            bands,
+            can_fire,
+        ) = self.targeting(name, targets)
+
+        return [
+            (
+                target_names[target],
+                hull_zone_names[attacker],
+                defending_hull_zone_names[target][defender],
+                bands[attacker, target, defender],
+            )
+            for attacker, target, defender in zip(*np.nonzero(can_fire))
+        ]
+
+    def resolve_speeds(self, name, options=None):
+        """Speed each maneuver would actually be executed at after overlap checks
+
+        args:
+            name - ship name [str]
+            options - clicks tuples, all of ship's move_options if None [sequence(tuple(int))]
+        returns:
+            speeds - highest speed not above the ship's speed whose end position does not
+                overlap another base [array(N), int]
+            off_board - whether ship would leave the play area at that speed [array(N), bool]
+        notes:
+            every option is checked at once for each speed, reducing speed only where needed
+            clicks are clamped to the maximum yaw of each reduced speed
+        """
+
+        ship = self.ships[name]
+        options = ship.move_options if options is None else options
+
+        speeds = np.zeros(len(options), dtype=int)
+        off_board = np.zeros(len(options), dtype=bool)
+        unresolved = np.ones(len(options), dtype=bool)
+        for speed in range(ship.speed, 0, -1):
+            indices = np.flatnonzero(unresolved)
+            _, outlines = ship.move_outcomes(
+                [ship.maneuvers.clamp(speed, options[index]) for index in indices],
+                speed=speed,
+            )
+            overlaps, leaves = self.collisions(name, outlines)
+            speeds[indices[~overlaps]] = speed
+            off_board[indices[~overlaps]] = leaves[~overlaps]
+            unresolved[indices[~overlaps]] = False
+            if not unresolved.any():
+                break
+
+        return speeds, off_board
+
+    def move_ship(self, name, clicks):
+        """Move ship, reducing speed until it does not overlap another base
+
+        args:
+            name - ship name [str]
+            clicks - yaw clicks per notch [list(int)]
+        returns:
+            speed maneuver was executed at [int]
+        notes:
+            ship is destroyed if it leaves the play area
+            XXX overlapping ships should each receive a facedown damage card
+        """
+
+        ship = self.ships[name]
+        ship.check_clicks(clicks)
+
+        speeds, off_board = self.resolve_speeds(name, [clicks])
+        speed = int(speeds[0])
+        ship.move(ship.maneuvers.clamp(speed, clicks), speed=speed)
+
+        if off_board[0]:
+            ship.destroy()
+
+        return speed
+
+    def make(self, action):
+        """Apply an action, saving what it changes so it can be undone
+
+        args:
+            action - e.g. Action("move", "ship name", clicks) [BaseAction]
+        returns:
+            undo record for unmake() [tuple]
+        notes:
+            records hold only poses, shields, damage card counts and flags of the pieces the
+            action changes, so search can make and unmake moves on one board without copying it
+        """
+
+        record = tuple(
+            (piece_name, self.ships[piece_name].save_state())
+            for piece_name in action.piece_names
+        )
+        action.apply(self)
+
+        return record
+
+    def unmake(self, record):
+        """Undo an action exactly
+
+        args:
+            record - undo record from make() [tuple]
+        notes:
+            actions must be undone in reverse order to how they were made
+        """
+
+        for piece_name, state in reversed(record):
+            self.ships[piece_name].restore_state(state)
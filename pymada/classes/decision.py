@@ -11,18 +11,17 @@ def Decision(name, *args, **kwargs):
     """
     """
 
-    DECISIONS = {}
-    DECISIONS["select_player"] = DecideSelectPlayer
-    DECISIONS["select_piece"] = DecidePiece
-    DECISIONS["clicks_to_move"] = DecideClicksToMove
-    DECISIONS["select_hull_zone"] = DecideHullZone
-    DECISIONS["test_choice"] = BaseDecision
-
     return DECISIONS[name](*args, **kwargs)
 
 
 class BaseDecision:
     """
+    attrs:
+        options - every possible choice, indexable so a choice can be given by its index
+            [sequence]
+    notes:
+        unordered options are sorted so the same index always means the same choice
+        prompt text is only rendered when a human player asks for it
     """
 
     MESSAGE = ""
@@ -30,11 +29,34 @@ class BaseDecision:
     def __init__(self, *args, **kwargs):
         self.args = args
         self.kwargs = kwargs
-        self.options = kwargs.get("options", "")
-        if self.options:
-            self.MESSAGE += " - options:" + "".join(
-                ["\n{}".format(option) for option in self.options] + ["\n"]
-            )
+        options = kwargs.get("options", ())
+        if isinstance(options, (set, frozenset)):
+            options = tuple(sorted(options, key=repr))
+        self.options = options
+
+    def __len__(self):
+        return len(self.options)
+
+    @property
+    def is_forced(self):
+        """Whether there is only one option so nobody needs to be asked [bool]
+        """
+
+        return len(self.options) == 1
+
+    @property
+    def prompt(self):
+        """MESSAGE followed by every option, for asking a human [str]
+        """
+
+        if not self.options:
+            return self.MESSAGE
+
+        return (
+            self.MESSAGE
+            + " - options:"
+            + "".join(["\n{}".format(option) for option in self.options] + ["\n"])
+        )
 
     def parse_choice_human(self, choice):
         """
@@ -47,9 +69,12 @@ class BaseDecision:
 
     def parse_choice_ai(self, choice):
         """
+
+        args:
+            choice - index into options [int]
         """
 
-        raise NotImplmentedError
+        return self.options[int(choice)]
 
     def parse_choice_test(self, choice):
         """
@@ -125,3 +150,11 @@ class DecideHullZone(BaseDecision):
 
         # no parsing necessary since user inputs enemy piece name as string
         return choice
+
+
+DECISIONS = {}
+DECISIONS["select_player"] = DecideSelectPlayer
+DECISIONS["select_piece"] = DecidePiece
+DECISIONS["clicks_to_move"] = DecideClicksToMove
+DECISIONS["select_hull_zone"] = DecideHullZone
+DECISIONS["test_choice"] = BaseDecision
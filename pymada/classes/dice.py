@@ -1,17 +1,27 @@
-import random
+import functools
+
+import numpy as np
 
 import pymada
 import pymada.errors
+from pymada.classes.roll import Roll
 
-# TODO need .roll() which returns a list of strings, or Roll object which we can then extract Damage, critical etc. then can have .roll(average=True) for training
+# TODO need .roll(average=True) for training
 # TODO need to add dice faces in data/dice.py
 # TODO add red_die,all_other_dice=Dice.split() --> so can then do red_die.roll() again! then add things together again
 
 
 class Dice:
     """Class describing dice pool
+
+    notes:
+        pools are immutable and interned - equal pools are the same instance so they can
+        be shared, hashed and compared cheaply
+        rolling returns a separate Roll rather than storing results on the pool
     """
 
+    COLOURS = ("red", "blue", "black")
+
     FACES = {}
     FACES["red"] = [
         "hit",
@@ -44,22 +54,42 @@ class Dice:
         "blank",
     ]
 
-    DAMAGE_AVERAGE = {}
-    DAMAGE_AVERAGE["ships"] = {}
-    DAMAGE_AVERAGE["ships"]["red"] = 0.75
-    DAMAGE_AVERAGE["ships"]["blue"] = 0.75
-    DAMAGE_AVERAGE["ships"]["black"] = 1.0
-    DAMAGE_AVERAGE["squadrons"] = {}
-    DAMAGE_AVERAGE["squadrons"]["red"] = 0.50
-    DAMAGE_AVERAGE["squadrons"]["blue"] = 0.50
-    DAMAGE_AVERAGE["squadrons"]["black"] = 0.75
+    # face type index of each face of each colour
+    FACE_INDICES = {
+        colour: [Roll.FACE_TYPES.index(face) for face in faces]
+        for colour, faces in FACES.items()
+    }
+
+    # probability of rolling each face type for each colour [array(C,F)]
+    FACE_PROBABILITIES = np.array(
+        [
+            np.bincount(indices, minlength=len(Roll.FACE_TYPES)) / len(indices)
+            for indices in map(FACE_INDICES.get, COLOURS)
+        ]
+    )
+
+    # symbols which cause damage to each target type
+    DAMAGE_SYMBOLS = {}
+    DAMAGE_SYMBOLS["ships"] = ("hit", "crit")
+    DAMAGE_SYMBOLS["squadrons"] = ("hit",)
+
+    # generator used when rolling without an explicit stream
+    RNG = np.random.default_rng()
+
+    # number of pool compositions whose distributions are kept
+    DISTRIBUTION_CACHE_SIZE = 1024
 
     RANGE_COLOURS = {}
     RANGE_COLOURS["red"] = {"red"}
     RANGE_COLOURS["blue"] = {"red", "blue"}
     RANGE_COLOURS["black"] = {"red", "blue", "black"}
 
-    def __init__(self, *dice):
+    # interned pools keyed by count of each colour
+    _POOLS = {}
+
+    __slots__ = ("counts", "colours")
+
+    def __new__(cls, *dice):
         """Constructor for dice pool
 
         Examples:
@@ -69,41 +99,76 @@ class Dice:
             my_dice=4*Dice("red")+Dice("blue")
         """
 
-        self.has_rolled = False
+        counts = [0] * len(cls.COLOURS)
+        for die in dice:
+            if isinstance(die, Dice):  # *dice is list *args of Dice objects
+                counts = [count + other for count, other in zip(counts, die.counts)]
+            else:  # *dice is string
+                counts = [
+                    count + die.count(colour)
+                    for count, colour in zip(counts, cls.COLOURS)
+                ]
 
-        self._dice = {}
-        self._dice["red"] = 0
-        self._dice["blue"] = 0
-        self._dice["black"] = 0
+        return cls.from_counts(counts)
 
-        if len(dice) is 0:
-            pass
-        elif len(dice) is 1:  # *dice is string
-            for colour in self._dice.keys():
-                self[colour] += dice[0].count(colour)
-        else:  # *dice is list *args of Dice objects
-            for die in dice:
-                for colour in die.colours:
-                    self[colour] += die[colour]
+    @classmethod
+    def from_counts(cls, counts):
+        """Return interned pool with given number of dice of each colour
 
-        self.colours = {colour for colour in self._dice.keys() if self[colour] > 0}
-        self.results = {}
+        args:
+            counts - number of dice of each colour ordered as COLOURS [tuple(int)]
+        """
 
-        # list of die faces representing roll results
-        for colour in self._dice.keys():
-            self.results[colour] = []
+        counts = tuple(int(count) for count in counts)
+
+        pool = cls._POOLS.get(counts)
+        if pool is None:
+            if len(counts) != len(cls.COLOURS) or min(counts) < 0:
+                raise pymada.errors.DiceException(
+                    f"invalid dice counts {counts} - need one count >= 0 for each of {cls.COLOURS}"
+                )
+            pool = object.__new__(cls)
+            object.__setattr__(pool, "counts", counts)
+            object.__setattr__(
+                pool,
+                "colours",
+                frozenset(
+                    colour for colour, count in zip(cls.COLOURS, counts) if count > 0
+                ),
+            )
+            cls._POOLS[counts] = pool
 
-    def __getitem__(self, colour):
-        """
-        """
+        return pool
+
+    def __setattr__(self, name, value):
+        raise pymada.errors.DiceException(
+            "Dice pools are immutable - combine pools with + and * instead"
+        )
+
+    def __reduce__(self):
+        return (Dice.from_counts, (self.counts,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
-        return self._dice[colour]
+    def __hash__(self):
+        return hash(self.counts)
 
-    def __setitem__(self, colour, count):
+    def __len__(self):
+        return sum(self.counts)
+
+    def __repr__(self):
+        dice = [f"{self[colour]}*{colour}" for colour in self.COLOURS if self[colour]]
+        return f"Dice({'+'.join(dice)})"
+
+    def __getitem__(self, colour):
         """
         """
 
-        self._dice[colour] = count
+        return self.counts[self.COLOURS.index(colour)]
 
     def __add__(self, other_dice):
         """Overload for addition to return Dice object
@@ -112,22 +177,10 @@ class Dice:
             other_dice - other die object [Dice]
         """
 
-        pool = Dice(
-            *[
-                (self[colour] + other_dice[colour]) * Dice(colour)
-                for colour in self.colours | other_dice.colours
-            ]
+        return Dice.from_counts(
+            [count + other for count, other in zip(self.counts, other_dice.counts)]
         )
 
-        for colour in self.colours | other_dice.colours:
-            pool.results[colour] = self.results[colour] + other_dice.results[colour]
-
-        pool.has_rolled = (
-            True if (self.has_rolled) or (other_dice.has_rolled) else False
-        )
-
-        return pool
-
     def __mul__(self, other_factor):
         """Overload for multiplication to return Dice object
 
@@ -135,9 +188,7 @@ class Dice:
             other_factor - multiplication factor [int]
         """
 
-        return Dice(
-            "".join([self[colour] * other_factor * colour for colour in self.colours])
-        )
+        return Dice.from_counts([count * other_factor for count in self.counts])
 
     __rmul__ = __mul__
 
@@ -146,71 +197,124 @@ class Dice:
         
         args:
             other_dice - other die object [Dice] or [str]
-        notes:
-            does not compare roll results
         """
 
         # if string, first convert to Dice object
         if type(other_dice) is type(""):
             other_dice = Dice(other_dice)
 
-        if all([self[colour] == other_dice[colour] for colour in self.colours]):
-            return True
-        else:
-            return False
+        return self is other_dice
 
-    @property
-    def damage_normal(self):
-
-        damage = 0.0
-        for colour in self.colours:
+    def _in_range(self, target_distance):
+        """Number of dice of each colour which can be rolled at target distance [tuple(int)]
+        """
 
-            damage += sum(
-                result.count("hit")
-                for result in self.results[colour]
-                if ("hit" in result)
-            )
+        available_attack_colours = self.RANGE_COLOURS[target_distance] & self.colours
 
-        return damage
+        return tuple(
+            count if colour in available_attack_colours else 0
+            for colour, count in zip(self.COLOURS, self.counts)
+        )
 
-    @property
-    def damage_critical(self):
+    def distribution(self, target_distance="black"):
+        """Exact joint probability of symbol totals when rolling at target distance
 
-        damage = 0.0
-        for colour in self.colours:
+        args:
+            target_distance - distance colour [str]
+        returns:
+            probability of each total indexed [hits, crits, accuracies] [array(H,C,A)]
+        notes:
+            memoised by number of dice of each colour in range - array is read-only
+        """
 
-            damage += sum(
-                result.count("crit")
-                for result in self.results[colour]
-                if ("crit" in result)
-            )
+        return Dice._distribution(self._in_range(target_distance))
 
-        return damage
+    @staticmethod
+    @functools.lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+    def _distribution(counts):
+        """Joint symbol distribution of pool by adding one die to a smaller pool
 
-    def average_damage(self, target_type=None, target_distance="red"):
+        args:
+            counts - number of dice of each colour ordered as COLOURS [tuple(int)]
         """
+
+        if not any(counts):
+            distribution = np.ones((1, 1, 1))
+            distribution.setflags(write=False)
+            return distribution
+
+        # remove last die and convolve its face distribution with remaining pool
+        colour = max(index for index, count in enumerate(counts) if count)
+        remaining = Dice._distribution(
+            tuple(count - (index == colour) for index, count in enumerate(counts))
+        )
+
+        max_symbols = Roll.FACE_SYMBOLS.max(axis=0)
+        distribution = np.zeros(np.array(remaining.shape) + max_symbols)
+        for probability, symbols in zip(
+            Dice.FACE_PROBABILITIES[colour], Roll.FACE_SYMBOLS
+        ):
+            if probability:
+                window = tuple(
+                    slice(offset, offset + size)
+                    for offset, size in zip(symbols, remaining.shape)
+                )
+                distribution[window] += probability * remaining
+
+        distribution.setflags(write=False)
+        return distribution
+
+    def damage_distribution(self, target_type="ships", target_distance="black"):
+        """Exact probability of each total damage when rolling at target distance
+
         args:
             target_type - enemy type [str]
             target_distance - distance colour [str]
+        returns:
+            probability of exactly d damage at index d [array(D)]
+        notes:
+            chance of at least d damage is damage_distribution(...)[d:].sum()
         """
 
-        target_type_options = list(DAMAGE_AVERAGE.keys())
+        if target_type not in self.DAMAGE_SYMBOLS:
+            raise pymada.errors.DiceException(
+                f"unknown target_type {target_type} - options = {list(self.DAMAGE_SYMBOLS)}"
+            )
+
+        distribution = self.distribution(target_distance)
+        hits = np.arange(distribution.shape[0])[:, None, None]
+        crits = np.arange(distribution.shape[1])[None, :, None]
+        damage = hits + crits * ("crit" in self.DAMAGE_SYMBOLS[target_type])
+
+        return np.bincount(
+            np.broadcast_to(damage, distribution.shape).ravel(),
+            weights=distribution.ravel(),
+        )
+
+    def average_damage(self, target_type=None, target_distance="black"):
+        """Expected damage when rolling at target distance
+
+        args:
+            target_type - enemy type [str]
+            target_distance - distance colour [str]
+        """
 
         if target_type is None:
             raise pymada.errors.DiceException(
-                f"Dice.average_damage needs to know target_type - options = {target_type_options}"
+                f"Dice.average_damage needs to know target_type - options = {list(self.DAMAGE_SYMBOLS)}"
             )
 
-        damage = 0.0
-        for colour in self.colours:
-            damage += self[colour] * DAMAGE_AVERAGE[target_type][colour]
+        distribution = self.damage_distribution(target_type, target_distance)
 
-        return damage
+        return float(distribution @ np.arange(len(distribution)))
 
-    def roll(self, target_distance=None):
+    def roll(self, target_distance=None, rng=None):
         """
         args:
             target_distance - distance colour [str]
+            rng - random generator, shared unseeded generator if None [numpy.random.Generator]
+        returns:
+            faces shown by dice available at target distance [Roll]
         """
 
         if target_distance is None:
@@ -229,12 +333,58 @@ class Dice:
             )
             return
 
-        for colour in available_attack_colours:
-            results = []
-            for die_number in range(self[colour]):
-                rand = random.randint(1, len(self.FACES[colour]))
-                results.append(self.FACES[colour][rand - 1])
+        rng = self.RNG if rng is None else rng
+
+        # one multinomial draw per colour rather than one draw per die
+        return Roll(
+            [
+                rng.multinomial(count, probabilities)
+                for count, probabilities in zip(
+                    self._in_range(target_distance), self.FACE_PROBABILITIES
+                )
+            ]
+        )
+
+    def roll_batch(self, n, target_distance=None, rng=None, symbols=False):
+        """Roll pool many times at once
 
-            self.results[colour] = results
+        args:
+            n - number of independent rolls [int]
+            target_distance - distance colour [str]
+            rng - random generator, shared unseeded generator if None [numpy.random.Generator]
+            symbols - return hit, crit and accuracy totals rather than face counts [bool]
+        returns:
+            number of dice showing each face type in each roll [array(n,F), int]
+            or total of each symbol in each roll [array(n,3), int]
+        notes:
+            dice of each colour are drawn as a single multinomial sample of size n, so the
+            cost does not grow with n in python
+        """
+
+        if target_distance is None:
+            raise pymada.errors.DiceException(
+                "please specify target_distance when rolling Dice"
+            )
+
+        available_attack_colours = self.RANGE_COLOURS[target_distance] & self.colours
+
+        if not available_attack_colours:
+            raise pymada.errors.DiceException(
+                f"defender at {target_distance} distance is out of range!"
+            )
+
+        rng = self.RNG if rng is None else rng
+
+        colours = [
+            self.COLOURS.index(colour)
+            for colour in self.COLOURS
+            if colour in available_attack_colours
+        ]
+        counts = sum(
+            rng.multinomial(
+                self.counts[colour], self.FACE_PROBABILITIES[colour], size=n
+            )
+            for colour in colours
+        )
 
-        self.has_rolled = True
+        return counts @ Roll.FACE_SYMBOLS if symbols else counts
@@ -3,13 +3,16 @@
 
 import os, sys
 import numpy as np
-import itertools
 
 import pymada
 import pymada.errors
+import pymada.data.tools
+import pymada.classes.utils
+from pymada.classes.action import Action
 from pymada.classes.board import Board
 from pymada.classes.decision import Decision
-from pymada.classes.plotter import Plotter
+from pymada.classes.fleet import Fleet
+from pymada.classes.player import Player
 
 
 class Game:
@@ -17,21 +20,72 @@ class Game:
     """
 
     MAX_TURNS = 6
+    RNG_WORDS = 6  # 64 bit words holding PCG64 state in snapshots
+    TURN_KEY = 0x7475726E  # seeds hash of turn and player to act
+    LONGEST_RANGE = max(
+        pymada.data.tools.rulers["range"], key=pymada.data.tools.rulers["range"].get
+    )
 
-    def __init__(
-        self, players, fleets,
-    ):
+    def __init__(self, players, fleets, seed=None, headless=False):
         """
+        args:
+            players - [list(Player)]
+            fleets - one fleet per player [list(Fleet)]
+            seed - entropy for all randomness in game, fresh entropy if None [int or numpy.random.SeedSequence]
+            headless - skip plotting and logging e.g. for batches of simulated games [bool]
+        notes:
+            independent streams for dice, deployment, piece colours and each player are spawned
+            from seed, so games are reproducible and games with different seeds are independent
         """
 
-        self.turn = 0
+        self.headless = headless
         self.players = {}
         for player in players:
             self.players[player.name] = player
-        self.player_turn = itertools.cycle(players)
+            player.game = self
         self.board = Board()
         self.fleets = fleets
-        self.plotter = Plotter()
+
+        self.plotter = None
+        if not headless:
+            from pymada.classes.plotter import Plotter  # bokeh only needed for plots
+
+            self.plotter = Plotter()
+
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Return game to its state before play so board and ships can be reused
+
+        args:
+            seed - entropy for next game, fresh entropy if None [int or numpy.random.SeedSequence]
+        notes:
+            ships already on the board are restored to an undamaged, unactivated state
+            rather than rebuilt - deploy() then places them for the next game
+        """
+
+        self.seed = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        dice_seed, deployment_seed, colour_seed, *player_seeds = self.stream_seeds(
+            self.seed, len(self.players)
+        )
+        self.dice_rng = np.random.default_rng(dice_seed)
+        self.deployment_rng = np.random.default_rng(deployment_seed)
+        self.colour_rng = np.random.default_rng(colour_seed)
+
+        for player, player_seed in zip(self.players.values(), player_seeds):
+            player.rng = np.random.default_rng(player_seed)
+            player.is_eliminated = False
+
+        for ship in self.board.ships.values():
+            ship.reset()
+
+        self.turn = 0
+        # index of player to act in players, advanced after they act
+        self.player_turn = 0
         self.winner = None
 
     @property
@@ -53,17 +107,55 @@ class Game:
         """
         """
 
-        self.plotter.draw(self.board, clear=False)
+        if self.plotter is not None:
+            self.plotter.draw(self.board, clear=False)
 
         self.deploy()
 
-        self.plotter.show()
+        if self.plotter is not None:
+            self.plotter.show()
 
         while not self.is_over:
             self.play_turn()
 
         return self.winner
 
+    @staticmethod
+    def spawn_seeds(seed, n_games):
+        """Independent seeds for many games e.g. one per process pool task
+
+        args:
+            seed - entropy for whole batch of games [int]
+            n_games - number of seeds [int]
+        returns:
+            [list(numpy.random.SeedSequence)]
+        """
+
+        return np.random.SeedSequence(seed).spawn(n_games)
+
+    @staticmethod
+    def stream_seeds(seed, n_players):
+        """Seeds of the dice, deployment and colour streams then each player's stream
+
+        args:
+            seed - entropy for one game [int or numpy.random.SeedSequence]
+            n_players - [int]
+        returns:
+            [list(numpy.random.SeedSequence)]
+        notes:
+            spawned from a copy of seed, so a seed gives the same streams however many times
+            it has been used e.g. by both a Game and a BatchGame
+        """
+
+        if isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(
+                seed.entropy, spawn_key=seed.spawn_key, pool_size=seed.pool_size
+            )
+        else:
+            seed = np.random.SeedSequence(seed)
+
+        return seed.spawn(3 + n_players)
+
     @pymada.log(message="deploying ships")
     def deploy(self):
         """
@@ -82,30 +174,38 @@ class Game:
 
                 # XXX choose random position but pointing towards board centre
                 x = (
-                    np.random.random()
+                    self.deployment_rng.random()
                     * self.board.zones["deployment"].width
-                    * (np.random.random() - 0.5)
+                    * (self.deployment_rng.random() - 0.5)
                 )
                 y = (
-                    np.random.random()
+                    self.deployment_rng.random()
                     * self.board.zones["deployment"].height
-                    * (np.random.random() - 0.5)
+                    * (self.deployment_rng.random() - 0.5)
                 )
                 theta = np.asarray(np.arctan2(y, x)) * 180.0 / np.pi + 180
 
-                self.board.add_ship(
-                    player_name=player_name,
-                    model=model,
-                    name=name,
-                    faction=faction,
-                    speed=ship_speed,
-                    upgrades=upgrades,
-                    x=x,
-                    y=y,
-                    theta=theta,
-                )
+                # reuse ship from previous game if available - placed before reset so the
+                # board sees its new pose
+                if name in self.board.ships:
+                    self.board.ships[name].position.set(x=x, y=y, theta=theta)
+                    self.board.ships[name].reset(speed=ship_speed)
+                else:
+                    self.board.add_ship(
+                        player_name=player_name,
+                        model=model,
+                        name=name,
+                        faction=faction,
+                        speed=ship_speed,
+                        upgrades=upgrades,
+                        x=x,
+                        y=y,
+                        theta=theta,
+                        rng=self.colour_rng,
+                    )
 
-            self.plotter.draw(self.board.ships[name])
+            if self.plotter is not None:
+                self.plotter.draw(self.board.ships[name])
 
     def play_turn(self):
         """
@@ -123,24 +223,23 @@ class Game:
         """
 
         finished_ship_phase = False
-        finished_players = []
+        finished_players = set()
 
         while not finished_ship_phase:
 
-            current_player = next(self.player_turn)
+            current_player = list(self.players.values())[self.player_turn]
 
             # check player is not eliminated
 
             if current_player.is_eliminated:
 
-                if current_player.name not in finished_players:
-                    finished_players.append(current_player.name)
+                finished_players.add(current_player.name)
 
-            # check player is not winner
+            # check player is not winner i.e. only player left with ships
 
-            elif {current_player.name} == {player for player in self.players} - {
-                player.name for player in self.players.values() if player.is_eliminated
-            }:
+            elif self.board.n_live("player") == 1 and self.board.ship_names(
+                player_name=current_player.name, state="live"
+            ):
                 self.winner = current_player
                 finished_ship_phase = True
 
@@ -148,164 +247,409 @@ class Game:
 
             else:
 
-                # check player has ships to activate
+                # check player has live ships yet to activate
 
-                if not all(
-                    [
-                        ship.has_activated
-                        for ship_name, ship in self.board.ships.items()
-                        if ship.faction == current_player.faction
-                    ]
-                ):
+                ready_ships = self.board.ship_names(
+                    player_name=current_player.name, state="ready"
+                )
 
-                    # determine player ships, friendlies and enemies
+                if ready_ships:
 
-                    player_ships = {
-                        ship_name
-                        for ship_name, ship in self.board.ships.items()
-                        if ship.player_name == current_player.name
-                    }
+                    if self.play_activation(current_player, ready_ships):
+                        finished_ship_phase = True
 
-                    allied_targets = {
-                        ship_name
-                        for ship_name, ship in self.board.ships.items()
-                        if ship.faction == current_player.faction
-                    }
+                # player out of ships to activate so add to finished_players
 
-                    enemy_targets = {ship for ship in self.board.ships} - allied_targets
+                else:
 
-                    # XXX add more information here to tell player what they are selecting
+                    finished_players.add(current_player.name)
 
-                    ship_to_activate_name = self.players[current_player.name].choose(
-                        Decision("select_piece", options=player_ships)
-                    )
+            # pass turn on only once current player's decisions are made so state_hash
+            # always names the player deciding
 
-                    self.board.ships[ship_to_activate_name].activate()
-
-                    # TODO reveal command
-
-                    # shoot
-                    # XXX ADD CATCHING HERE IF CHOOSES A SHIP THEY CANNOT FIRE ON FOR EXAMPLE i.e. IF FIRE RAISES EXCEPTION
-                    # XXX what if firing on squadron?
-
-                    # XXX add more information here to tell player what they are selecting
-
-                    target_options = []
-                    attacking_hull_zone_options = []
-                    for attacking_hull_zone in self.board.ships[
-                        ship_to_activate_name
-                    ].hull_zones:
-                        for target in enemy_targets:
-                            for defending_hull_zone in self.board.ships[
-                                target
-                            ].hull_zones:
-                                if self.board.ships[ship_to_activate_name].can_fire(
-                                    self.board.ships[target],
-                                    attacking_hull_zone=attacking_hull_zone,
-                                    defending_hull_zone=defending_hull_zone,
-                                ):
-                                    target_options.append(target)
-                                    attacking_hull_zone_options.append(
-                                        attacking_hull_zone
-                                    )
-                    target_options = set(target_options)
-                    attacking_hull_zone_options = set(attacking_hull_zone_options)
-
-                    target_piece = self.players[current_player.name].choose(
-                        Decision("select_piece", options=set(target_options) | {None})
-                    )
+            self.player_turn = (self.player_turn + 1) % len(self.players)
+
+            # if all players finished then end ship phase
+
+            if len(finished_players) == len(self.players):
+                finished_ship_phase = True
+
+    def play_activation(self, current_player, ready_ships):
+        """Activate one of a player's ships - select it, attack and maneuver
+
+        args:
+            current_player - [Player]
+            ready_ships - names of player's live ships yet to activate [set(str)]
+        returns:
+            whether a player won during the activation [bool]
+        """
+
+        # XXX add more information here to tell player what they are selecting
+
+        ship_to_activate_name = self.players[current_player.name].choose(
+            Decision("select_piece", options=set(ready_ships))
+        )
+
+        # TODO reveal command
+
+        # shoot
+        # XXX ADD CATCHING HERE IF CHOOSES A SHIP THEY CANNOT FIRE ON FOR EXAMPLE i.e. IF FIRE RAISES EXCEPTION
+        # XXX what if firing on squadron?
+
+        # XXX add more information here to tell player what they are selecting
 
-                    # if firing
-
-                    if target_piece is not None:
-
-                        attacking_hull_zone = self.players[current_player.name].choose(
-                            Decision(
-                                "select_hull_zone", options=attacking_hull_zone_options
-                            )
-                        )
-
-                        defending_hull_zone = self.players[current_player.name].choose(
-                            Decision(
-                                "select_hull_zone",
-                                options={
-                                    defending_hull_zone
-                                    for defending_hull_zone in self.board.ships[
-                                        target_piece
-                                    ].hull_zones.keys()
-                                    if self.board.ships[ship_to_activate_name].can_fire(
-                                        self.board.ships[target],
-                                        attacking_hull_zone=attacking_hull_zone,
-                                        defending_hull_zone=defending_hull_zone,
-                                    )
-                                },
-                            )
-                        )
-
-                        self.board.ships[ship_to_activate_name].fire(
-                            self.board.ships[target_piece],
-                            attacking_hull_zone=attacking_hull_zone,
-                            defending_hull_zone=defending_hull_zone,
-                        )
-
-                        if self.board.ships[target_piece].is_destroyed:
-
-                            self.plotter.erase(self.board.ships[target_piece])
-
-                            if all(
-                                self.board.ships[ship].is_destroyed
-                                for ship in enemy_targets
-                                if self.board.ships[ship].player_name
-                                == self.board.ships[target_piece].player_name
-                            ):
-                                self.players[
-                                    self.board.ships[target_piece].player_name
-                                ].is_eliminated = True
-
-                                # check for win
-
-                                if {current_player.name} == {
-                                    player for player in self.players
-                                } - {
-                                    player.name
-                                    for player in self.players.values()
-                                    if player.is_eliminated
-                                }:
-                                    self.winner = current_player
-                                    finished_ship_phase = True
-
-                    # move
-
-                    clicks_to_move = self.players[current_player.name].choose(
-                        Decision(
-                            "clicks_to_move",
-                            options=self.board.ships[
-                                ship_to_activate_name
-                            ].move_options,
-                        )
+        # every attack measured once for this activation
+        attacks = self.board.attacks(ship_to_activate_name, self.LONGEST_RANGE)
+
+        target_piece = self.players[current_player.name].choose(
+            Decision("select_piece", options={attack[0] for attack in attacks} | {None})
+        )
+
+        # if firing
+
+        chosen_attack = None
+        if target_piece is not None:
+
+            attacking_hull_zone = self.players[current_player.name].choose(
+                Decision(
+                    "select_hull_zone",
+                    options={
+                        attack[1] for attack in attacks if attack[0] == target_piece
+                    },
+                )
+            )
+
+            defending_hull_zone = self.players[current_player.name].choose(
+                Decision(
+                    "select_hull_zone",
+                    options={
+                        attack[2]
+                        for attack in attacks
+                        if attack[:2] == (target_piece, attacking_hull_zone)
+                    },
+                )
+            )
+
+            chosen_attack = next(
+                attack
+                for attack in attacks
+                if attack[:3]
+                == (target_piece, attacking_hull_zone, defending_hull_zone)
+            )
+
+        # move
+
+        clicks_to_move = self.players[current_player.name].choose(
+            Decision(
+                "clicks_to_move",
+                options=self.board.ships[ship_to_activate_name].move_options,
+            )
+        )
+
+        self.apply_activation(ship_to_activate_name, chosen_attack, clicks_to_move)
+
+        # plot ship
+
+        if self.plotter is not None:
+            for piece_name in (target_piece, ship_to_activate_name):
+                if piece_name is not None and self.board.ships[piece_name].is_destroyed:
+                    self.plotter.erase(self.board.ships[piece_name])
+            self.plotter.draw(self.board.ships[ship_to_activate_name])
+            self.plotter.show()
+
+        return self.winner is not None
+
+    def apply_activation(self, ship_name, attack, clicks, rng=None):
+        """Activate a ship, make its attack and execute its maneuver
+
+        args:
+            ship_name - [str]
+            attack - (target, attacking hull zone, defending hull zone, range band) e.g. from
+                Board.attacks, no attack if None [tuple(str)]
+            clicks - yaw clicks per notch [tuple(int)]
+            rng - random generator for attack dice, dice_rng if None [numpy.random.Generator]
+        returns:
+            undo records for unmake(), in the order made [list(tuple)]
+        notes:
+            each step is made with make(), so destroyed ships are removed and a winner found
+            as the activation goes - player_turn is left to the caller
+        """
+
+        rng = self.dice_rng if rng is None else rng
+
+        records = [self.make(Action("activate", ship_name))]
+
+        if attack is not None:
+            target, attacking_hull_zone, defending_hull_zone, band = attack
+            roll = (
+                self.board.ships[ship_name]
+                .create_attack_pool(attacking_hull_zone)
+                .roll(band, rng=rng)
+            )
+            records.append(
+                self.make(
+                    Action(
+                        "fire",
+                        ship_name,
+                        target,
+                        attacking_hull_zone,
+                        defending_hull_zone,
+                        roll,
                     )
-                    self.board.ships[ship_to_activate_name].move(clicks_to_move)
+                )
+            )
 
-                    # plot ship
+        records.append(self.make(Action("move", ship_name, clicks)))
 
-                    self.plotter.draw(self.board.ships[ship_to_activate_name])
-                    self.plotter.show()
+        return records
 
-                # player out of ships to activate so add to finished_players
+    def make(self, action):
+        """Apply an action to the board and update eliminated players and winner
 
-                elif current_player.name not in finished_players:
+        args:
+            action - [BaseAction]
+        returns:
+            undo record for unmake() [tuple]
+        """
 
-                    finished_players.append(current_player.name)
+        record = (
+            self.board.make(action),
+            self.winner,
+            tuple(player.is_eliminated for player in self.players.values()),
+        )
 
-            # if all players finished then end ship phase
+        for piece_name in action.piece_names:
+            if self.board.ships[piece_name].is_destroyed:
+                self._remove_destroyed(piece_name)
 
-            if all(
-                [
-                    self.players[player].name in finished_players
-                    for player in self.players
-                ]
-            ):
-                finished_ship_phase = True
+        return record
+
+    def unmake(self, record):
+        """Undo an action exactly
+
+        args:
+            record - undo record from make() [tuple]
+        """
+
+        board_record, self.winner, eliminated = record
+        self.board.unmake(board_record)
+        for player, is_eliminated in zip(self.players.values(), eliminated):
+            player.is_eliminated = is_eliminated
+
+    def hash_state(self, turn, player_turn):
+        """64 bit hash of board as it stands with a given turn and player to act
+
+        args:
+            turn - [int]
+            player_turn - index in players of player choosing the next activation [int]
+        notes:
+            single definition of state keys - state_hash and search tables both use it
+        """
+
+        return self.board.state_hash ^ pymada.classes.utils.hash_values(
+            self.TURN_KEY, (turn, player_turn)
+        )
+
+    @property
+    def state_hash(self):
+        """64 bit hash of ship poses, shields, damage, speeds and activations, turn and player
+        to act [int]
+
+        notes:
+            kept up to date by the board as pieces change so reading it is O(1)
+            random streams are not included so equal positions hash the same however they
+            were reached
+        """
+
+        return self.hash_state(self.turn, self.player_turn)
+
+    @property
+    def snapshot_dtype(self):
+        """Fixed layout of snapshots for the players and ships currently in game [numpy.dtype]
+
+        notes:
+            ships are ordered as board.ships and hull zones as each ship's hull_zones, with
+            shields padded with 0 for ships with fewer hull zones
+            rngs are the dice, deployment and colour streams then each player's stream
+        """
+
+        n_players = len(self.players)
+        n_ships = len(self.board.ships)
+        n_hull_zones = max(
+            (len(ship.hull_zones) for ship in self.board.ships.values()), default=0
+        )
+
+        return np.dtype(
+            [
+                ("turn", "<i4"),
+                ("player_turn", "<i4"),
+                ("winner", "<i4"),
+                ("is_eliminated", "?", (n_players,)),
+                ("rng", "<u8", (3 + n_players, self.RNG_WORDS)),
+                ("pose", "<f8", (n_ships, 3)),
+                ("speed", "<i4", (n_ships,)),
+                ("shields", "<i4", (n_ships, n_hull_zones)),
+                ("damage", "<i4", (n_ships,)),
+                ("has_activated", "?", (n_ships,)),
+                ("is_destroyed", "?", (n_ships,)),
+            ]
+        )
+
+    def snapshot(self):
+        """Complete game state in a fixed binary layout
+
+        returns:
+            [array((), snapshot_dtype)]
+        notes:
+            snapshot.tobytes() can be hashed or sent between processes, and many snapshots
+            can be stored in a numpy.memmap of snapshot_dtype e.g. for replay buffers
+        """
+
+        snapshot = np.zeros((), dtype=self.snapshot_dtype)
+
+        snapshot["turn"] = self.turn
+        snapshot["player_turn"] = self.player_turn
+        snapshot["winner"] = (
+            list(self.players).index(self.winner.name) if self.winner else -1
+        )
+        snapshot["is_eliminated"] = [
+            player.is_eliminated for player in self.players.values()
+        ]
+        snapshot["rng"] = [self._encode_rng(rng) for rng in self._rngs]
+
+        for counter, ship in enumerate(self.board.ships.values()):
+            snapshot["pose"][counter] = (
+                ship.position.x,
+                ship.position.y,
+                ship.position.theta,
+            )
+            snapshot["speed"][counter] = ship.speed
+            snapshot["shields"][counter, : len(ship.hull_zones)] = [
+                hull_zone.shields for hull_zone in ship.hull_zones.values()
+            ]
+            snapshot["damage"][counter] = ship.damage
+            snapshot["has_activated"][counter] = ship.has_activated
+            snapshot["is_destroyed"][counter] = ship._is_destroyed
+
+        return snapshot
+
+    def restore(self, snapshot):
+        """Return game to the state of a snapshot taken with the same players and ships
+
+        args:
+            snapshot - from snapshot() [array((), snapshot_dtype)] or its bytes [bytes]
+        """
+
+        if isinstance(snapshot, (bytes, bytearray, memoryview)):
+            snapshot = np.frombuffer(snapshot, dtype=self.snapshot_dtype)[0]
+        elif snapshot.dtype != self.snapshot_dtype:
+            raise pymada.errors.PymadaException(
+                f"snapshot layout {snapshot.dtype} does not match game {self.snapshot_dtype}"
+            )
+
+        self.turn = int(snapshot["turn"])
+        self.player_turn = int(snapshot["player_turn"])
+        winner = int(snapshot["winner"])
+        self.winner = list(self.players.values())[winner] if winner >= 0 else None
+        for player, is_eliminated in zip(
+            self.players.values(), snapshot["is_eliminated"]
+        ):
+            player.is_eliminated = bool(is_eliminated)
+        for rng, words in zip(self._rngs, snapshot["rng"]):
+            self._decode_rng(rng, words)
+
+        for counter, ship in enumerate(self.board.ships.values()):
+            ship.restore_state(
+                tuple(float(value) for value in snapshot["pose"][counter])
+                + (
+                    ship._damage,
+                    bool(snapshot["is_destroyed"][counter]),
+                    bool(snapshot["has_activated"][counter]),
+                    int(snapshot["speed"][counter]),
+                    int(snapshot["damage"][counter]),
+                )
+                + tuple(
+                    int(shields)
+                    for shields in snapshot["shields"][counter, : len(ship.hull_zones)]
+                )
+            )
+
+    @property
+    def _rngs(self):
+        """Every random stream in game in snapshot order [list(numpy.random.Generator)]
+        """
+
+        return [self.dice_rng, self.deployment_rng, self.colour_rng] + [
+            player.rng for player in self.players.values()
+        ]
+
+    @staticmethod
+    def _encode_rng(rng):
+        """PCG64 state as 64 bit words - state, increment, has_uint32 and uinteger
+
+        args:
+            rng - [numpy.random.Generator]
+        returns:
+            [list(int)]
+        """
+
+        state = rng.bit_generator.state
+        if state["bit_generator"] != "PCG64":
+            raise pymada.errors.PymadaException(
+                f"can only snapshot PCG64 generators - got {state['bit_generator']}"
+            )
+
+        words = []
+        for value in (state["state"]["state"], state["state"]["inc"]):
+            words += [value >> 64, value & 0xFFFFFFFFFFFFFFFF]
+
+        return words + [state["has_uint32"], state["uinteger"]]
+
+    @staticmethod
+    def _decode_rng(rng, words):
+        """Set PCG64 state from words made by _encode_rng()
+
+        args:
+            rng - [numpy.random.Generator]
+            words - [array(RNG_WORDS), uint64]
+        """
+
+        words = [int(word) for word in words]
+        rng.bit_generator.state = {
+            "bit_generator": "PCG64",
+            "state": {
+                "state": (words[0] << 64) | words[1],
+                "inc": (words[2] << 64) | words[3],
+            },
+            "has_uint32": words[4],
+            "uinteger": words[5],
+        }
+
+    def _remove_destroyed(self, piece_name):
+        """Eliminate destroyed piece's player if they have no ships left
+
+        args:
+            piece_name - name of destroyed piece [str]
+        returns:
+            whether only one player now remains and has been made winner [bool]
+        """
+
+        piece = self.board.ships[piece_name]
+
+        if not self.board.ship_names(player_name=piece.player_name, state="live"):
+            self.players[piece.player_name].is_eliminated = True
+
+            # check for win
+
+            if self.board.n_live("player") == 1:
+                self.winner = next(
+                    player
+                    for player in self.players.values()
+                    if not player.is_eliminated
+                )
+                return True
+
+        return False
 
     @pymada.log(message="beginning squadron phase")
     def play_squadron_phase(self):
@@ -321,3 +665,28 @@ class Game:
 
         for ship in self.board.ships:
             self.board.ships[ship].deactivate()
+
+
+def build_game(fleets, species):
+    """Headless game with one player per fleet
+
+    args:
+        fleets - faction and models of each fleet [tuple(tuple(str, tuple(str)))]
+        species - species of each player [tuple(str)]
+    """
+
+    players, armadas = [], []
+    for counter, ((faction, models), player_species) in enumerate(zip(fleets, species)):
+        player_name = f"player {counter + 1}"
+        players.append(
+            Player(name=player_name, species=player_species, faction=faction)
+        )
+        armadas.append(Fleet())
+        for ship_counter, model in enumerate(models):
+            armadas[-1].add_ship(
+                model=model,
+                name=f"{player_name} {model} {ship_counter}",
+                faction=faction,
+            )
+
+    return Game(players=players, fleets=armadas, headless=True)
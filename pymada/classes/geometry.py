@@ -0,0 +1,363 @@
+"""Vectorised geometry kernels for measuring between pieces
+
+notes:
+    points are arrays with x and y in the last axis [array(...,2), cm]
+    all kernels broadcast over leading axes so many pieces can be measured in one call
+"""
+
+import numpy as np
+
+import pymada
+import pymada.data.tools
+
+# range bands ordered from shortest to longest ruler length
+RANGE_BANDS = sorted(
+    pymada.data.tools.rulers["range"], key=pymada.data.tools.rulers["range"].get
+)
+RANGE_LIMITS = np.array(
+    [pymada.data.tools.rulers["range"][band] for band in RANGE_BANDS]
+)
+
+
+def _cross(a, b):
+    """z-component of cross product of 2D vectors"""
+
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def arc_outline(outline, origin, arc_left, arc_right):
+    """Section of a closed convex outline lying within an arc
+
+    args:
+        outline - polygon points ordered anticlockwise [array(N,2), cm]
+        origin - arc origin inside polygon [array(2), cm]
+        arc_left - angle arc sweeps anticlockwise from [float, deg]
+        arc_right - angle arc sweeps anticlockwise to [float, deg]
+    returns:
+        polyline from arc_left edge round to arc_right edge [array(M,2), cm]
+    """
+
+    outline = np.asarray(outline, dtype=float)
+    origin = np.asarray(origin, dtype=float)
+    edge_start, edge_end = outline, np.roll(outline, -1, axis=0)
+
+    def intersect(angle):
+        # smallest positive distance along ray at which it meets an outline edge
+        direction = np.array([np.cos(angle * np.pi / 180), np.sin(angle * np.pi / 180)])
+        edge = edge_end - edge_start
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denominator = _cross(direction, edge)
+            t = _cross(edge_start - origin, edge) / denominator
+            u = _cross(edge_start - origin, direction) / denominator
+        t = np.where((u >= -1e-9) & (u <= 1 + 1e-9) & (t > 0), t, np.inf)
+        return origin + t.min() * direction
+
+    sweep = (arc_right - arc_left) % 360.0
+    vertex_angles = np.arctan2(*(outline - origin).T[::-1]) * 180.0 / np.pi
+    vertex_sweep = (vertex_angles - arc_left) % 360.0
+    inside = (vertex_sweep > 1e-6) & (vertex_sweep < sweep - 1e-6)
+    vertices = outline[inside][np.argsort(vertex_sweep[inside])]
+
+    return np.vstack((intersect(arc_left), vertices, intersect(arc_right)))
+
+
+def arc_normals(arc_left, arc_right):
+    """Inward normals of the half-planes bounded by the edges of arcs
+
+    args:
+        arc_left - angle arc sweeps anticlockwise from [float/array(...), deg]
+        arc_right - angle arc sweeps anticlockwise to [float/array(...), deg]
+    returns:
+        normals of left and right arc edges [array(...,2,2)]
+    notes:
+        a point lies within an arc when it is on the inner side of both edges, or of either
+        edge for arcs sweeping more than 180 deg
+    """
+
+    left = np.asarray(arc_left, dtype=float) * np.pi / 180
+    right = np.asarray(arc_right, dtype=float) * np.pi / 180
+
+    return np.stack(
+        (
+            np.stack((-np.sin(left), np.cos(left)), axis=-1),
+            np.stack((np.sin(right), -np.cos(right)), axis=-1),
+        ),
+        axis=-2,
+    )
+
+
+def points_in_arc(points, origin, normals, wide=False, tolerance=1e-9):
+    """Whether points lie within arcs
+
+    args:
+        points - [array(...,2), cm]
+        origin - arc origins [array(...,2), cm]
+        normals - half-plane normals from arc_normals [array(...,2,2)]
+        wide - arcs sweep more than 180 deg [bool/array(...)]
+    returns:
+        [array(...), bool]
+    notes:
+        points on arc edges count as inside
+    """
+
+    sides = np.einsum("...d,...kd->...k", points - origin, normals) >= -tolerance
+
+    return np.where(wide, sides.any(axis=-1), sides.all(axis=-1))
+
+
+def polylines_in_arc(polylines, origin, normals, wide=False, tolerance=1e-9):
+    """Whether any part of polylines lies within arcs
+
+    args:
+        polylines - [array(...,M,2), cm]
+        origin - arc origins [array(...,2), cm]
+        normals - half-plane normals from arc_normals [array(...,2,2)]
+        wide - arcs sweep more than 180 deg [bool/array(...)]
+    returns:
+        [array(...), bool]
+    notes:
+        each segment is clipped against both half-planes, so segments crossing an arc
+        with both end points outside it still count
+    """
+
+    origin = np.asarray(origin, dtype=float)[..., None, :]
+    normals = np.asarray(normals, dtype=float)[..., None, :, :]
+    sides = np.einsum("...d,...kd->...k", polylines - origin, normals) + tolerance
+    start, end = sides[..., :-1, :], sides[..., 1:, :]
+    if polylines.shape[-2] == 1:
+        start, end = sides, sides
+
+    # interval of segment parameter t within each half-plane where start + t * slope >= 0
+    slope = end - start
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = -start / slope
+    lower = np.where(
+        slope > 0, t, np.where((slope == 0) & (start < 0), np.inf, -np.inf)
+    )
+    upper = np.where(slope < 0, t, np.inf)
+
+    narrow = np.maximum(lower.max(axis=-1), 0.0) <= np.minimum(upper.min(axis=-1), 1.0)
+    either = ((start >= 0) | (end >= 0)).any(axis=-1)
+
+    return np.where(np.asarray(wide)[..., None], either, narrow).any(axis=-1)
+
+
+def pad_polylines(polylines, length=None):
+    """Stack polylines of different lengths by repeating their last point
+
+    args:
+        polylines - [list(array(M,2)), cm]
+        length - number of points to pad to, longest polyline if None [int]
+    returns:
+        [array(len(polylines),length,2), cm]
+    notes:
+        repeated points form zero length segments which do not change distances
+    """
+
+    length = max(len(polyline) for polyline in polylines) if length is None else length
+
+    return np.stack(
+        [
+            np.vstack(
+                (polyline, np.repeat(polyline[-1:], length - len(polyline), axis=0))
+            )
+            for polyline in polylines
+        ]
+    )
+
+
+def polygons_overlap(a, b):
+    """Separating axis test between convex polygons
+
+    args:
+        a - polygon points [array(...,N,2), cm]
+        b - polygon points [array(...,M,2), cm]
+    returns:
+        whether interiors of each broadcast pair overlap [array(...), bool]
+    notes:
+        polygons which only touch do not overlap
+        repeated points e.g. from pad_polylines give zero length edges, which are ignored
+    """
+
+    a, b = np.broadcast_arrays(a[..., :, None, :], b[..., None, :, :])
+    a, b = a[..., 0, :], b[..., 0, :, :]
+
+    # edge normals of both polygons are the candidate separating axes
+    edges = np.concatenate(
+        (np.roll(a, -1, axis=-2) - a, np.roll(b, -1, axis=-2) - b), axis=-2
+    )
+    axes = np.stack((-edges[..., 1], edges[..., 0]), axis=-1)
+
+    projected_a = np.einsum("...kd,...pd->...kp", axes, a)
+    projected_b = np.einsum("...kd,...pd->...kp", axes, b)
+    separated = (projected_a.max(axis=-1) <= projected_b.min(axis=-1)) | (
+        projected_b.max(axis=-1) <= projected_a.min(axis=-1)
+    )
+    # zero axes project everything onto one point so would always look separating
+    separated &= (axes != 0.0).any(axis=-1)
+
+    return ~separated.any(axis=-1)
+
+
+def points_in_polygon(points, polygon):
+    """Whether points lie inside a convex polygon
+
+    args:
+        points - [array(...,2), cm]
+        polygon - convex polygon points in either winding order [array(N,2), cm]
+    returns:
+        [array(...), bool]
+    notes:
+        points on the polygon boundary count as inside
+    """
+
+    polygon = np.asarray(polygon, dtype=float)
+    sides = _cross(
+        np.roll(polygon, -1, axis=0) - polygon, points[..., None, :] - polygon
+    )
+
+    return (sides >= 0).all(axis=-1) | (sides <= 0).all(axis=-1)
+
+
+def point_segment_distance(points, segment_start, segment_end):
+    """Distance from points to closest point on segments
+
+    args:
+        points - [array(...,2), cm]
+        segment_start, segment_end - segment end points [array(...,2), cm]
+    """
+
+    segment = segment_end - segment_start
+    length_squared = np.sum(segment ** 2, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.sum((points - segment_start) * segment, axis=-1) / length_squared
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+    closest = segment_start + t[..., None] * segment
+
+    return np.sqrt(np.sum((points - closest) ** 2, axis=-1))
+
+
+def segments_intersect(a_start, a_end, b_start, b_end):
+    """Whether segments a and b cross or touch
+
+    args:
+        a_start, a_end, b_start, b_end - segment end points [array(...,2), cm]
+    returns:
+        [array(...), bool]
+    """
+
+    a = a_end - a_start
+    b = b_end - b_start
+    d1 = _cross(a, b_start - a_start)
+    d2 = _cross(a, b_end - a_start)
+    d3 = _cross(b, a_start - b_start)
+    d4 = _cross(b, a_end - b_start)
+
+    return (d1 * d2 <= 0) & (d3 * d4 <= 0) & ~((d1 == 0) & (d2 == 0) & (d3 == 0))
+
+
+def crosses_any(starts, ends, lines):
+    """Whether segments cross any of a set of lines
+
+    args:
+        starts, ends - segment end points [array(...,2), cm]
+        lines - start and end points of lines to test against [array(...,L,2,2), cm]
+    returns:
+        [array(...), bool]
+    notes:
+        leading axes of lines broadcast against segments so each segment can be tested
+        against its own set of lines
+    """
+
+    return segments_intersect(
+        starts[..., None, :], ends[..., None, :], lines[..., 0, :], lines[..., 1, :]
+    ).any(axis=-1)
+
+
+def outline_edges(outlines):
+    """Edges of closed outlines as line segments
+
+    args:
+        outlines - polygon points [array(...,N,2), cm]
+    returns:
+        start and end of each edge [array(...,N,2,2), cm]
+    """
+
+    return np.stack((outlines, np.roll(outlines, -1, axis=-2)), axis=-2)
+
+
+def segment_distances(a_start, a_end, b_start, b_end):
+    """Minimum distance between segments a and b
+
+    args:
+        a_start, a_end, b_start, b_end - segment end points [array(...,2), cm]
+    returns:
+        [array(...), cm]
+    """
+
+    distance = np.minimum(
+        np.minimum(
+            point_segment_distance(a_start, b_start, b_end),
+            point_segment_distance(a_end, b_start, b_end),
+        ),
+        np.minimum(
+            point_segment_distance(b_start, a_start, a_end),
+            point_segment_distance(b_end, a_start, a_end),
+        ),
+    )
+
+    return np.where(segments_intersect(a_start, a_end, b_start, b_end), 0.0, distance)
+
+
+def polyline_distances(a, b):
+    """Minimum distance between polylines
+
+    args:
+        a - polylines [array(...,Ma,2), cm]
+        b - polylines [array(...,Mb,2), cm]
+    returns:
+        closest approach of each broadcast pair [array(...), cm]
+    notes:
+        single point polylines are treated as zero length segments
+    """
+
+    a = np.concatenate((a, a[..., -1:, :]), axis=-2) if a.shape[-2] == 1 else a
+    b = np.concatenate((b, b[..., -1:, :]), axis=-2) if b.shape[-2] == 1 else b
+
+    distances = segment_distances(
+        a[..., :-1, None, :],
+        a[..., 1:, None, :],
+        b[..., None, :-1, :],
+        b[..., None, 1:, :],
+    )
+
+    return distances.min(axis=(-2, -1))
+
+
+def distance_matrix(a, b=None):
+    """Distances between every polyline in a and every polyline in b
+
+    args:
+        a - polylines grouped by piece e.g. hull zone edges per ship [array(S,H,M,2), cm]
+        b - as a, defaults to a [array(T,K,N,2), cm]
+    returns:
+        distance from each polyline in a to each polyline in b [array(S,H,T,K), cm]
+    """
+
+    b = a if b is None else b
+
+    return polyline_distances(a[:, :, None, None], b[None, None])
+
+
+def range_band(distances):
+    """Shortest range band each distance lies within
+
+    args:
+        distances - [float/array, cm]
+    returns:
+        range band colour or False if out of range [str/array(object)]
+    """
+
+    return np.array(RANGE_BANDS + [False], dtype=object)[
+        np.searchsorted(RANGE_LIMITS, np.nan_to_num(distances, nan=np.inf))
+    ]
@@ -0,0 +1,106 @@
+"""Memoised geometry queries between pieces
+"""
+
+import functools
+
+import pymada
+import pymada.errors
+
+
+class GeometryCache:
+    """Class describing results of geometry queries stored against piece pose versions
+
+    notes:
+        one entry per query and set of arguments - a result is reused while the pose versions
+        it was computed at are unchanged and is overwritten once either piece moves
+    """
+
+    def __init__(self):
+        """Constructor for geometry cache
+        """
+
+        self._results = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    @property
+    def stats(self):
+        """Hit and miss counts [dict]
+        """
+
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._results),
+        }
+
+    def get(self, key, versions, compute):
+        """Return stored result if still valid, otherwise compute and store it
+
+        args:
+            key - query name and arguments [tuple]
+            versions - pose versions of both pieces, or board layout version, result depends on [tuple(int) or int]
+            compute - function returning result [callable]
+        """
+
+        entry = self._results.get(key)
+        if entry is not None and entry[0] == versions:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        result = compute()
+        self._results[key] = (versions, result)
+
+        return result
+
+    def clear(self):
+        """Drop all stored results and reset statistics
+        """
+
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def cached(query, board_wide=False):
+    """Decorator memoising a geometry query between a piece and another piece on its board
+
+    args:
+        query - name of query to store results under [str]
+        board_wide - result depends on every piece on the board e.g. line of sight, so is
+            stored against Board.layout_version [bool]
+    notes:
+        decorated method must take the other piece as its first argument, remaining arguments
+        must be hashable
+        pieces not on a board are measured without caching
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def inner(self, other, *args, **kwargs):
+
+            if self.board is None:
+                return method(self, other, *args, **kwargs)
+
+            versions = (
+                self.board.layout_version
+                if board_wide
+                else (self.position.version, other.position.version)
+            )
+
+            return self.board.geometry_cache.get(
+                (query, self.name, other.name, args, tuple(sorted(kwargs.items()))),
+                versions,
+                lambda: method(self, other, *args, **kwargs),
+            )
+
+        return inner
+
+    return decorator
@@ -3,6 +3,8 @@ import numpy as np
 import pymada
 import pymada.errors
 import pymada.data.tools
+import pymada.classes.geometry
+import pymada.classes.utils
 from pymada.classes.dice import Dice
 from pymada.classes.position import Position
 
@@ -11,7 +13,16 @@ class HullZone:
     """Class describing a hull zone
     """
 
-    def __init__(self, armament, shields, LoS_dot, arc_left, arc_right):
+    def __init__(
+        self,
+        armament,
+        shields,
+        LoS_dot,
+        arc_left,
+        arc_right,
+        position=None,
+        outline=None,
+    ):
         """Constructor for hull zone
 
         args:
@@ -19,79 +30,177 @@ class HullZone:
             shields - XXX
             arc_left - angle describing left-most arc edge relative to position.theta [float, deg]
             arc_right - angle describing right-most arc edge relative to position.theta [float, deg]
-            LoS_dot_position - position of line-of-sight dot [Position]
+            LoS_dot - relative distance from arc origin to line of sight dot [float, cm]
+            position - world pose of owning piece, new pose at origin if None [Position]
+            outline - base outline local to owning piece used to find hull zone edge [array(N,2), cm]
         attr:
-            position - position of arc origin [Position] 
-            _LoS_dot_radius - relative distance from HullZone.position to line of sight dot[float, cm]
+            position - world position of arc origin [Position]
+            LoS_dot_position - world position of line-of-sight dot [Position]
+            origin_local - arc origin relative to owning piece [array(2), cm]
+            LoS_dot_local - line-of-sight dot relative to owning piece [array(2), cm]
+            edge_local - section of base outline within arc, arc origin if no outline [array(M,2), cm]
+            arc_normals_local - inward normals of arc edges relative to owning piece [array(2,2)]
+        notes:
+            position and LoS_dot_position are derived from the owning piece's pose on request
+            and should be treated as read-only
         """
 
         self.armament = Dice(armament)
         self.shields = shields
         self.arc_left, self.arc_right = arc_left, arc_right
-        self.position = Position(x=0.0, y=0.0, theta=0.0)
+        self.arc_normals_local = pymada.classes.geometry.arc_normals(
+            arc_left, arc_right
+        )
+        self.arc_is_wide = (arc_right - arc_left) % 360.0 > 180.0
         self._LoS_dot_radius = LoS_dot
 
-        self.LoS_dot_position = Position(
-            x=self.position.x
-            + self._LoS_dot_radius
-            * np.cos(
-                (self.position.theta + (arc_left + arc_right) / 2.0) * np.pi / 180
-            ),
-            y=self.position.y
-            + self._LoS_dot_radius
-            * np.sin(
-                (self.position.theta + (arc_left + arc_right) / 2.0) * np.pi / 180
-            ),
+        # geometry local to owning piece - arc origin currently at piece centre
+        self.origin_local = np.array([0.0, 0.0])
+        # bisect arc measured from left edge so arcs wrapping past 360 deg stay on their side
+        arc_middle = (arc_left + ((arc_right - arc_left) % 360.0) / 2.0) * np.pi / 180
+        self.LoS_dot_local = self.origin_local + self._LoS_dot_radius * np.array(
+            [np.cos(arc_middle), np.sin(arc_middle)]
+        )
+
+        self.edge_local = self.origin_local[None]
+        if outline is not None:
+            self.edge_local = pymada.classes.geometry.arc_outline(
+                outline, self.origin_local, arc_left, arc_right
+            )
+
+        self.attach(
+            position if position is not None else Position(x=0.0, y=0.0, theta=0.0)
         )
 
-        self.position.add_observer(self.LoS_dot_position.move)
+    def attach(self, position):
+        """Attach hull zone to a new world pose
 
-    def move(self, *args, **kwargs):
+        args:
+            position - world pose of owning piece [Position]
         """
+
+        self._parent_position = position
+        self._world_version = -1
+
+    def _update_world(self):
+        """Recompute world positions of arc origin, LoS dot and arc edge normals if parent pose has changed
         """
 
-        # move the HullZone position and watchers
-        self.position.move(*args, **kwargs)
+        if self._world_version != self._parent_position.version:
+            points = np.vstack((self.origin_local, self.LoS_dot_local, self.edge_local))
+            x, y = self._parent_position.to_world(points[:, 0], points[:, 1])
+            self._position = Position(x=x[0], y=y[0], theta=self._parent_position.theta)
+            self._LoS_dot_position = Position(x=x[1], y=y[1])
+            self._edge_points = np.stack((x[2:], y[2:]), axis=-1)
+            self._arc_normals = np.stack(
+                pymada.classes.utils.rotate_2D(
+                    self.arc_normals_local[:, 0],
+                    self.arc_normals_local[:, 1],
+                    self._parent_position.theta,
+                ),
+                axis=-1,
+            )
+            self._world_version = self._parent_position.version
 
-    def has_LoS_to(defender, defending_hull_zone):
+    @property
+    def position(self):
+        """World position and heading of arc origin [Position]
         """
 
-        XXX requires multiple dispatch to measure against instances without hull_zones e.g. scenery
+        self._update_world()
+        return self._position
+
+    @property
+    def LoS_dot_position(self):
+        """World position of line-of-sight dot [Position]
+        """
+
+        self._update_world()
+        return self._LoS_dot_position
+
+    @property
+    def edge_points(self):
+        """World points of hull zone edge [array(M,2), cm]
+        """
+
+        self._update_world()
+        return self._edge_points
+
+    @property
+    def arc_normals(self):
+        """World inward normals of arc edges [array(2,2)]
+        """
+
+        self._update_world()
+        return self._arc_normals
+
+    def in_arc(self, points):
+        """Whether points lie within firing arc
+
+        args:
+            points - e.g. base corners or LoS dots of other pieces [array(...,2), cm]
+        returns:
+            [array(...), bool]
         """
 
-        # TODO proper method here
+        origin = self.position
 
-        return True
+        return pymada.classes.geometry.points_in_arc(
+            points, np.array([origin.x, origin.y]), self.arc_normals, self.arc_is_wide
+        )
 
-    def in_range_of(defender, defending_hull_zone):
+    def polyline_in_arc(self, polylines):
+        """Whether any part of polylines lies within firing arc
+
+        args:
+            polylines - e.g. hull zone edges of other pieces [array(...,M,2), cm]
+        returns:
+            [array(...), bool]
         """
 
+        origin = self.position
+
+        return pymada.classes.geometry.polylines_in_arc(
+            polylines,
+            np.array([origin.x, origin.y]),
+            self.arc_normals,
+            self.arc_is_wide,
+        )
+
+    def has_LoS_to(self, defender, defending_hull_zone):
+        """Whether line of sight to defending hull zone avoids defender's other hull zones
+
         XXX requires multiple dispatch to measure against instances without hull_zones e.g. scenery
-        XXX could have generic in_range_of function which just measures between any two objects no matter what type?
 
         args:
-            defender - [Piece]
-            defending_hull_zone []
+            defender - [Ship]
+            defending_hull_zone - [str]
+        notes:
+            obstruction by other pieces requires the board - see Ship.LoS_to
         """
 
-        # TODO proper method here
+        LoS_dot = defender.hull_zones[defending_hull_zone].LoS_dot_position
 
-        distance_between_LoS_dots = np.sqrt(
-            (
-                self.LoS_dot_position.x
-                - defender.hull_zones[defending_hull_zone].LoS_dot_position.x
-            )
-            ** 2
-            + (
-                self.LoS_dot_position.y
-                - defender.hull_zones[defending_hull_zone].LoS_dot_position.y
-            )
-            ** 2
+        return not pymada.classes.geometry.crosses_any(
+            np.array([self.LoS_dot_position.x, self.LoS_dot_position.y]),
+            np.array([LoS_dot.x, LoS_dot.y]),
+            defender.hull_zone_boundaries,
         )
 
-        colours = {
-            colour
-            for colour in pymada.data.tools.rulers["range"]
-            if pymada.data.tools.rulers["range"][colour] <= distance_between_LoS_dots
-        }
-        return colours  # XXX multiple dispatch return distance 1 for squadrons?
+    def in_range_of(self, defender, defending_hull_zone=None):
+        """Range band from this hull zone to a defender
+
+        XXX requires multiple dispatch to measure against instances without hull_zones e.g. scenery
+
+        args:
+            defender - [Piece]
+            defending_hull_zone - hull zone of defender, closest point of base if None [str]
+        returns:
+            range band colour or False if out of range [str]
+        """
+
+        return pymada.classes.geometry.range_band(
+            pymada.classes.geometry.polyline_distances(
+                self.edge_points, defender.edge_points(defending_hull_zone)
+            )
+        )  # XXX multiple dispatch return distance 1 for squadrons?
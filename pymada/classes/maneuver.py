@@ -0,0 +1,273 @@
+"""Precomputed ship maneuvers
+"""
+
+import numpy as np
+
+import pymada
+import pymada.errors
+import pymada.data.ships
+import pymada.data.tools
+
+
+class MoveSpace:
+    """Class describing every legal clicks tuple at one speed without listing them
+
+    notes:
+        ordered as itertools.product over the clicks of each notch, so the first notch is the
+        most significant digit of a mixed radix number with 2 * max_clicks + 1 values per
+        notch - index and clicks tuple convert in O(1) in the number of maneuvers
+        one space shared by all ships of a model at a speed - see ManeuverTable.move_space
+    """
+
+    __slots__ = ("max_clicks", "radices", "place_values", "_size")
+
+    def __init__(self, max_clicks):
+        """Constructor for move space
+
+        args:
+            max_clicks - maximum yaw clicks of each notch [tuple(int)]
+        """
+
+        self.max_clicks = tuple(int(clicks) for clicks in max_clicks)
+        self.radices = tuple(2 * clicks + 1 for clicks in self.max_clicks)
+
+        place_values = []
+        place_value = 1
+        for radix in reversed(self.radices):
+            place_values.insert(0, place_value)
+            place_value *= radix
+        self.place_values = tuple(place_values)
+        self._size = place_value
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return f"MoveSpace({self.max_clicks})"
+
+    def __getitem__(self, index):
+        """Clicks tuple at index
+
+        args:
+            index - negative counts from end as for a list [int]
+        returns:
+            [tuple(int)]
+        """
+
+        index = int(index)
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"move index {index} out of range for {self}")
+
+        return tuple(
+            (index // place_value) % radix - clicks
+            for place_value, radix, clicks in zip(
+                self.place_values, self.radices, self.max_clicks
+            )
+        )
+
+    def __iter__(self):
+        return (self[index] for index in range(self._size))
+
+    def __contains__(self, clicks):
+        return len(clicks) == len(self.max_clicks) and all(
+            -max_clicks <= click <= max_clicks
+            for click, max_clicks in zip(clicks, self.max_clicks)
+        )
+
+    def index(self, clicks):
+        """Index of clicks tuple
+
+        args:
+            clicks - yaw clicks per notch [list(int)]
+        """
+
+        if len(clicks) != len(self.max_clicks):
+            raise pymada.errors.ManeuverError(f"clicks {clicks} are not in {self}")
+
+        # single pass checking and accumulating each digit - on the Ship.move hot path
+        index = 0
+        for click, max_clicks, place_value in zip(
+            clicks, self.max_clicks, self.place_values
+        ):
+            if not -max_clicks <= click <= max_clicks:
+                raise pymada.errors.ManeuverError(f"clicks {clicks} are not in {self}")
+            index += (int(click) + max_clicks) * place_value
+
+        return index
+
+    def sample(self, rng, size=None):
+        """Uniformly random clicks without listing every maneuver
+
+        args:
+            rng - [numpy.random.Generator]
+            size - number of samples, single clicks tuple if None [int]
+        returns:
+            [tuple(int)] or one row of clicks per sample [array(size,V), int]
+        """
+
+        if size is None:
+            return self[rng.integers(self._size)]
+
+        indices = rng.integers(self._size, size=size)
+
+        return (indices[:, None] // np.array(self.place_values, dtype=int)) % np.array(
+            self.radices, dtype=int
+        ) - np.array(self.max_clicks, dtype=int)
+
+
+class ManeuverTable:
+    """Class describing the relative displacement of every legal maneuver of a ship model
+
+    notes:
+        one table shared by all ships of a model - get with ManeuverTable.for_model()
+        displacements are (dx, dy, dtheta) in the frame of the ship before it moves so
+        executing a maneuver is a single pose composition
+        each speed is built on first use and rebuilt if the maneuver data it was built from
+        (ship move data, maneuver distances or yaw values) has been replaced since - data
+        edited in place must be followed by invalidate()
+        final displacement depends only on speed and clicks since ships rotate about their
+        centre - base size will be needed once rotations happen about base corners
+    """
+
+    _TABLES = {}
+
+    def __init__(self, model):
+        """Constructor for maneuver table
+
+        args:
+            model - ship model name in pymada.data.ships.ships [str]
+        """
+
+        self.model = model
+        self._speeds = {}
+
+    @classmethod
+    def for_model(cls, model):
+        """Return table shared by all ships of model
+
+        args:
+            model - ship model name [str]
+        """
+
+        if model not in cls._TABLES:
+            cls._TABLES[model] = cls(model)
+
+        return cls._TABLES[model]
+
+    def invalidate(self, speed=None):
+        """Drop built tables after maneuver data has been edited in place
+
+        args:
+            speed - only this speed, every speed if None [int]
+        """
+
+        if speed is None:
+            self._speeds.clear()
+        else:
+            self._speeds.pop(speed, None)
+
+    def _build(self, speed, sources):
+        """Walk every legal maneuver at speed notch by notch once
+
+        returns:
+            clicks - legal clicks tuples in Ship.move_options order [list(tuple(int))]
+            space - index of each clicks tuple, which is its row in displacements [MoveSpace]
+            displacements - relative (dx, dy, dtheta) of each maneuver [array(N,3)]
+        """
+
+        max_clicks, distances, yaws = sources
+
+        space = MoveSpace(max_clicks[:speed])
+        clicks = list(space)
+
+        displacements = np.zeros((len(clicks), 3))
+        for row, maneuver in enumerate(clicks):
+            x, y, theta = 0.0, 0.0, 0.0
+            for click_values, sub_move_dist, click_options in zip(
+                maneuver, distances, yaws
+            ):
+                # first translate forward at current heading
+                x += sub_move_dist * np.cos(theta * np.pi / 180.0)
+                y += sub_move_dist * np.sin(theta * np.pi / 180.0)
+                # -1. factor since +ve click means turn clockwise (opposite to global +ve theta)
+                theta -= np.sign(click_values) * sum(click_options[: abs(click_values)])
+            displacements[row] = x, y, theta
+
+        return clicks, space, displacements
+
+    def _table(self, speed):
+        """Return (re)built table for speed
+
+        notes:
+            data is compared by identity so lookups stay O(1) - see invalidate()
+        """
+
+        move = pymada.data.ships.ships[self.model]["move"][speed]
+        distances = pymada.data.tools.maneuver["distance"][speed]
+        yaws = pymada.data.tools.maneuver["yaw"][speed]
+
+        entry = self._speeds.get(speed)
+        if (
+            entry is None
+            or entry[0][0] is not move
+            or entry[0][1] is not distances
+            or entry[0][2] is not yaws
+        ):
+            sources = (move, distances, yaws)
+            entry = self._speeds[speed] = (sources, *self._build(speed, sources))
+
+        return entry[1:]
+
+    def clicks(self, speed):
+        """Every legal clicks tuple at speed [list(tuple(int))]
+        """
+
+        return self._table(speed)[0]
+
+    def move_space(self, speed):
+        """Every legal clicks tuple at speed, indexable without listing them [MoveSpace]
+        """
+
+        return self._table(speed)[1]
+
+    def displacements(self, speed):
+        """Relative (dx, dy, dtheta) of every legal maneuver at speed, ordered as clicks() [array(N,3)]
+        """
+
+        return self._table(speed)[2]
+
+    def displacement(self, speed, clicks):
+        """Relative (dx, dy, dtheta) of a single maneuver
+
+        args:
+            speed - ship speed [int]
+            clicks - yaw clicks per notch, only first speed entries used [list(int)]
+        """
+
+        _, space, displacements = self._table(speed)
+
+        return displacements[space.index(clicks[:speed])]
+
+    def clamp(self, speed, clicks):
+        """Limit clicks to those legal at speed e.g. when temporarily reducing speed
+
+        args:
+            speed - [int]
+            clicks - yaw clicks per notch [list(int)]
+        returns:
+            first speed clicks, each limited to maximum yaw at speed [tuple(int)]
+        """
+
+        max_clicks = pymada.data.ships.ships[self.model]["move"][speed]
+
+        return tuple(
+            int(
+                max(
+                    -max_clicks[sub_speed],
+                    min(max_clicks[sub_speed], clicks[sub_speed]),
+                )
+            )
+            for sub_speed in range(speed)
+        )
@@ -1,4 +1,5 @@
-import random
+import numpy as np
+
 import pymada
 import pymada.errors
 from pymada.classes.base import Base
@@ -14,24 +15,120 @@ class Piece:
 
         args:
             name - unique string identifier [str]
+            colour - base fill colour, random if not given [str]
+            rng - random generator for colour, unseeded if None [numpy.random.Generator]
         """
 
         self.name = name
+        self.board = None  # set when placed on a Board
         self.base = Base()
         self.position = Position()
-        self.position.add_observer(
-            # add base as observer
-            self.base.move
+        rng = kwargs.get("rng")
+        rng = np.random.default_rng() if rng is None else rng
+        self.colour = kwargs.get(
+            "colour",
+            "#" + "".join(format(value, "02X") for value in rng.integers(256, size=3)),
         )
-        self.colour=kwargs.get("colour", '#'+''.join([format(random.randint(0,255),'02X') for _ in range(3)]))
 
         self._damage = 0
         self._is_destroyed = False
 
+    @property
+    def position(self):
+        """World pose of piece - all piece geometry is defined relative to this
+        """
+
+        return self._position
+
+    @position.setter
+    def position(self, position):
+        """Replace world pose and re-attach piece geometry to it
+        """
+
+        self._position = position
+        self._attach(position)
+
+    def _attach(self, position):
+        """Attach geometry defined relative to piece to new world pose
+
+        args:
+            position - world pose [Position]
+        """
+
+        self.base.attach(position)
+
     @property
     def is_destroyed(self):
         return self._is_destroyed
 
+    def reset(self, *args, **kwargs):
+        """Restore piece to undamaged state e.g. to reuse it in a new game
+        """
+
+        self._damage = 0
+        self._is_destroyed = False
+        self._update_board()
+
+    def save_state(self):
+        """Everything about the piece an action can change, for undoing it
+
+        returns:
+            [tuple]
+        """
+
+        return (
+            self.position.x,
+            self.position.y,
+            self.position.theta,
+            self._damage,
+            self._is_destroyed,
+        )
+
+    def restore_state(self, state):
+        """Return piece to a state from save_state()
+
+        args:
+            state - [tuple]
+        notes:
+            pose is only set if it differs so geometry cached against it stays valid
+        """
+
+        x, y, theta, self._damage, self._is_destroyed = state
+        if (x, y, theta) != (self.position.x, self.position.y, self.position.theta):
+            self.position.set(x=x, y=y, theta=theta)
+        self._update_board()
+
+    def place(self, x=None, y=None, theta=None):
+        """Set world pose directly e.g. when deploying, keeping our board up to date
+
+        args:
+            x - new horizontal coordinate, unchanged if None [cm]
+            y - new vertical coordinate, unchanged if None [cm]
+            theta - new heading, unchanged if None [deg]
+        notes:
+            setting position directly bypasses our board's indexes - use this instead
+        """
+
+        self.position.set(x=x, y=y, theta=theta)
+        self._update_board()
+
+    def destroy(self):
+        """Remove piece from play regardless of damage e.g. when leaving the play area
+        """
+
+        self._is_destroyed = True
+        self._update_board()
+
+    def _update_board(self):
+        """Keep our board's indexes of live and unactivated pieces, broadphase and state hash up to date
+
+        notes:
+            called whenever pose, activation, damage or destruction may have changed
+        """
+
+        if self.board is not None:
+            self.board._refresh(self)
+
     @property
     def damage(self):
         """
@@ -48,6 +145,7 @@ class Piece:
         """
 
         self.position.move(*args, **kwargs)
+        self._update_board()
 
     def suffer(self, attack, *args, **kwargs):
         """
@@ -1,45 +1,71 @@
 """
 """
 
-import os, sys, random
+import os, sys
+import numpy as np
 
 import pymada
 import pymada.errors
 from pymada.classes.board import Board
+from pymada.classes.decision import BaseDecision, DecideClicksToMove
+from pymada.ai.mcts import MCTS
 
 
 class Player:
     """
     """
 
-    def __init__(self, name, faction=None, species="human"):
+    def __init__(
+        self, name, faction=None, species="human", rng=None, search=None, policy=None
+    ):
         """
 
         args:
             name - unique name for player
+            rng - random generator for random-type choices, unseeded if None - replaced by
+                Game with a stream derived from the game seed [numpy.random.Generator]
+            search - tree search for mcts-type choices, default budgets if None [MCTS]
+            policy - answers a decision for ai-type choices with an index into its options
+                [callable]
         """
 
         self.name = name
         self.species = species
         self.is_eliminated = False
         self.faction = faction
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.game = None  # set by Game so search players can look ahead
+        self.search = search
+        self.policy = policy
+        self._plan = []  # remaining answers for activation chosen by search
+
+        self._choose_dispatch = {}
+        self._choose_dispatch["human"] = self.choose_human
+        self._choose_dispatch["random"] = self.choose_random
+        self._choose_dispatch["test"] = self.choose_test
+        self._choose_dispatch["ai"] = self.choose_ai
+        self._choose_dispatch["mcts"] = self.choose_mcts
 
     def choose(self, decision):
         """
 
         args:
             decision - [Decision]
+        notes:
+            decisions with a single option are answered without asking, except for tree
+            search players whose planned activation has to keep in step with every decision
         """
 
         # XXX COULD LOG EVENT HERE
 
-        choose_dispatch = {}
-        choose_dispatch["human"] = self.choose_human
-        choose_dispatch["random"] = self.choose_random
-        choose_dispatch["test"] = self.choose_test
-        choose_dispatch["ai"] = self.choose_ai
+        if (
+            isinstance(decision, BaseDecision)
+            and decision.is_forced
+            and self.species != "mcts"
+        ):
+            return decision.options[0]
 
-        return choose_dispatch[self.species](decision)
+        return self._choose_dispatch[self.species](decision)
 
     @staticmethod
     def choose_human(decision):
@@ -50,23 +76,57 @@ class Player:
         """
 
         # XXX ADD TRY CATCH STATEMENT HERE IN CASE USER HAS INPUTTED SOMETHING INCORRECT - COULD RAISE PYMADA.USERINPUTERROR
-        choice = input(decision.MESSAGE)
+        choice = input(decision.prompt)
         # XXX if choice == 'draw_board' ... then re-ask. maybe could even string inject here.
         choice_parsed = decision.parse_choice_human(choice)
         return choice_parsed
 
-    @staticmethod
-    def choose_random(decision):
+    def choose_random(self, decision):
         """Choose method for random-type player
 
         args:
             decision - [Decision]
         """
 
-        choice = random.sample(decision.options, 1)[0]
+        options = decision.options
+        choice = options[self.rng.integers(len(options))]
         choice_parsed = decision.parse_choice_random(choice)
         return choice_parsed
 
+    def choose_mcts(self, decision):
+        """Choose method for tree search player
+
+        args:
+            decision - [Decision]
+        notes:
+            a whole activation is searched when its ship is selected and the following
+            decisions answered from it - if an answer is no longer an option the player
+            falls back to random choices for the rest of the activation
+        """
+
+        # answer was not an option - random choices until activation ends with its maneuver
+        if self._plan is None:
+            if isinstance(decision, DecideClicksToMove):
+                self._plan = []
+            return self.choose_random(decision)
+
+        if not self._plan:
+            if self.search is None:
+                self.search = MCTS()
+            ship_name, attack, clicks = self.search.search(
+                self.game, self.name, self.rng
+            )
+            self._plan = [ship_name]
+            self._plan.extend([None] if attack is None else attack)
+            self._plan.append(clicks)
+
+        choice = self._plan.pop(0)
+        if choice not in decision.options:
+            self._plan = None
+            return self.choose_mcts(decision)
+
+        return choice
+
     @staticmethod
     def choose_test(decision):
         """
@@ -76,8 +136,7 @@ class Player:
 
         return str(decision[:-1]) + "!"
 
-    @staticmethod
-    def choose_ai(decision):
+    def choose_ai(self, decision):
         """
         args:
             decision - [Decision]
@@ -85,4 +144,9 @@ class Player:
 
         # XXX ASK NN HERE
 
-        return decision.parse_choice_ai()
+        if self.policy is None:
+            raise pymada.errors.PymadaException(
+                f"ai player {self.name} needs a policy to choose with"
+            )
+
+        return decision.parse_choice_ai(self.policy(decision))
@@ -15,35 +15,61 @@ class PlayerPiece(Piece):
     """Class describing playable piece
     """
 
-    def __init__(self, model, name, faction, player_name=None, upgrades=None):
+    def __init__(self, model, name, faction, player_name=None, upgrades=None, rng=None):
         """Constructor for playable piece
         """
-        super().__init__(name=name)
+        super().__init__(name=name, rng=rng)
 
         self.faction = faction
         self._upgrades = upgrades
         self.has_activated = False
         self.player_name = player_name
 
+    def reset(self, *args, **kwargs):
+        """Restore piece to undamaged, unactivated state
+        """
+
+        super().reset(*args, **kwargs)
+        self.has_activated = False
+        self._update_board()
+
+    def save_state(self):
+        """
+        """
+
+        return super().save_state() + (self.has_activated,)
+
+    def restore_state(self, state):
+        """
+        """
+
+        super().restore_state(state[:-1])
+        self.has_activated = state[-1]
+        self._update_board()
+
     def activate(self):
         """
         """
 
         self.has_activated = True
+        self._update_board()
 
     def deactivate(self):
         """
         """
 
         self.has_activated = False
+        self._update_board()
 
     def can_fire(self, defender, *args, **kwargs):
         """
         """
 
-        # first check line of sight
+        # first check defender lies in firing arc, then line of sight
 
-        if self.LoS_to(defender, *args, **kwargs):
+        if self.arc_to(defender, *args, **kwargs) and self.LoS_to(
+            defender, *args, **kwargs
+        ):
 
             # calculate range to target
 
@@ -60,32 +86,36 @@ class PlayerPiece(Piece):
 
         return False
 
-    def fire(self, defender, *args, **kwargs):
+    def fire(self, defender, *args, rng=None, attack_range=None, **kwargs):
         """
         
         args:
             defender -  
+            rng - random generator for attack dice, shared unseeded generator if None [numpy.random.Generator]
+            attack_range - range band of an attack already found to be legal e.g. by
+                Board.targeting, skips checking and measuring again if given [str]
         """
 
-        if self.can_fire(defender, *args, **kwargs):
-
+        if attack_range is None and self.can_fire(defender, *args, **kwargs):
             attack_range = self.range_to(defender, *args, **kwargs)
 
+        if attack_range:
+
             attack = self.create_attack_pool(*args, **kwargs)
 
             # XXX more modifications here
 
-            attack.roll(attack_range)
+            roll = attack.roll(attack_range, rng=rng)
 
             # XXX even more modifications here
 
             # TODO add various attack stages here e.g. spend defense tokens
 
-            defender.suffer(attack, *args, **kwargs)
+            defender.suffer(roll, *args, **kwargs)
 
     # TODO make ABC
     def create_attack_pool(*args, **kwargs):
-        """Return deep copy of attacking Dice armament
+        """Return attacking Dice armament
         """
 
         raise NotImplmentedError
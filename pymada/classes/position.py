@@ -1,4 +1,4 @@
-import copy
+import copy, itertools, math
 import numpy as np
 import pymada
 import pymada.errors
@@ -10,18 +10,105 @@ class Position:
 
     notes:
         can also represent generic vector
+        acts as the single world pose of a piece - geometry attached to a piece is stored in
+        coordinates local to this position and transformed lazily via to_world()
+        version is drawn from a counter shared by all positions on every change, so it is
+        unique to one state of one position and dependent geometry can be cached against it
     """
 
+    _VERSIONS = itertools.count()
+
     def __init__(self, x=None, y=None, theta=None):
         """Constructor for position including cartesian coordinates and rotation
         """
 
-        self.x = x
-        self.y = y
-        self.theta = theta
+        self._x = x
+        self._y = y
+        self._theta = theta
+        self.version = next(self._VERSIONS)
 
+        self._rotation = None
+        self._rotation_version = -1
         self._observers = []
 
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._x = x
+        self.version = next(self._VERSIONS)
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        self._y = y
+        self.version = next(self._VERSIONS)
+
+    @property
+    def theta(self):
+        return self._theta
+
+    @theta.setter
+    def theta(self, theta):
+        self._theta = theta
+        self.version = next(self._VERSIONS)
+
+    @property
+    def rotation(self):
+        """Cosine and sine of heading, cached until the position next changes
+
+        returns:
+            (cos(theta), sin(theta)) [tuple(float)]
+        """
+
+        if self._rotation_version != self.version:
+            theta = (self._theta or 0.0) * math.pi / 180.0
+            self._rotation = (math.cos(theta), math.sin(theta))
+            self._rotation_version = self.version
+
+        return self._rotation
+
+    def set(self, x=None, y=None, theta=None):
+        """Set any of x, y and theta at once as a single change
+
+        args:
+            x - new horizontal coordinate, unchanged if None [cm]
+            y - new vertical coordinate, unchanged if None [cm]
+            theta - new heading, unchanged if None [deg]
+        """
+
+        if x is not None:
+            self._x = x
+        if y is not None:
+            self._y = y
+        if theta is not None:
+            self._theta = theta
+        self.version = next(self._VERSIONS)
+
+    def to_world(self, x, y):
+        """Transform coordinates local to this position into world coordinates
+
+        args:
+            x - local coordinates along heading [float/array, cm]
+            y - local coordinates perpendicular to heading [float/array, cm]
+        returns:
+            world x and y coordinates [float/array, cm]
+        notes:
+            single composed rotation + translation - local frame origin is this position
+        """
+
+        cos_theta, sin_theta = self.rotation
+
+        return (
+            self._x + x * cos_theta - y * sin_theta,
+            self._y + x * sin_theta + y * cos_theta,
+        )
+
     def __sub__(self, other_position):
         """Return vector joining two positions
 
@@ -64,6 +151,18 @@ class Position:
         """
         self._observers.append(observer)
 
+    def compose(self, x=0.0, y=0.0, theta=0.0):
+        """Apply a displacement given in the frame of this position
+
+        args:
+            x - displacement along heading [cm]
+            y - displacement perpendicular to heading [cm]
+            theta - change in heading [deg]
+        """
+
+        x, y = self.to_world(x, y)
+        self.set(x=x, y=y, theta=(self._theta + theta + 180.0) % 360.0 - 180.0)
+
     def _translate(self, x=0.0, y=0.0, r=None, theta=None):
         """
         """
@@ -96,25 +195,9 @@ class Position:
         if centre_y is None:
             centre_y = self.y
 
-        # tranform self.theta heading by first converting to cartesian unit vector
-        # and finding vector from rotation axis
+        # heading simply accumulates the rotation - wrap to [-180, 180)
         if self.theta is not None:
-            theta_vector_x = np.cos(self.theta * np.pi / 180.0) + self.x - centre_x
-            theta_vector_y = np.sin(self.theta * np.pi / 180.0) + self.y - centre_y
-
-            (
-                theta_vector_x_rotated,
-                theta_vector_y_rotated,
-            ) = pymada.classes.utils.rotate_2D(theta_vector_x, theta_vector_y, theta)
-
-            # transform back
-            theta_vector_x_rotated += centre_x - self.x
-            theta_vector_y_rotated += centre_y - self.y
-            self.theta = (
-                np.arctan2(theta_vector_y_rotated, theta_vector_x_rotated)
-                * 180.0
-                / np.pi
-            )
+            self.theta = (self.theta + theta + 180.0) % 360.0 - 180.0
 
         # calculate vector from rotation axis to this point
         position_vector_x = self.x - centre_x
@@ -0,0 +1,81 @@
+"""Results of rolling a dice pool
+"""
+
+import numpy as np
+
+import pymada
+import pymada.errors
+
+
+class Roll:
+    """Class describing results of rolling a dice pool
+
+    attrs:
+        counts - number of dice showing each face type for each colour [array(C,F), int]
+    notes:
+        colours are ordered as Dice.COLOURS and face types as Roll.FACE_TYPES
+    """
+
+    FACE_TYPES = ("blank", "hit", "crit", "accuracy", "hit+hit", "hit+crit")
+    SYMBOLS = ("hit", "crit", "accuracy")
+
+    # number of each symbol shown on each face type [array(F,3)]
+    FACE_SYMBOLS = np.array(
+        [
+            [0, 0, 0],  # blank
+            [1, 0, 0],  # hit
+            [0, 1, 0],  # crit
+            [0, 0, 1],  # accuracy
+            [2, 0, 0],  # hit+hit
+            [1, 1, 0],  # hit+crit
+        ]
+    )
+
+    __slots__ = ("counts",)
+
+    def __init__(self, counts):
+        """Constructor for roll results
+
+        args:
+            counts - number of dice showing each face type for each colour [array(C,F), int]
+        """
+
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+    def __getitem__(self, face_type):
+        """Number of dice of any colour showing face type e.g. roll["hit+hit"]
+        """
+
+        return int(self.counts[:, self.FACE_TYPES.index(face_type)].sum())
+
+    def __eq__(self, other_roll):
+        return np.array_equal(self.counts, other_roll.counts)
+
+    def __repr__(self):
+        faces = [
+            f"{self[face_type]}*{face_type}"
+            for face_type in self.FACE_TYPES
+            if self[face_type]
+        ]
+        return f"Roll({' '.join(faces)})"
+
+    @property
+    def symbols(self):
+        """Total hit, crit and accuracy icons shown [array(3), int]
+        """
+
+        return self.counts.sum(axis=0) @ self.FACE_SYMBOLS
+
+    @property
+    def damage_normal(self):
+        """Number of hit icons [int]
+        """
+
+        return int(self.symbols[0])
+
+    @property
+    def damage_critical(self):
+        """Number of crit icons [int]
+        """
+
+        return int(self.symbols[1])
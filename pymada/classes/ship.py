@@ -1,17 +1,20 @@
 """
 """
 
-import copy, itertools
 import numpy as np
 
 import pymada
 import pymada.errors
 import pymada.data.ships
 import pymada.data.tools
+import pymada.classes.utils
+import pymada.classes.geometry
 from pymada.classes.base import Base
 from pymada.classes.position import Position
 from pymada.classes.player_piece import PlayerPiece
 from pymada.classes.hull_zone import HullZone
+from pymada.classes.maneuver import ManeuverTable
+from pymada.classes.geometry_cache import cached
 
 # TODO add command_dial list via command value from lookup
 # TODO add command token functionality e.g. if brace in Ship.command_tokens and brance is not 'exhausted':
@@ -32,10 +35,12 @@ class Ship(PlayerPiece):
         x=0.0,
         y=0.0,
         theta=0.0,
+        rng=None,
     ):
         """Constructor for Ship
         args:
             theta - [float, deg]
+            rng - random generator for piece colour [numpy.random.Generator]
         """
 
         super().__init__(
@@ -44,9 +49,11 @@ class Ship(PlayerPiece):
             faction=faction,
             upgrades=upgrades,
             player_name=player_name,
+            rng=rng,
         )
 
         self._data = pymada.data.ships.ships[model]  # attach basic data
+        self.maneuvers = ManeuverTable.for_model(model)
         self.hull = self._data["hull"]
         self.damage_cards = []
 
@@ -64,25 +71,44 @@ class Ship(PlayerPiece):
             outline_points_y=pymada.data.ships.bases[self._data["size"]]["outline"][
                 "x"
             ],
+            position=self.position,
         )
 
-        self.hull_zones = {}  # add hull-zones
-        for zone in self._data["hull_zones"]:
+        self.hull_zones = {}  # add hull-zones sharing the ship's pose in fixed order
+        for zone in sorted(self._data["hull_zones"]):
             self.hull_zones[zone] = HullZone(
                 armament=self._data["armament"][zone],
                 shields=self._data["shields"][zone],
                 LoS_dot=self._data["LoS_dots"][zone],
                 arc_left=self._data["arc_left"][zone],
                 arc_right=self._data["arc_right"][zone],
+                position=self.position,
+                outline=self.base.outline_local,
             )
 
-            self.position.add_observer(
-                # attach this hull_zone.move() method as observer of Ship position
-                self.hull_zones[zone].move
-            )
-        self.position.add_observer(
-            # add base as observer
-            self.base.move
+        # hull zone edges padded to a common length for batched measuring
+        self.hull_zone_edges_local = pymada.classes.geometry.pad_polylines(
+            [hull_zone.edge_local for hull_zone in self.hull_zones.values()]
+        )
+
+        # lines dividing hull zones from arc origin to base outline along each arc edge
+        self.hull_zone_boundaries_local = np.array(
+            [
+                [hull_zone.origin_local, hull_zone.edge_local[end]]
+                for hull_zone in self.hull_zones.values()
+                for end in [0, -1]
+            ]
+        )
+
+        # half-planes bounding each hull zone's firing arc
+        self.arc_origins_local = np.array(
+            [hull_zone.origin_local for hull_zone in self.hull_zones.values()]
+        )
+        self.arc_normals_local = np.array(
+            [hull_zone.arc_normals_local for hull_zone in self.hull_zones.values()]
+        )
+        self.arc_is_wide = np.array(
+            [hull_zone.arc_is_wide for hull_zone in self.hull_zones.values()]
         )
 
         self.position.move(
@@ -93,6 +119,53 @@ class Ship(PlayerPiece):
             centre_y_rotate_last=y,
         )
 
+    def _attach(self, position):
+        """Attach base and hull zones to new world pose
+        """
+
+        super()._attach(position)
+        for hull_zone in getattr(self, "hull_zones", {}).values():
+            hull_zone.attach(position)
+
+    def reset(self, speed=0, *args, **kwargs):
+        """Restore ship to undamaged, unactivated state with full shields
+
+        args:
+            speed - [int]
+        """
+
+        super().reset(*args, **kwargs)
+        self.speed = speed
+        self.damage_cards = []
+        for zone, hull_zone in self.hull_zones.items():
+            hull_zone.shields = self._data["shields"][zone]
+        self._update_board()
+
+    def save_state(self):
+        """
+        notes:
+            damage cards are all alike so just their number is kept
+        """
+
+        return (
+            super().save_state()
+            + (self.speed, len(self.damage_cards))
+            + tuple(hull_zone.shields for hull_zone in self.hull_zones.values())
+        )
+
+    def restore_state(self, state):
+        """
+        """
+
+        n_hull_zones = len(self.hull_zones)
+        super().restore_state(state[: -n_hull_zones - 2])
+        self.speed, n_damage_cards = state[-n_hull_zones - 2 : -n_hull_zones]
+        del self.damage_cards[n_damage_cards:]
+        self.damage_cards += ["card"] * (n_damage_cards - len(self.damage_cards))
+        for hull_zone, shields in zip(self.hull_zones.values(), state[-n_hull_zones:]):
+            hull_zone.shields = shields
+        self._update_board()
+
     @property
     def damage(self):
         """Ship damage defined by number of damage cards
@@ -106,28 +179,126 @@ class Ship(PlayerPiece):
 
         # XXX add logger here or ShipDestroyedEvent(exception) ?
 
-        return True if self.damage >= self.hull else False
+        return True if self._is_destroyed or self.damage >= self.hull else False
+
+    @property
+    def hull_zone_edges(self):
+        """World points of every hull zone edge in hull_zones order [array(H,M,2), cm]
+        """
+
+        return pymada.classes.utils.transform_2D(
+            self.hull_zone_edges_local.reshape(-1, 2),
+            self.position.x,
+            self.position.y,
+            self.position.theta,
+        ).reshape(self.hull_zone_edges_local.shape)
+
+    def edge_points(self, hull_zone=None):
+        """World points measured to on our ship e.g. by a defending hull zone
+
+        args:
+            hull_zone - whole base outline, closed so every side is an edge, if None [str]
+        returns:
+            [array(N,2), cm]
+        """
+
+        if hull_zone is None:
+            outline = self.base.outline_points
+            return np.vstack((outline, outline[:1]))
+
+        return self.hull_zones[hull_zone].edge_points
+
+    @property
+    def hull_zone_boundaries(self):
+        """World lines dividing hull zones [array(B,2,2), cm]
+        """
+
+        return pymada.classes.utils.transform_2D(
+            self.hull_zone_boundaries_local.reshape(-1, 2),
+            self.position.x,
+            self.position.y,
+            self.position.theta,
+        ).reshape(self.hull_zone_boundaries_local.shape)
+
+    def in_arcs(self, points):
+        """Whether points lie within each of our hull zones' firing arcs in one pass
+
+        args:
+            points - e.g. base corners or LoS dots of other pieces [array(...,2), cm]
+        returns:
+            one mask per hull zone in order of hull_zones [array(H,...), bool]
+        """
+
+        points = np.asarray(points, dtype=float)
+        origins = pymada.classes.utils.transform_2D(
+            self.arc_origins_local,
+            self.position.x,
+            self.position.y,
+            self.position.theta,
+        )
+        normals_x, normals_y = pymada.classes.utils.rotate_2D(
+            self.arc_normals_local[..., 0],
+            self.arc_normals_local[..., 1],
+            self.position.theta,
+        )
+        extra_axes = (slice(None),) + (None,) * (points.ndim - 1)
+
+        return pymada.classes.geometry.points_in_arc(
+            points[None],
+            origins[extra_axes],
+            np.stack((normals_x, normals_y), axis=-1)[extra_axes],
+            self.arc_is_wide[extra_axes],
+        )
 
     @property
     def move_options(self):
+        """Every legal clicks tuple at current speed, indexable without listing them [MoveSpace]
         """
+
+        return self.maneuvers.move_space(self.speed)
+
+    def move_outcomes(self, options=None, speed=None):
+        """Final poses and base outlines of candidate maneuvers without moving the ship
+
+        args:
+            options - clicks tuples to evaluate, all of move_options if None [list(tuple(int))]
+            speed - speed to maneuver at, current speed if None [int]
+        returns:
+            poses - final (x, y, theta) per option [array(N,3), cm/deg]
+            outlines - final world base outline points per option [array(N,P,2), cm]
         """
 
-        options = []
-        move_options = []
-        for sub_speed in range(self.speed):
-            clicks = self._data["move"][self.speed][sub_speed]
-            clicks = np.linspace(-clicks, clicks, 2 * clicks + 1, dtype=int)
-            move_options.append(clicks)
+        speed = self.speed if speed is None else speed
+
+        displacements = self.maneuvers.displacements(speed)
+        if options is not None:
+            displacements = np.stack(
+                [self.maneuvers.displacement(speed, clicks) for clicks in options]
+            ).reshape(-1, 3)
+
+        x, y, theta = pymada.classes.utils.compose_2D(
+            self.position.x,
+            self.position.y,
+            self.position.theta,
+            displacements[:, 0],
+            displacements[:, 1],
+            displacements[:, 2],
+        )
+        outlines = pymada.classes.utils.transform_2D(
+            self.base.outline_local, x, y, theta
+        )
 
-        return list(itertools.product(*move_options))
+        return np.stack((x, y, theta), axis=-1), outlines
 
     def create_attack_pool(self, attacking_hull_zone, *args, **kwargs):
-        """Return deep copy of attacking Dice armament
+        """Return attacking Dice armament
+
+        notes:
+            Dice are immutable so the armament is shared rather than copied
         """
 
         # XXX this needs to be multiple dispatch for anti squad
-        attack_pool = copy.deepcopy(self.hull_zones[attacking_hull_zone].armament)
+        attack_pool = self.hull_zones[attacking_hull_zone].armament
 
         # XXX do attacking dice mods here
 
@@ -137,7 +308,7 @@ class Ship(PlayerPiece):
         """
 
         args:
-            attack - [Dice] 
+            attack - rolled attack pool [Roll]
             defending_hull_zone - 
         """
 
@@ -149,17 +320,18 @@ class Ship(PlayerPiece):
             self.hull_zones[defending_hull_zone].shields = 0
             for card in range(int(damage_remaining)):
                 self.damage_cards.append("card")
+        self._update_board()
 
-    def move(self, clicks):
-        """Ship-specific implementation of move() method - translates list of clicks to cartesian transforms
+    def check_clicks(self, clicks, speed=None):
+        """Raise ShipYawError if clicks are not a legal maneuver
 
         args:
-        notes:
-            ships in armada move THEN rotate
-        XXX add ship rotations from corner - .base.corner below as centre_x_rotate_last,centre_y_rotate_last
-        XXX TODO implement collision checks, move can just call itself recursively with decreasing speed until no overlap event - could raise events.ShipOverlap()?
+            clicks - yaw clicks per notch [list(int)]
+            speed - speed to check at, current speed if None [int]
         """
 
+        speed = self.speed if speed is None else speed
+
         # first test move is valid
         # XXX if changing speed
         # if self.speed not in self._data["move"]:
@@ -170,132 +342,161 @@ class Ship(PlayerPiece):
 
         if not all(
             [
-                np.abs(clicks[sub_speed]) <= self._data["move"][self.speed][sub_speed]
-                for sub_speed in range(self.speed)
+                np.abs(clicks[sub_speed]) <= self._data["move"][speed][sub_speed]
+                for sub_speed in range(speed)
             ]
         ):
 
             # TODO this will need to regard command dial effects
             raise pymada.errors.ShipYawError(
                 self,
-                f"requested yaw too high in maneuver {[clicks[sub_speed] for sub_speed in range(self.speed)]} - maximum = {[self._data['move'][self.speed][sub_speed] for sub_speed in range(self.speed)]}",
+                f"requested yaw too high in maneuver {[clicks[sub_speed] for sub_speed in range(speed)]} - maximum = {[self._data['move'][speed][sub_speed] for sub_speed in range(speed)]}",
             )
 
         # allow clicks at higher speeds to be specified - if testing for collisions we just repeat but with speed-=1
-        assert len(clicks) >= self.speed
+        assert len(clicks) >= speed
 
-        # loop over sub_moves
-        for click_values, sub_move_dist, click_options in zip(
-            clicks,
-            pymada.data.tools.maneuver["distance"][self.speed],
-            pymada.data.tools.maneuver["yaw"][self.speed],
-        ):
-
-            # calculate total theta change for this sub_move
-            rotation_theta = 0.0
-            rotation_dir = (
-                click_values if click_values == 0 else click_values / abs(click_values)
-            )
-            for click_value in range(abs(click_values)):
-                # -1. factor since +ve click means turn clockwise (opposite to global +ve theta)
-                rotation_theta += click_options[click_value] * rotation_dir * -1.0
-
-            # split move into two since we want to rotate about point we do not yet know the location of
-            # first translate forward at current heading theta
-            self.position.move(
-                r=sub_move_dist, theta_translate=self.position.theta,
-            )
-            # then rotate to new theta about ship position - this same method will be passed to all observers
-            self.position.move(
-                theta_rotate_last=rotation_theta,
-                # XXX these should be some corner of the Base
-                centre_x_rotate_last=self.position.x,
-                centre_y_rotate_last=self.position.y,
-            )
+    def move(self, clicks, speed=None):
+        """Ship-specific implementation of move() method - translates list of clicks to cartesian transforms
 
-    def LoS_to(self, defender, attacking_hull_zone, *args, **kwargs):
-        """
+        args:
+            clicks - yaw clicks per notch [list(int)]
+            speed - temporary speed to move at e.g. after overlapping, current speed if None [int]
+        notes:
+            ships in armada move THEN rotate
+            displacement looked up from ManeuverTable built once per ship model
+            overlap and board edge checks need the board - see Board.move_ship
+        XXX add ship rotations from corner - .base.corner below as centre_x_rotate_last,centre_y_rotate_last
         """
 
-        # XXX this will need to check the enemy base is within our arc and check we are not obstructed
+        speed = self.speed if speed is None else speed
+
+        self.check_clicks(clicks, speed)
+
+        # whole maneuver precomputed relative to current pose so apply in one step
+        self.position.compose(*self.maneuvers.displacement(speed, clicks))
+        self._update_board()
+
+    @cached("arc")
+    def arc_to(
+        self, defender, attacking_hull_zone, defending_hull_zone=None, *args, **kwargs
+    ):
+        """Whether any part of defender lies within one of our hull zones' firing arc
+
+        args:
+            defender - [Ship]
+            attacking_hull_zone - [str]
+            defending_hull_zone - any part of defender's base if None [str]
+        notes:
+            results memoised on our board until either ship moves
         """
-        attacking_hull_zone = kwargs.get("attacking_hull_zone", None)
 
-        if not attacking_hull_zone in self.hull_zones:
-            raise ShipHullZoneError(
-                self, f"'{attacking_hull_zone}' hull zone not found in {self.name}"
+        return bool(
+            self.hull_zones[attacking_hull_zone].polyline_in_arc(
+                defender.edge_points(defending_hull_zone)
             )
-            return False
-
-        for point in defender.base.outline: #XXX only 100% accurate for base outlines fully-described by finite list of points e.g. square
-            point.x
-            point.y
-        x1=self.hull_zones[attacking_hull_zone].LoS_dot_x
-        y1=self.hull_zones[attacking_hull_zone].LoS_dot_y
+        )
 
+    @cached("LoS", board_wide=True)
+    def LoS_to(
+        self, defender, attacking_hull_zone, defending_hull_zone=None, *args, **kwargs
+    ):
+        """Whether line of sight from one of our hull zones to defender is clear
 
-        if LOGIC and enemy.LoS_from(self, *args, **kwargs):
-            return True
+        args:
+            defender - [Ship]
+            attacking_hull_zone - [str]
+            defending_hull_zone - any of defender's hull zones if None [str]
+        notes:
+            line traced between LoS dots must not cross the defender's other hull zones
+            or the base of any other live piece on our board
+            results memoised on our board until any ship changes
+            XXX crossing another base should only obstruct (remove a die) rather than block
+        """
 
-        else:
-            raise pymada.errors.NoLoS(
-                self.hull_zones[attacking_hull_zone],
-                f"'{attacking_hull_zone}' hull zone of {self.name} is not in range '{defending_hull_zone}' hull zone of {defender.name}",
+        if defending_hull_zone is None:
+            return any(
+                self.LoS_to(defender, attacking_hull_zone, hull_zone)
+                for hull_zone in defender.hull_zones
             )
 
+        if not defender.LoS_from(self, attacking_hull_zone, defending_hull_zone):
             return False
-        """
-        return True
 
-    def LoS_from(self, attacker, defending_hull_zone, *args, **kwargs):
-        """
-        """
+        obstacles = []
+        if self.board is not None:
+            obstacles = [
+                ship.base.outline_points
+                for ship in self.board.ships.values()
+                if ship is not self and ship is not defender and not ship.is_destroyed
+            ]
+        if not obstacles:
+            return True
 
-        # XXX attacker must have specified defending_hull_zone since they are attacking us, a ship
+        start = self.hull_zones[attacking_hull_zone].LoS_dot_position
+        end = defender.hull_zones[defending_hull_zone].LoS_dot_position
 
-        # XXX check enemy LoS does not overlap our hull zone
+        return not pymada.classes.geometry.crosses_any(
+            np.array([start.x, start.y]),
+            np.array([end.x, end.y]),
+            pymada.classes.geometry.outline_edges(np.stack(obstacles)).reshape(
+                -1, 2, 2
+            ),
+        )
 
-        """
-        if defending_hull_zone:
-            if not defending_hull_zone in defender.hull_zones:
-                raise ShipHullZoneError(
-                    self,
-                    f"'{defending_hull_zone}' hull zone not found in {defender.name}",
-                )
-                return False
-
-        #XXX for squadron this function will just return true, since LoS disregards ship's base
-
-        #XXX at this point we will need to check line from enemy does not cross our hullzone lines 
-        if LOGIC
+    def LoS_from(
+        self, attacker, attacking_hull_zone, defending_hull_zone, *args, **kwargs
+    ):
+        """Whether line of sight from attacker reaches our hull zone without crossing our other hull zones
+
+        args:
+            attacker - [Ship]
+            attacking_hull_zone - [str]
+            defending_hull_zone - [str]
         """
 
-        return True
+        # XXX for squadron this function will just return true, since LoS disregards ship's base
 
-    def range_to(self, defender, attacking_hull_zone, *args, **kwargs):
-        """
-        XXX this currently just returns distance between base centres - in future:
-            range_from will need to do most of the work by taking attacking_hull_zone and attacker's base and comparing with defender's
+        return attacker.hull_zones[attacking_hull_zone].has_LoS_to(
+            self, defending_hull_zone
+        )
 
-        XXX so something like:
-            return defender.range_from(self.base,attacking_hull_zone,*args,**kwargs)
-        """
-        
-        distance=defender.base.centre-self.base.centre
-        r=np.sqrt(distance.x**2+distance.y**2)
-        for colour in ["black","blue","red"]:
-            if r<=pymada.data.tools.rulers["range"][colour]:
-                return colour
-        return False 
-
-    def range_from(self, attacker, attacking_hull_zone, defending_hull_zone, *args, **kwargs):
+    def range_to(
+        self, defender, attacking_hull_zone, defending_hull_zone=None, *args, **kwargs
+    ):
+        """Range band from one of our hull zones to defender
+
+        args:
+            defender - [Piece]
+            attacking_hull_zone - [str]
+            defending_hull_zone - closest point of defender's base if None [str]
+        returns:
+            range band colour or False if out of range [str]
         """
 
-        XXX calculate range in this function and pass upwards, something like:
+        return pymada.classes.geometry.range_band(
+            defender.range_from(self, attacking_hull_zone, defending_hull_zone)
+        )
+
+    @cached("range")
+    def range_from(
+        self, attacker, attacking_hull_zone, defending_hull_zone=None, *args, **kwargs
+    ):
+        """Closest distance from attacking hull zone to one of our hull zones
 
-            attacker_base=kwargs.get("base",None)
-            then find line joining closest point on our base and attacker base
-            then return the range IN THIS FUNCTION - which is just passed upwards in range_to
+        args:
+            attacker - [Ship]
+            attacking_hull_zone - [str]
+            defending_hull_zone - closest point of our base if None [str]
+        returns:
+            distance between closest points of attacking hull zone edge and defending hull zone edge [float, cm]
+        notes:
+            results memoised on our board until either ship moves
         """
 
-        return True
+        return float(
+            pymada.classes.geometry.polyline_distances(
+                attacker.hull_zones[attacking_hull_zone].edge_points,
+                self.edge_points(defending_hull_zone),
+            )
+        )
@@ -0,0 +1,128 @@
+"""Broadphase spatial index for pieces on the board
+"""
+
+import math
+import numpy as np
+
+import pymada
+import pymada.errors
+import pymada.data.tools
+
+
+class SpatialIndex:
+    """Class describing a uniform grid of piece bounding circles
+
+    notes:
+        each piece is binned into every cell its bounding circle overlaps
+        owner must call update() whenever a piece may have moved - Board does so from
+        Piece._update_board, so queries never rescan every piece
+        queries are conservative - returned pieces could be in range, others cannot be
+    """
+
+    CELL_SIZE = pymada.data.tools.rulers["range"]["red"]
+
+    def __init__(self, cell_size=CELL_SIZE):
+        """Constructor for spatial index
+
+        args:
+            cell_size - width of square grid cells [float, cm]
+        """
+
+        self.cell_size = cell_size
+        self._cells = {}
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    @staticmethod
+    def bounding_radius(piece):
+        """Radius of circle about piece position containing its whole base [float, cm]
+        """
+
+        if not len(piece.base.outline_local):
+            return 0.0
+
+        return float(np.max(np.hypot(*piece.base.outline_local.T)))
+
+    def _cells_covering(self, x, y, radius):
+        """Grid cells overlapped by square bounding a circle
+        """
+
+        i_min, i_max = (
+            math.floor((x - radius) / self.cell_size),
+            math.floor((x + radius) / self.cell_size),
+        )
+        j_min, j_max = (
+            math.floor((y - radius) / self.cell_size),
+            math.floor((y + radius) / self.cell_size),
+        )
+
+        return [
+            (i, j) for i in range(i_min, i_max + 1) for j in range(j_min, j_max + 1)
+        ]
+
+    def insert(self, piece):
+        """Add piece to index, replacing any existing entry with the same name
+
+        args:
+            piece - [Piece]
+        """
+
+        if piece.name in self._entries:
+            self.remove(piece.name)
+
+        x, y = piece.position.x, piece.position.y
+        radius = self.bounding_radius(piece)
+        cells = self._cells_covering(x, y, radius)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(piece.name)
+
+        self._entries[piece.name] = [piece, piece.position.version, x, y, radius, cells]
+
+    def remove(self, name):
+        """Remove piece from index
+
+        args:
+            name - piece name [str]
+        """
+
+        for cell in self._entries.pop(name)[-1]:
+            self._cells[cell].discard(name)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def update(self, piece):
+        """Bin piece if it is new or its pose has changed since it was last binned
+
+        args:
+            piece - [Piece]
+        """
+
+        entry = self._entries.get(piece.name)
+        if entry is None or entry[1] != piece.position.version:
+            self.insert(piece)
+
+    def query(self, x, y, radius):
+        """Names of pieces whose bounding circles overlap a circle
+
+        args:
+            x, y - circle centre [float, cm]
+            radius - circle radius [float, cm]
+        returns:
+            [set(str)]
+        """
+
+        candidates = set()
+        for cell in self._cells_covering(x, y, radius):
+            candidates |= self._cells.get(cell, set())
+
+        return {
+            name
+            for name in candidates
+            if math.hypot(self._entries[name][2] - x, self._entries[name][3] - y)
+            <= radius + self._entries[name][4]
+        }
@@ -3,6 +3,8 @@
 
 import numpy as np
 
+MASK_64 = (1 << 64) - 1
+
 
 def rotate_2D(x, y, theta):
     """Implement 2D rotation matrix 
@@ -13,9 +15,79 @@ def rotate_2D(x, y, theta):
         theta - rotation magnitude [float,deg]
     """
 
-    theta*=np.pi/180.
+    theta = theta * np.pi / 180.0
 
     x_new = x * np.cos(theta) - y * np.sin(theta)
     y_new = x * np.sin(theta) + y * np.cos(theta)
 
     return x_new, y_new
+
+
+def compose_2D(x, y, theta, dx, dy, dtheta):
+    """Apply displacements given in the local frame of poses
+
+    args:
+        x, y, theta - poses [float/array, cm/deg]
+        dx, dy, dtheta - displacements relative to each pose [float/array, cm/deg]
+    returns:
+        new x, y and theta wrapped to [-180, 180) [float/array, cm/deg]
+    notes:
+        broadcasts so many displacements can be applied to one pose or vice versa
+    """
+
+    dx_world, dy_world = rotate_2D(dx, dy, theta)
+    theta_new = (theta + dtheta + 180.0) % 360.0 - 180.0
+
+    return x + dx_world, y + dy_world, theta_new
+
+
+def transform_2D(points, x, y, theta):
+    """Transform local points into the world frame of one or more poses
+
+    args:
+        points - points relative to pose [array(...,P,2), cm]
+        x, y, theta - poses, broadcast against every axis of points but the last two
+            [float/array, cm/deg]
+    returns:
+        world points for each pose e.g. [array(N,P,2), cm] for poses (N) and points (P,2),
+            [array(S,H,P,2), cm] for poses (S,1) and points (S,H,P,2)
+    """
+
+    x, y, theta = (np.asarray(value, dtype=float)[..., None] for value in (x, y, theta))
+    points_x, points_y = rotate_2D(points[..., 0], points[..., 1], theta)
+
+    return np.stack((points_x + x, points_y + y), axis=-1)
+
+
+def splitmix64(x):
+    """Mix a 64 bit integer into a well distributed 64 bit hash
+
+    args:
+        x - [int]
+    returns:
+        [int]
+    notes:
+        finaliser of the splitmix64 generator - stable between processes unlike hash()
+    """
+
+    x = (x + 0x9E3779B97F4A7C15) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+
+    return x ^ (x >> 31)
+
+
+def hash_values(seed, values):
+    """Chain integers through splitmix64 into one 64 bit hash
+
+    args:
+        seed - e.g. key of piece being hashed [int]
+        values - [iterable(int)]
+    returns:
+        [int]
+    """
+
+    for value in values:
+        seed = splitmix64(seed ^ (value & MASK_64))
+
+    return seed
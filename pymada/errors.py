@@ -56,6 +56,10 @@ class ShipHullZoneError(ShipException):
     """Except raised for errors with Ship HullZones"""
 
 
+class ManeuverError(PymadaException):
+    """Except raised for clicks outside a maneuver table"""
+
+
 class HullZoneError(PymadaException):
     """Except raised by HullZone"""
 
@@ -1,12 +1,28 @@
 import pymada
 import pymada.errors
+from pymada.classes.game import Game
+from pymada.classes.player import Player
+from pymada.classes.fleet import Fleet
 
 print("launching...")
-pass
 
-define fleets here
-define players
+species = "human"
 
-play game!
+# define fleets here
+player1 = Player(name="player 1", species=species, faction="imp")
+armada1 = Fleet()
+armada1.add_ship(model="test_ship", name="a", faction="imp", upgrades=None)
+
+# define players
+player2 = Player(name="player 2", species=species, faction="reb")
+armada2 = Fleet()
+armada2.add_ship(model="test_ship", name="b", faction="reb", upgrades=None)
+
+# play game!
+game = Game(players=[player1, player2], fleets=[armada1, armada2])
+
+winner = game.play()
+
+print(f"winner={winner.name if winner else None}")
 
 print("finishing...")
@@ -0,0 +1,234 @@
+"""Play many seeded games across a process pool and aggregate results
+
+Example:
+    python -m pymada.scripts.simulate --fleet imp:test_ship,test_ship --fleet reb:test_ship --games 1000
+"""
+
+import argparse, concurrent.futures, math, time
+
+import pymada
+import pymada.errors
+from pymada.classes.game import Game, build_game
+
+# games kept alive per worker process so boards and ships are reused between games
+_GAMES = {}
+
+
+def parse_fleet(fleet):
+    """Parse fleet description of the form faction:model,model,...
+
+    args:
+        fleet - e.g. "imp:test_ship,test_ship" [str]
+    returns:
+        faction and models [tuple(str, tuple(str))]
+    """
+
+    faction, _, models = fleet.partition(":")
+    if not faction or not models:
+        raise argparse.ArgumentTypeError(
+            f"fleet '{fleet}' should look like faction:model,model,..."
+        )
+
+    return faction, tuple(models.split(","))
+
+
+def play_game(fleets, species, seed):
+    """Play one game, reusing this process's game for the same fleets and species
+
+    args:
+        fleets - faction and models of each fleet [tuple(tuple(str, tuple(str)))]
+        species - species of each player [tuple(str)]
+        seed - [numpy.random.SeedSequence]
+    returns:
+        winner name (None if no winner), turns played and damage suffered by each player [dict]
+    """
+
+    key = (fleets, species)
+    if key not in _GAMES:
+        _GAMES[key] = build_game(fleets, species)
+    game = _GAMES[key]
+
+    game.reset(seed)
+    winner = game.play()
+
+    damage = {player_name: 0 for player_name in game.players}
+    for ship in game.board.ships.values():
+        damage[ship.player_name] += ship.damage
+
+    return {
+        "winner": winner.name if winner is not None else None,
+        "turns": game.turn,
+        "damage": damage,
+    }
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score confidence interval for a binomial proportion
+
+    args:
+        successes - [int]
+        trials - [int]
+        z - standard normal quantile, 1.96 for 95% confidence [float]
+    returns:
+        lower and upper bound [tuple(float)]
+    """
+
+    if trials == 0:
+        return 0.0, 1.0
+
+    proportion = successes / trials
+    denominator = 1.0 + z ** 2 / trials
+    centre = (proportion + z ** 2 / (2.0 * trials)) / denominator
+    half_width = (
+        z
+        * math.sqrt(
+            proportion * (1.0 - proportion) / trials + z ** 2 / (4.0 * trials ** 2)
+        )
+        / denominator
+    )
+
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def simulate(
+    fleets, species, n_games, seed=None, workers=None, chunksize=16, stream=None
+):
+    """Play many games and aggregate their results
+
+    args:
+        fleets - faction and models of each fleet [list(tuple(str, tuple(str)))]
+        species - species of each player [list(str)]
+        n_games - [int]
+        seed - entropy for whole batch, fresh entropy if None [int]
+        workers - number of processes, all cores if None, play in this process if 1 [int]
+        chunksize - games sent to a worker at once [int]
+        stream - called with index and result of each game as it arrives [callable]
+    returns:
+        summary of results [dict]
+    """
+
+    fleets, species = tuple(fleets), tuple(species)
+    if len(fleets) != len(species):
+        raise pymada.errors.PymadaException(
+            f"need one species per fleet - got {len(fleets)} fleets and {len(species)} species"
+        )
+
+    seeds = Game.spawn_seeds(seed, n_games)
+    n_players = len(fleets)
+    wins = {f"player {counter + 1}": 0 for counter in range(n_players)}
+    damage = dict.fromkeys(wins, 0)
+    draws, turns = 0, 0
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = (play_game(fleets, species, game_seed) for game_seed in seeds)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(
+            play_game,
+            [fleets] * n_games,
+            [species] * n_games,
+            seeds,
+            chunksize=chunksize,
+        )
+
+    try:
+        for index, result in enumerate(results):
+            if result["winner"] is None:
+                draws += 1
+            else:
+                wins[result["winner"]] += 1
+            turns += result["turns"]
+            for player_name, player_damage in result["damage"].items():
+                damage[player_name] += player_damage
+            if stream is not None:
+                stream(index, result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "games": n_games,
+        "win_rate": {
+            player_name: (player_wins / n_games, wilson_interval(player_wins, n_games))
+            for player_name, player_wins in wins.items()
+        },
+        "draw_rate": (draws / n_games, wilson_interval(draws, n_games)),
+        "mean_turns": turns / n_games,
+        "mean_damage": {
+            player_name: player_damage / n_games
+            for player_name, player_damage in damage.items()
+        },
+        "games_per_second": n_games / elapsed if elapsed > 0 else math.inf,
+    }
+
+
+def main(argv=None):
+    """Command line entry point
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Play many seeded games and report win rates"
+    )
+    parser.add_argument(
+        "--fleet",
+        action="append",
+        type=parse_fleet,
+        required=True,
+        help="faction:model,model,... - give once per player",
+    )
+    parser.add_argument(
+        "--species",
+        nargs="+",
+        default=None,
+        help="species of each player, random for all if not given",
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="processes to use, all cores if not given",
+    )
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument(
+        "--stream", action="store_true", help="print result of each game as it arrives"
+    )
+    args = parser.parse_args(argv)
+
+    species = args.species or ["random"] * len(args.fleet)
+
+    def stream(index, result):
+        print(
+            f"game {index}: winner={result['winner']} turns={result['turns']} damage={result['damage']}"
+        )
+
+    summary = simulate(
+        args.fleet,
+        species,
+        args.games,
+        seed=args.seed,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        stream=stream if args.stream else None,
+    )
+
+    print(f"games: {summary['games']}")
+    for player_name, (rate, (lower, upper)) in summary["win_rate"].items():
+        print(
+            f"{player_name} win rate: {rate:.3f} (95% CI {lower:.3f}-{upper:.3f}) "
+            f"mean damage suffered: {summary['mean_damage'][player_name]:.2f}"
+        )
+    rate, (lower, upper) = summary["draw_rate"]
+    print(f"draw rate: {rate:.3f} (95% CI {lower:.3f}-{upper:.3f})")
+    print(f"mean turns: {summary['mean_turns']:.2f}")
+    print(f"games per second: {summary['games_per_second']:.1f}")
+
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import pymada.ai.mcts
+import pymada.classes.player
+import pymada.classes.game
+import pymada.classes.fleet
+import numpy as np
+
+
+def _game(species):
+    """Two players with two ships each"""
+
+    players, fleets = [], []
+    for name, faction in [("p1", "imp"), ("p2", "reb")]:
+        players.append(
+            pymada.classes.player.Player(
+                name=name,
+                faction=faction,
+                species=species,
+                search=pymada.ai.mcts.MCTS(node_budget=10),
+            )
+        )
+        fleets.append(pymada.classes.fleet.Fleet())
+        for counter in range(2):
+            fleets[-1].add_ship(
+                model="test_ship", name=f"{name} {counter}", faction=faction
+            )
+
+    return pymada.classes.game.Game(players, fleets, seed=1, headless=True)
+
+
+def test_mcts_search():
+    """Check search leaves board unchanged and table within its size"""
+
+    test_game = _game("random")
+    test_game.deploy()
+    search = pymada.ai.mcts.MCTS(node_budget=100, table_size=20)
+    before = test_game.snapshot().tobytes()
+
+    ship_name, attack, clicks = search.search(test_game, "p1", np.random.default_rng(0))
+
+    assert ship_name in test_game.board.ship_names(player_name="p1", state="ready")
+    assert test_game.snapshot().tobytes() == before
+    assert len(search) == 20
+
+    # entries hold statistics only for activations tried from them
+    for entry in search.table.values():
+        assert len(entry["children"]) <= entry["visits"]
+
+    # activation numbers decode to every activation of the root once each
+    root = search.table[test_game.state_hash]
+    activations = {
+        search._activation(root, index) for index in range(root["offsets"][-1])
+    }
+    assert len(activations) == root["offsets"][-1]
+    assert any(
+        activation[0] == ship_name and activation[2] == clicks
+        for activation in activations
+    )
+
+
+def test_mcts_game():
+    """Check games between search players play to the end"""
+
+    test_game = _game("mcts")
+    test_game.play()
+
+    assert test_game.is_over
+
+
+def test_mcts_key():
+    """Check search tables are keyed on the game's own state hash at each decision"""
+
+    test_game = _game("mcts")
+    found = []
+    for player in test_game.players.values():
+
+        def search(game, player_name, rng, search=player.search.search):
+            state_hash = game.state_hash
+            choice = search(game, player_name, rng)
+            found.append(state_hash in game.players[player_name].search.table)
+            return choice
+
+        player.search.search = search
+
+    test_game.play()
+
+    assert found and all(found)
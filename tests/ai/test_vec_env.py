@@ -0,0 +1,35 @@
+import pymada.ai.vec_env
+import numpy as np
+
+
+def test_vec_env():
+    """Check legal actions step every game and buffers are reused"""
+
+    env = pymada.ai.vec_env.VecEnv(
+        [("imp", ("test_ship", "test_ship")), ("reb", ("test_ship",))],
+        ["random"],
+        2,
+        seed=0,
+    )
+    observations, masks = env.reset()
+    assert observations.shape == (2, 3, len(env.FEATURES) + 4)
+    assert observations.dtype == np.float32
+    assert masks.shape == (2, env.n_actions)
+
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        assert masks.any(axis=1).all()
+        actions = [rng.choice(np.flatnonzero(mask)) for mask in masks]
+        assert env.step(actions)[0] is observations
+        assert (observations[..., env.FEATURES.index("turn")] < 1.0).all()
+
+
+def test_vec_env_decode():
+    """Check no-attack actions decode to the agent's ship and first maneuver"""
+
+    env = pymada.ai.vec_env.VecEnv(
+        [("imp", ("test_ship",)), ("reb", ("test_ship",))], ["random"], 1, seed=0
+    )
+
+    assert env.decode(0) == (env.agent_ships[0], None, 0)
+    assert env.masks[0, 0]
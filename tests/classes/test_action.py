@@ -0,0 +1,63 @@
+import pymada.classes.board
+import pymada.classes.action
+import pymada.classes.roll
+import pymada.classes.player
+import pymada.classes.fleet
+import pymada.classes.game
+
+
+def test_action_make_unmake():
+    """Check activating, firing and moving are undone exactly in reverse order"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", speed=2, x=0.0, y=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=180.0)
+    states = {name: ship.save_state() for name, ship in test_board.ships.items()}
+    version = test_board.ships["b"].position.version
+
+    roll = pymada.classes.roll.Roll([[0, 3, 1, 0, 0, 0], [0] * 6, [0] * 6])
+    records = [
+        test_board.make(pymada.classes.action.Action("activate", "a")),
+        test_board.make(
+            pymada.classes.action.Action("fire", "a", "b", "front", "front", roll)
+        ),
+        test_board.make(pymada.classes.action.Action("move", "a", [0, 1])),
+    ]
+    assert test_board.ships["b"].damage > 0
+    assert test_board.ships["a"].position.x > 0.0
+
+    for record in reversed(records):
+        test_board.unmake(record)
+
+    assert {
+        name: ship.save_state() for name, ship in test_board.ships.items()
+    } == states
+    assert test_board.ships["b"].damage_cards == []
+    # pose of ship which did not move is left untouched
+    assert test_board.ships["b"].position.version == version
+
+
+def test_game_make_unmake():
+    """Check destroying a player's last ship makes a winner until undone"""
+
+    players, fleets = [], []
+    for name, faction in [("p1", "imp"), ("p2", "reb")]:
+        players.append(pymada.classes.player.Player(name=name, faction=faction))
+        fleets.append(pymada.classes.fleet.Fleet())
+        fleets[-1].add_ship(model="test_ship", name=name + " ship", faction=faction)
+    test_game = pymada.classes.game.Game(
+        players=players, fleets=fleets, seed=0, headless=True
+    )
+    test_game.deploy()
+
+    roll = pymada.classes.roll.Roll([[0, 20, 0, 0, 0, 0], [0] * 6, [0] * 6])
+    record = test_game.make(
+        pymada.classes.action.Action(
+            "fire", "p1 ship", "p2 ship", "front", "front", roll
+        )
+    )
+    assert test_game.winner is players[0] and players[1].is_eliminated
+
+    test_game.unmake(record)
+    assert test_game.winner is None and not players[1].is_eliminated
+    assert test_game.board.ships["p2 ship"].damage == 0
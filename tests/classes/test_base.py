@@ -0,0 +1,21 @@
+import pymada.classes.base
+import pymada.classes.position
+
+
+def test_base_outline_follows_position():
+    """Check outline is transformed lazily from attached position and cached"""
+
+    test_position = pymada.classes.position.Position(x=0.0, y=0.0, theta=0.0)
+    test_base = pymada.classes.base.Base(
+        outline_points_x=[1.0, 1.0, -1.0, -1.0],
+        outline_points_y=[1.0, -1.0, -1.0, 1.0],
+        position=test_position,
+    )
+
+    outline_points = test_base.outline_points
+    assert test_base.outline_points is outline_points
+
+    test_position.set(x=5.0, theta=90.0)
+    assert test_base.outline_points is not outline_points
+    assert round(test_base.outline[0].x, 6) == 4.0
+    assert round(test_base.outline[0].y, 6) == 1.0
@@ -0,0 +1,176 @@
+import pymada.classes.board
+import pymada.classes.fleet
+import pymada.classes.game
+import pymada.classes.player
+import pymada.classes.batch_game
+import numpy as np
+
+
+def _board():
+    """Two enemy ships facing each other with an ally blocking part of the way"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", speed=2, x=0.0, y=0.0)
+    test_board.add_ship("p1", "test_ship", "c", "imp", x=0.0, y=25.0, theta=90.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=180.0)
+
+    return test_board
+
+
+def test_batch_game_targeting():
+    """Check batched attack legality agrees with Ship.can_fire against every enemy"""
+
+    test_board = _board()
+    batch = pymada.classes.batch_game.BatchGame(test_board, 2)
+    batch.poses[1, 2] = [0.0, -30.0, 90.0]
+
+    for game, defender_pose in enumerate(batch.poses[:, 2]):
+        test_board.ships["b"].place(*defender_pose)
+        _, can_fire = batch.targeting(np.zeros(2, dtype=int))
+        for h, attacking_hull_zone in enumerate(batch.hull_zone_names[0]):
+            for d, defender in enumerate(batch.ship_names):
+                for h2, defending_hull_zone in enumerate(batch.hull_zone_names[d]):
+                    assert can_fire[game, h, d, h2] == (
+                        defender == "b"
+                        and test_board.ships["a"].can_fire(
+                            test_board.ships["b"],
+                            attacking_hull_zone=attacking_hull_zone,
+                            defending_hull_zone=defending_hull_zone,
+                        )
+                    )
+
+
+def test_batch_game_fire():
+    """Check a seeded batched attack suffers damage as Ship.suffer does"""
+
+    test_board = _board()
+    batch = pymada.classes.batch_game.BatchGame(test_board, 1)
+    front = batch.hull_zone_names[0].index("front")
+    zeros = np.zeros(1, dtype=int)
+
+    damage = batch.fire(
+        zeros, front + zeros, 2 + zeros, front + zeros, rngs=[np.random.default_rng(3)]
+    )
+    test_board.ships["a"].fire(
+        test_board.ships["b"],
+        attacking_hull_zone="front",
+        defending_hull_zone="front",
+        rng=np.random.default_rng(3),
+    )
+
+    assert damage[0] > 0
+    assert batch.damage[0, 2] == test_board.ships["b"].damage
+    assert (
+        batch.shields[0, 2, front] == test_board.ships["b"].hull_zones["front"].shields
+    )
+
+    # no attack on allies
+    assert batch.fire(zeros, zeros, 1 + zeros, zeros, damage=5 + zeros)[0] == 0
+
+
+def test_batch_game_seeded_fire():
+    """Check each seeded game rolls from its own dice stream as the scalar Game does"""
+
+    seeds = [5, 6, 7]
+    games = []
+    for seed in seeds:
+        players, fleets = [], []
+        for name, faction in [("p1", "imp"), ("p2", "reb")]:
+            players.append(
+                pymada.classes.player.Player(
+                    name=name, species="random", faction=faction
+                )
+            )
+            fleets.append(pymada.classes.fleet.Fleet())
+            fleets[-1].add_ship(model="test_ship", name=name + " ship", faction=faction)
+        games.append(
+            pymada.classes.game.Game(
+                players=players, fleets=fleets, seed=seed, headless=True
+            )
+        )
+        games[-1].deploy()
+        games[-1].board.ships["p1 ship"].place(x=0.0, y=0.0, theta=0.0)
+        games[-1].board.ships["p2 ship"].place(x=30.0, y=0.0, theta=180.0)
+
+    batch = pymada.classes.batch_game.BatchGame(games[0].board, len(seeds), seeds=seeds)
+    attacker = batch.ship_names.index("p1 ship")
+    defender = batch.ship_names.index("p2 ship")
+    front = batch.hull_zone_names[attacker].index("front")
+    zeros = np.zeros(len(seeds), dtype=int)
+
+    # games skip different volleys so their streams are drawn from unevenly
+    volleys = [[1, 0, 1], [1, 1, 1], [0, 1, 1], [1, 1, 0], [1, 1, 1]]
+    for attacking in np.array(volleys, dtype=bool):
+        batch.fire(
+            attacker + zeros,
+            front + zeros,
+            defender + zeros,
+            front + zeros,
+            games=attacking,
+        )
+        for k, game in enumerate(games):
+            if attacking[k]:
+                game.board.ships["p1 ship"].fire(
+                    game.board.ships["p2 ship"],
+                    attacking_hull_zone="front",
+                    defending_hull_zone="front",
+                    rng=game.dice_rng,
+                )
+            assert batch.damage[k, defender] == game.board.ships["p2 ship"].damage
+            assert (
+                batch.shields[k, defender, front]
+                == game.board.ships["p2 ship"].hull_zones["front"].shields
+            )
+
+    assert len(set(batch.damage[:, defender])) > 1
+
+
+def test_batch_game_move():
+    """Check batched maneuvers reduce speed to avoid overlaps as Board.move_ship does"""
+
+    test_board = _board()
+    test_board.ships["b"].place(x=18.0, y=0.0, theta=180.0)
+    batch = pymada.classes.batch_game.BatchGame(test_board, 1)
+
+    speed = batch.move(np.zeros(1, dtype=int), [[0, 1]])
+
+    assert speed[0] == test_board.move_ship("a", [0, 1]) == 1
+    assert np.allclose(
+        batch.poses[0, 0],
+        [
+            test_board.ships["a"].position.x,
+            test_board.ships["a"].position.y,
+            test_board.ships["a"].position.theta,
+        ],
+    )
+
+
+def test_batch_game_destroyed():
+    """Check destroyed ships are neither targets nor obstacles, as on Board"""
+
+    test_board = _board()
+    test_board.ships["c"].place(x=15.0, y=0.0, theta=90.0)
+    batch = pymada.classes.batch_game.BatchGame(test_board, 3)
+    b, c = batch.ship_names.index("b"), batch.ship_names.index("c")
+    batch.removed[1, c] = True
+    batch.removed[2, b] = True
+    zeros = np.zeros(3, dtype=int)
+
+    _, can_fire = batch.targeting(zeros)
+    assert not can_fire[0].any()
+    assert can_fire[1, :, b].any()
+    assert not can_fire[2].any()
+
+    test_board.ships["c"].destroy()
+    for h, attacking_hull_zone in enumerate(batch.hull_zone_names[0]):
+        for h2, defending_hull_zone in enumerate(batch.hull_zone_names[b]):
+            assert can_fire[1, h, b, h2] == test_board.ships["a"].can_fire(
+                test_board.ships["b"],
+                attacking_hull_zone=attacking_hull_zone,
+                defending_hull_zone=defending_hull_zone,
+            )
+
+    speed = batch.move(zeros, np.zeros((3, 2), dtype=int))
+    # game with its only enemy destroyed is over so does not move
+    assert list(speed) == [1, 2, 0]
+    assert speed[1] == test_board.move_ship("a", [0, 0])
@@ -1,4 +1,5 @@
 import pymada.classes.board
+import pymada.classes.action
 
 
 def test_board():
@@ -6,3 +7,261 @@ def test_board():
 
     test_board = pymada.classes.board.Board()
     assert test_board.width == pymada.classes.board.Board.PLAY_AREA_WIDTH
+
+
+def test_board_range_matrix():
+    """Check batched range matrix agrees with measuring a single pair"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=20.0, y=5.0, theta=90.0)
+
+    ship_names, hull_zone_names, distances = test_board.range_matrix()
+    attacking_hull_zone = hull_zone_names[0].index("front")
+    defending_hull_zone = hull_zone_names[1].index("left")
+
+    assert round(distances[0, attacking_hull_zone, 1, defending_hull_zone], 6) == round(
+        test_board.ships["b"].range_from(test_board.ships["a"], "front", "left"), 6
+    )
+    assert test_board.ships["a"].range_to(test_board.ships["b"], "front") == "blue"
+
+
+def test_board_LoS_matrix():
+    """Check LoS is blocked by defender's other hull zones and by other bases"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=0.0)
+
+    ship_names, hull_zone_names, has_LoS = test_board.LoS_matrix()
+    front, rear = hull_zone_names[0].index("front"), hull_zone_names[0].index("rear")
+    assert has_LoS[0, front, 1, rear]
+    assert not has_LoS[0, front, 1, front]
+    assert test_board.ships["a"].LoS_to(test_board.ships["b"], "front", "rear")
+
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=15.0, y=0.0, theta=90.0)
+
+    ship_names, hull_zone_names, has_LoS = test_board.LoS_matrix(["a", "b"])
+    assert not has_LoS[0, front, 1, rear]
+    assert not test_board.ships["a"].LoS_to(test_board.ships["b"], "front", "rear")
+
+
+def test_board_move_ship():
+    """Check ship speed is reduced until it no longer overlaps another base"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", speed=2, x=0.0, y=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=16.0, y=0.0, theta=90.0)
+
+    speeds, off_board = test_board.resolve_speeds("a")
+    assert list(speeds) == [1, 1, 1]
+    assert not off_board.any()
+
+    assert test_board.move_ship("a", (0, 0)) == 1
+    assert round(test_board.ships["a"].position.x, 6) == 6.85
+
+    test_board.add_ship("p1", "test_ship", "c", "imp", speed=2, x=85.0, y=0.0)
+    test_board.move_ship("c", (0, 0))
+    assert test_board.ships["c"].is_destroyed
+
+
+def test_board_move_ship_past_destroyed():
+    """Check destroyed ships stop blocking maneuvers until they are restored"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", speed=1, x=0.0, y=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=25.0, y=0.0)
+    assert list(test_board.resolve_speeds("a", [(0,)])[0]) == [1]
+
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=12.5, y=0.0)
+    assert list(test_board.resolve_speeds("a", [(0,)])[0]) == [0]
+
+    state = test_board.ships["c"].save_state()
+    test_board.ships["c"].destroy()
+    assert list(test_board.resolve_speeds("a", [(0,)])[0]) == [1]
+    assert test_board.pieces_within("a", "red") == {"b"}
+
+    test_board.ships["c"].restore_state(state)
+    assert list(test_board.resolve_speeds("a", [(0,)])[0]) == [0]
+
+
+def test_board_arc_matrix():
+    """Check batched arc membership agrees with testing a single pair"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=90.0)
+
+    ship_names, hull_zone_names, in_arc = test_board.arc_matrix()
+    front, rear = hull_zone_names[0].index("front"), hull_zone_names[0].index("rear")
+
+    assert in_arc[0, front, 1].all()
+    assert not in_arc[0, rear, 1].any()
+    assert not test_board.ships["a"].arc_to(test_board.ships["b"], "rear", "left")
+    assert not test_board.ships["a"].can_fire(test_board.ships["b"], "rear", "left")
+
+
+def test_board_targeting():
+    """Check attacks measured once per activation agree with Ship.can_fire"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=10.0, y=25.0, theta=45.0)
+    attacker = test_board.ships["a"]
+
+    (
+        hull_zone_names,
+        target_names,
+        defending_names,
+        bands,
+        can_fire,
+    ) = test_board.targeting("a", ["b", "c"])
+
+    assert can_fire.any()
+    for h, attacking_hull_zone in enumerate(hull_zone_names):
+        for t, target in enumerate(target_names):
+            for d, defending_hull_zone in enumerate(defending_names[t]):
+                kwargs = dict(
+                    attacking_hull_zone=attacking_hull_zone,
+                    defending_hull_zone=defending_hull_zone,
+                )
+                assert can_fire[h, t, d] == attacker.can_fire(
+                    test_board.ships[target], **kwargs
+                )
+                if can_fire[h, t, d]:
+                    assert bands[h, t, d] == attacker.range_to(
+                        test_board.ships[target], **kwargs
+                    )
+
+
+def test_board_attacks():
+    """Check a ship's legal attacks are those on live enemies which Ship.can_fire allows"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p1", "test_ship", "d", "imp", x=0.0, y=-25.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=10.0, y=25.0, theta=45.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=0.0)
+    attacker = test_board.ships["a"]
+
+    attacks = test_board.attacks("a", "red")
+
+    expected = [
+        (target, attacking_hull_zone, defending_hull_zone)
+        for attacking_hull_zone in attacker.hull_zones
+        for target in ["b", "c"]
+        for defending_hull_zone in test_board.ships[target].hull_zones
+        if attacker.can_fire(
+            test_board.ships[target], attacking_hull_zone, defending_hull_zone
+        )
+    ]
+    assert expected and [attack[:3] for attack in attacks] == expected
+    for target, attacking_hull_zone, defending_hull_zone, band in attacks:
+        assert band == attacker.range_to(
+            test_board.ships[target], attacking_hull_zone, defending_hull_zone
+        )
+
+    test_board.ships["b"].destroy()
+    assert test_board.attacks("a", "red") == [
+        attack for attack in attacks if attack[0] == "c"
+    ]
+
+
+def test_board_targeting_past_destroyed():
+    """Check a destroyed ship stops blocking line of sight in every LoS measurement"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=15.0, y=0.0, theta=90.0)
+    a, b, c = (test_board.ships[name] for name in "abc")
+
+    def has_LoS():
+        hull_zone_names, _, defending_names, _, can_fire = test_board.targeting(
+            "a", ["b"]
+        )
+        front = hull_zone_names.index("front")
+        rear = defending_names[0].index("rear")
+        _, _, LoS_matrix = test_board.LoS_matrix(["a", "b", "c"])
+
+        return (
+            can_fire[front, 0, rear],
+            a.LoS_to(b, "front", "rear"),
+            LoS_matrix[0, front, 1, rear],
+        )
+
+    assert has_LoS() == (False, False, False)
+    c.destroy()
+    assert has_LoS() == (True, True, True)
+
+
+def test_board_ship_index():
+    """Check indexes of live and unactivated ships follow activation and destruction"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp")
+    test_board.add_ship("p1", "test_ship", "b", "imp", x=30.0)
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=-30.0)
+    assert test_board.ship_names(faction="imp", state="ready") == {"a", "b"}
+    assert test_board.n_live() == 2
+
+    test_board.ships["a"].activate()
+    assert test_board.ship_names(player_name="p1", state="ready") == {"b"}
+
+    state = test_board.ships["c"].save_state()
+    test_board.ships["c"].destroy()
+    assert test_board.ship_names(player_name="p2", state="live") == set()
+    assert test_board.n_live() == 1
+
+    test_board.ships["c"].restore_state(state)
+    test_board.ships["a"].deactivate()
+    assert test_board.ship_names(player_name="p2", state="ready") == {"c"}
+    assert test_board.ship_names(player_name="p1", state="ready") == {"a", "b"}
+    assert test_board.n_live("faction") == 2
+
+
+def test_board_state_hash():
+    """Check state hash returns on undo and does not depend on order of activations"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", speed=1)
+    test_board.add_ship("p2", "test_ship", "b", "reb", speed=1, x=-30.0, y=30.0)
+    start = test_board.state_hash
+
+    hashes = []
+    for order in [("a", "b"), ("b", "a")]:
+        records = []
+        for name in order:
+            records.append(
+                test_board.make(pymada.classes.action.Action("activate", name))
+            )
+            records.append(
+                test_board.make(pymada.classes.action.Action("move", name, [0]))
+            )
+        hashes.append(test_board.state_hash)
+        for record in reversed(records):
+            test_board.unmake(record)
+        assert test_board.state_hash == start
+
+    assert hashes[0] == hashes[1] != start
+
+
+def test_board_LoS_side_on():
+    """Check LoS reaches only the facing side zone of ships abeam on either side"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=0.0, y=-20.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=0.0, y=20.0, theta=0.0)
+
+    ship_names, hull_zone_names, has_LoS = test_board.LoS_matrix()
+    left, right = hull_zone_names[0].index("left"), hull_zone_names[0].index("right")
+    assert has_LoS[0, left, 1, right]
+    assert not has_LoS[0, left, 1, left]
+    assert has_LoS[0, right, 2, left]
+    assert not has_LoS[0, right, 2, right]
+
+    a, b, c = (test_board.ships[name] for name in ship_names)
+    assert a.LoS_to(b, "left", "right") and not a.LoS_to(b, "left", "left")
+    assert a.LoS_to(c, "right", "left") and not a.LoS_to(c, "right", "right")
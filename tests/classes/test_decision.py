@@ -6,3 +6,16 @@ def test_decision():
 
     test_decision = pymada.classes.decision.Decision("test_choice")
     assert test_decision.parse_choice_test("porkins?") == "porkins!"
+
+
+def test_decision_options():
+    """Check unordered options are indexable and prompt lists them"""
+
+    test_decision = pymada.classes.decision.Decision(
+        "select_hull_zone", options={"rear", "front"}
+    )
+
+    assert test_decision.options == ("front", "rear")
+    assert test_decision.parse_choice_ai(1) == "rear"
+    assert "\nrear\n" in test_decision.prompt
+    assert not test_decision.is_forced
@@ -1,4 +1,6 @@
+import numpy as np
 import pymada.classes.dice
+import pymada.classes.roll
 
 
 def test_dice_add():
@@ -30,3 +32,55 @@ def test_dice_equals():
 def test_dice_roll():
 
     rolled_dice = pymada.classes.dice.Dice(4 * "red").roll(target_distance="red")
+
+    assert isinstance(rolled_dice, pymada.classes.roll.Roll)
+    assert rolled_dice.counts.sum() == 4
+
+
+def test_dice_interned():
+    """Check equal Dice pools are the same immutable instance"""
+
+    dice_1 = 2 * pymada.classes.dice.Dice("red") + pymada.classes.dice.Dice("blue")
+
+    assert dice_1 is pymada.classes.dice.Dice(2 * "red" + "blue")
+    assert dice_1 == 2 * "red" + "blue"
+    assert len({dice_1, pymada.classes.dice.Dice("blueredred")}) == 1
+
+
+def test_roll_damage():
+    """Check damage is counted from face icons"""
+
+    roll = pymada.classes.roll.Roll([[1, 0, 1, 1, 2, 0], [0] * 6, [0, 1, 0, 0, 0, 1]])
+
+    assert roll["hit+hit"] == 2
+    assert roll.damage_normal == 6
+    assert roll.damage_critical == 2
+
+
+def test_dice_roll_batch():
+    """Check batched rolls only use dice available at target distance"""
+
+    rng = np.random.default_rng(0)
+    dice = pymada.classes.dice.Dice(2 * "red" + 3 * "black")
+
+    counts = dice.roll_batch(100, target_distance="blue", rng=rng)
+    symbols = dice.roll_batch(100, target_distance="black", rng=rng, symbols=True)
+
+    assert counts.shape == (100, len(pymada.classes.roll.Roll.FACE_TYPES))
+    assert (counts.sum(axis=1) == 2).all()
+    assert symbols.shape == (100, 3)
+
+
+def test_dice_distribution():
+    """Check exact distributions agree with average face damage"""
+
+    dice = pymada.classes.dice.Dice(2 * "red" + "black")
+    distribution = dice.distribution(target_distance="black")
+
+    assert distribution.shape == (7, 4, 4)
+    assert np.isclose(distribution.sum(), 1.0)
+    assert np.isclose(dice.average_damage("ships"), 2 * 0.75 + 1.0)
+    assert np.isclose(dice.average_damage("squadrons", "red"), 2 * 0.5)
+    assert np.isclose(
+        dice.damage_distribution("ships")[1:].sum(), 1 - (3 / 8) ** 2 * (2 / 8)
+    )
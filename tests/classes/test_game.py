@@ -1,5 +1,8 @@
+import numpy as np
+
 import pymada.classes.player
 import pymada.classes.game
+import pymada.classes.fleet
 
 
 def test_game():
@@ -11,3 +14,128 @@ def test_game():
     assert test_game.is_over is False
     test_game.turn = 10
     assert test_game.is_over is True
+
+
+def test_game_seed():
+    """Check seeded games draw identical independent streams"""
+
+    games = [
+        pymada.classes.game.Game(
+            players=[pymada.classes.player.Player(name="test", species="random")],
+            fleets=None,
+            seed=seed,
+        )
+        for seed in [1, 1, 2]
+    ]
+    draws = [
+        (game.dice_rng.random(), game.players["test"].rng.random()) for game in games
+    ]
+
+    assert draws[0] == draws[1]
+    assert draws[0] != draws[2]
+    assert draws[0][0] != draws[0][1]
+
+
+def test_game_reset():
+    """Check reset reuses ships in an undamaged state and redeploys them"""
+
+    fleet = pymada.classes.fleet.Fleet()
+    fleet.add_ship(model="test_ship", name="a", faction="imp")
+    test_player = pymada.classes.player.Player(name="test", species="random")
+    test_game = pymada.classes.game.Game(
+        players=[test_player], fleets=[fleet], seed=0, headless=True
+    )
+    assert test_game.plotter is None
+
+    test_game.deploy()
+    ship = test_game.board.ships["a"]
+    ship.damage_cards.append("card")
+    ship.hull_zones["front"].shields = 0
+    ship.activate()
+    x = ship.position.x
+
+    test_game.reset(seed=1)
+    assert ship.damage == 0 and not ship.has_activated
+    assert ship.hull_zones["front"].shields == ship._data["shields"]["front"]
+    assert test_game.board.ship_names(faction="imp", state="ready") == {"a"}
+
+    test_game.deploy()
+    assert test_game.board.ships["a"] is ship
+    assert ship.position.x != x
+
+
+def test_game_snapshot():
+    """Check restoring a snapshot replays the rest of a game identically"""
+
+    players, fleets = [], []
+    for name, faction in [("p1", "imp"), ("p2", "reb")]:
+        players.append(
+            pymada.classes.player.Player(name=name, species="random", faction=faction)
+        )
+        fleets.append(pymada.classes.fleet.Fleet())
+        fleets[-1].add_ship(model="test_ship", name=name + " ship", faction=faction)
+    test_game = pymada.classes.game.Game(
+        players=players, fleets=fleets, seed=3, headless=True
+    )
+    test_game.deploy()
+    test_game.play_turn()
+
+    snapshot = test_game.snapshot()
+    assert snapshot.dtype == test_game.snapshot_dtype
+
+    def finish():
+        while not test_game.is_over:
+            test_game.play_turn()
+        return test_game.snapshot().tobytes()
+
+    finished = finish()
+    test_game.restore(snapshot.tobytes())
+    assert test_game.snapshot().tobytes() == snapshot.tobytes()
+    assert finish() == finished
+
+
+def test_game_apply_activation():
+    """Check an activation attacks, moves and is undone exactly by its records"""
+
+    players, fleets = [], []
+    for name, faction in [("p1", "imp"), ("p2", "reb")]:
+        players.append(
+            pymada.classes.player.Player(name=name, species="random", faction=faction)
+        )
+        fleets.append(pymada.classes.fleet.Fleet())
+        fleets[-1].add_ship(model="test_ship", name=name + " ship", faction=faction)
+    test_game = pymada.classes.game.Game(
+        players=players, fleets=fleets, seed=4, headless=True
+    )
+    test_game.deploy()
+    test_game.board.ships["p1 ship"].place(x=0.0, y=0.0, theta=0.0)
+    test_game.board.ships["p2 ship"].place(x=30.0, y=0.0, theta=180.0)
+    snapshot, state_hash = test_game.snapshot(), test_game.state_hash
+
+    attack = test_game.board.attacks("p1 ship", test_game.LONGEST_RANGE)[0]
+    records = test_game.apply_activation("p1 ship", attack, (0, 0))
+
+    ship = test_game.board.ships["p1 ship"]
+    assert len(records) == 3
+    assert ship.has_activated and ship.position.x > 0.0
+
+    for record in reversed(records):
+        test_game.unmake(record)
+    assert test_game.state_hash == state_hash
+    for field in snapshot.dtype.names:
+        if field != "rng":  # dice were rolled
+            assert np.array_equal(test_game.snapshot()[field], snapshot[field])
+
+
+def test_build_game():
+    """Check a headless game is built with one player per fleet"""
+
+    test_game = pymada.classes.game.build_game(
+        (("imp", ("test_ship", "test_ship")), ("reb", ("test_ship",))),
+        ("random", "random"),
+    )
+
+    assert list(test_game.players) == ["player 1", "player 2"]
+    assert [player.faction for player in test_game.players.values()] == ["imp", "reb"]
+    assert len(test_game.fleets[0].names) == 2
+    assert test_game.headless
@@ -0,0 +1,72 @@
+import pymada.classes.geometry
+import numpy as np
+
+
+def test_arc_outline():
+    """Check section of outline within arc runs between arc edges"""
+
+    outline = np.array([[5.0, 3.0], [-5.0, 3.0], [-5.0, -3.0], [5.0, -3.0]])
+    edge = pymada.classes.geometry.arc_outline(outline, [0.0, 0.0], -45.0, 45.0)
+
+    assert np.allclose(edge, [[3.0, -3.0], [5.0, -3.0], [5.0, 3.0], [3.0, 3.0]])
+
+
+def test_polyline_distances():
+    """Check closest distances between batches of polylines"""
+
+    a = np.array([[[0.0, 0.0], [0.0, 1.0]], [[0.0, 0.0], [2.0, 2.0]]])
+    b = np.array([[[3.0, 0.0], [3.0, 5.0]], [[0.0, 2.0], [2.0, 0.0]]])
+
+    assert np.allclose(pymada.classes.geometry.polyline_distances(a, b), [3.0, 0.0])
+    assert pymada.classes.geometry.distance_matrix(a[:, None]).shape == (2, 1, 2, 1)
+
+
+def test_range_band():
+    """Check distances are mapped to shortest range band"""
+
+    bands = pymada.classes.geometry.range_band(np.array([1.0, 15.0, 25.0, 50.0]))
+
+    assert list(bands) == ["black", "blue", "red", False]
+
+
+def test_polygons_overlap():
+    """Check separating axis test between batches of convex polygons"""
+
+    square = np.array([[1.0, 1.0], [-1.0, 1.0], [-1.0, -1.0], [1.0, -1.0]])
+    others = np.stack([square + [1.5, 0.0], square + [2.0, 0.0], square + [2.5, 2.5]])
+
+    assert list(pymada.classes.geometry.polygons_overlap(square, others)) == [
+        True,
+        False,
+        False,
+    ]
+    assert pymada.classes.geometry.points_in_polygon(np.array([0.5, 0.5]), square)
+
+    # polygons with fewer points are padded with zero length edges
+    triangle = np.array([[0.0, 0.0], [2.0, 0.0], [0.0, 2.0]])
+    padded = pymada.classes.geometry.pad_polylines(
+        [square, triangle + [0.5, 0.5], triangle + [5.0, 0.0]]
+    )
+    assert list(pymada.classes.geometry.polygons_overlap(square, padded)) == [
+        True,
+        True,
+        False,
+    ]
+
+
+def test_arc_membership():
+    """Check points and segments are classified against arc half-planes"""
+
+    normals = pymada.classes.geometry.arc_normals(-45.0, 45.0)
+    points = np.array([[5.0, 0.0], [5.0, 5.0], [-1.0, 0.0], [1.0, 3.0]])
+
+    assert list(
+        pymada.classes.geometry.points_in_arc(points, np.zeros(2), normals)
+    ) == [True, True, False, False]
+
+    # segment crossing arc with both end points outside
+    segment = np.array([[1.0, 3.0], [1.0, -3.0]])
+    assert pymada.classes.geometry.polylines_in_arc(segment, np.zeros(2), normals)
+    assert not pymada.classes.geometry.polylines_in_arc(
+        segment - [2.0, 0.0], np.zeros(2), normals
+    )
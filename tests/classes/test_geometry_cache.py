@@ -0,0 +1,55 @@
+import pymada.classes.board
+import pymada.classes.roll
+
+
+def test_geometry_cache():
+    """Check repeated range queries hit cache until a ship moves"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=20.0, y=5.0, theta=90.0)
+    cache = test_board.geometry_cache
+
+    distance = test_board.ships["b"].range_from(test_board.ships["a"], "front", "left")
+    assert (
+        test_board.ships["b"].range_from(test_board.ships["a"], "front", "left")
+        == distance
+    )
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    test_board.ships["a"].position.set(x=-10.0)
+    assert (
+        test_board.ships["b"].range_from(test_board.ships["a"], "front", "left")
+        > distance
+    )
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 1
+
+
+def test_geometry_cache_board_wide():
+    """Check line of sight is recomputed only when a ship on the board moves or is destroyed"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=30.0, y=0.0, theta=0.0)
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=15.0, y=0.0, theta=90.0)
+    a, b, c = (test_board.ships[name] for name in "abc")
+    cache = test_board.geometry_cache
+
+    assert not a.LoS_to(b, "front", "rear")
+    assert not a.LoS_to(b, "front", "rear")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # activation and damage do not change line of sight
+    c.activate()
+    c.suffer(pymada.classes.roll.Roll([[0, 2, 0, 0, 0, 0]]), "front")
+    assert c.damage and not a.LoS_to(b, "front", "rear")
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    c.place(y=40.0)
+    assert a.LoS_to(b, "front", "rear")
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    # result stored before c first moved stays invalid once c returns
+    c.place(y=0.0)
+    assert not a.LoS_to(b, "front", "rear")
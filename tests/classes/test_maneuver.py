@@ -0,0 +1,67 @@
+import itertools
+import pytest
+import pymada.errors
+import pymada.classes.maneuver
+import pymada.classes.position
+import pymada.data.tools
+import numpy as np
+
+
+def test_maneuver_table_matches_notches():
+    """Check precomputed displacement matches moving notch by notch"""
+
+    table = pymada.classes.maneuver.ManeuverTable.for_model("test_ship")
+    test_position = pymada.classes.position.Position(x=0.0, y=0.0, theta=0.0)
+    for notch in range(2):
+        test_position.move(r=pymada.data.tools.maneuver["distance"][2][notch])
+    test_position.move(theta_rotate_last=-20.0)
+
+    assert table.clicks(2) == [(0, -1), (0, 0), (0, 1)]
+    assert np.allclose(
+        table.displacement(2, [0, 1]),
+        [test_position.x, test_position.y, test_position.theta],
+    )
+
+
+def test_maneuver_table_rebuilt(monkeypatch):
+    """Check table follows changes to yaw data"""
+
+    table = pymada.classes.maneuver.ManeuverTable.for_model("test_ship")
+    assert round(table.displacement(2, [0, 1])[2], 6) == -20.0
+
+    monkeypatch.setitem(pymada.data.tools.maneuver["yaw"], 2, [[30, 30], [30, 30]])
+    assert round(table.displacement(2, [0, 1])[2], 6) == -30.0
+
+    # edits in place are only picked up once the table is invalidated
+    pymada.data.tools.maneuver["yaw"][2][1] = [40, 40]
+    assert table.move_space(2) is table.move_space(2)
+    table.invalidate(2)
+    assert round(table.displacement(2, [0, 1])[2], 6) == -40.0
+
+
+def test_move_space():
+    """Check mixed radix indexing follows itertools.product order"""
+
+    space = pymada.classes.maneuver.MoveSpace((1, 0, 2))
+    options = list(itertools.product(range(-1, 2), range(0, 1), range(-2, 3)))
+
+    assert len(space) == len(options)
+    assert list(space) == options
+    assert all(space.index(clicks) == index for index, clicks in enumerate(options))
+    assert space[-1] == options[-1]
+    assert (0, 0, 3) not in space
+
+    samples = space.sample(np.random.default_rng(0), size=100)
+    assert all(tuple(clicks) in space for clicks in samples)
+
+
+def test_move_space_shared():
+    """Check one move space is kept per model and speed"""
+
+    table = pymada.classes.maneuver.ManeuverTable.for_model("test_ship")
+
+    assert table.move_space(2) is table.move_space(2)
+    assert list(table.move_space(2)) == table.clicks(2)
+
+    with pytest.raises(pymada.errors.ManeuverError):
+        table.move_space(2).index((0, 2))
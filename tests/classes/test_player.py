@@ -1,4 +1,5 @@
 import pymada.classes.player
+import pymada.classes.decision
 
 
 def test_player():
@@ -6,3 +7,23 @@ def test_player():
 
     test_player = pymada.classes.player.Player(name="test", species="test")
     assert test_player.choose("porkins?") == "porkins!"
+
+
+def test_player_choose_forced():
+    """Check single option decisions are answered without asking the player"""
+
+    # a human player would wait for input if asked
+    human = pymada.classes.player.Player(name="human", species="human")
+    forced = pymada.classes.decision.Decision("select_piece", options={"a"})
+    assert human.choose(forced) == "a"
+
+
+def test_player_choose_ai():
+    """Check ai players answer with an index into the options"""
+
+    test_player = pymada.classes.player.Player(
+        name="test", species="ai", policy=lambda decision: len(decision) - 1
+    )
+    decision = pymada.classes.decision.Decision("select_piece", options={"b", "a"})
+
+    assert test_player.choose(decision) == "b"
@@ -55,3 +55,13 @@ def test_position_eq():
 
     assert test_position == test_position
     assert test_position != different_test_position
+
+
+def test_position_to_world():
+    """Test transforming local coordinates into world frame"""
+
+    test_position = pymada.classes.position.Position(x=5.0, y=5.0, theta=90.0)
+    x, y = test_position.to_world(1.0, 0.0)
+
+    assert round(x, 6) == 5.0
+    assert round(y, 6) == 6.0
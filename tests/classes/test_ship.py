@@ -1,5 +1,6 @@
 import pymada.classes.ship
 import pytest
+import numpy as np
 
 
 def test_ship():
@@ -53,3 +54,29 @@ def test_ship_move_exceptions():
 
     with pytest.raises(pymada.errors.ShipYawError):
         test_ship.move(clicks=[0, 4])
+
+
+def test_ship_move_outcomes():
+    """Test batched maneuver outcomes match moving without changing ship"""
+
+    test_ship = pymada.classes.ship.Ship(
+        model="test_ship",
+        name="a ship for testing",
+        faction="neutral",
+        upgrades=None,
+        speed=2,
+        x=5.0,
+        y=10.0,
+        theta=20.0,
+    )
+
+    poses, outlines = test_ship.move_outcomes()
+    assert poses.shape == (len(test_ship.move_options), 3)
+    assert test_ship.position.x == 5.0
+
+    test_ship.move(clicks=test_ship.move_options[-1])
+    assert np.allclose(
+        poses[-1],
+        [test_ship.position.x, test_ship.position.y, test_ship.position.theta],
+    )
+    assert np.allclose(outlines[-1], test_ship.base.outline_points)
@@ -0,0 +1,36 @@
+import pymada.classes.board
+
+
+def test_spatial_index_follows_moves():
+    """Check broadphase finds nearby pieces and follows them as they move"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0)
+    test_board.add_ship("p2", "test_ship", "b", "reb", x=20.0, y=0.0)
+    test_board.add_ship("p2", "test_ship", "c", "reb", x=80.0, y=0.0)
+
+    assert test_board.pieces_within("a", "red") == {"b"}
+    assert test_board.pieces_within("a", "black", hull_zone="front") == {"b"}
+    assert test_board.pieces_within("a", "black", hull_zone="rear") == set()
+
+    test_board.ships["c"].place(x=-10.0)
+    assert test_board.pieces_within("a", "red") == {"b", "c"}
+    assert "c" in test_board.spatial_index.query(-10.0, 0.0, 1.0)
+
+
+def test_spatial_index_update():
+    """Check index follows board notifications rather than rescanning on query"""
+
+    test_board = pymada.classes.board.Board()
+    test_board.add_ship("p1", "test_ship", "a", "imp", x=0.0, y=0.0)
+    index = test_board.spatial_index
+
+    test_board.ships["a"].destroy()
+    assert "a" not in index
+    test_board.ships["a"].reset()
+    assert index.query(0.0, 0.0, 1.0) == {"a"}
+
+    test_board.ships["a"].position.set(x=-100.0)
+    assert index.query(-100.0, 0.0, 1.0) == set()
+    index.update(test_board.ships["a"])
+    assert index.query(-100.0, 0.0, 1.0) == {"a"}
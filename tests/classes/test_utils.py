@@ -1,3 +1,5 @@
+import numpy as np
+
 import pymada.classes.utils
 
 
@@ -13,3 +15,27 @@ def test_rotate_2D():
 
     assert round(x, 0) == -1
     assert round(y, 0) == 1
+
+
+def test_transform_2D():
+    """Check points are transformed by every pose or by their own ship's pose"""
+
+    points = np.array([[1.0, 0.0], [0.0, 1.0]])
+
+    world = pymada.classes.utils.transform_2D(points, [0.0, 10.0], 0.0, [0.0, 90.0])
+    assert np.allclose(world, [[[1.0, 0.0], [0.0, 1.0]], [[10.0, 1.0], [9.0, 0.0]]])
+
+    # poses (S,1) transform points (S,H,P,2) of each ship
+    per_ship = pymada.classes.utils.transform_2D(
+        np.stack((points[None], points[None])), [[0.0], [10.0]], 0.0, [[0.0], [90.0]]
+    )
+    assert np.allclose(per_ship[:, 0], world)
+
+
+def test_splitmix64():
+    """Check against first output of reference splitmix64 generator seeded with 0"""
+
+    assert pymada.classes.utils.splitmix64(0) == 0xE220A8397B1DCDAF
+    assert pymada.classes.utils.hash_values(
+        1, [2, 3]
+    ) != pymada.classes.utils.hash_values(1, [3, 2])
@@ -0,0 +1,32 @@
+import pymada.scripts.simulate
+
+
+def test_wilson_interval():
+    """Check interval contains proportion and stays within [0, 1]"""
+
+    lower, upper = pymada.scripts.simulate.wilson_interval(3, 10)
+
+    assert 0.0 < lower < 0.3 < upper < 1.0
+    assert pymada.scripts.simulate.wilson_interval(0, 10)[0] == 0.0
+
+
+def test_simulate():
+    """Check seeded batches are reproducible and every game is counted"""
+
+    fleets = [
+        pymada.scripts.simulate.parse_fleet("imp:test_ship"),
+        pymada.scripts.simulate.parse_fleet("reb:test_ship"),
+    ]
+    summaries = [
+        pymada.scripts.simulate.simulate(
+            fleets, ["random", "random"], 4, seed=0, workers=1
+        )
+        for _ in range(2)
+    ]
+
+    assert summaries[0]["win_rate"] == summaries[1]["win_rate"]
+    assert (
+        sum(rate for rate, interval in summaries[0]["win_rate"].values())
+        + summaries[0]["draw_rate"][0]
+        == 1.0
+    )